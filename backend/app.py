@@ -8,6 +8,7 @@ from routes.translate import translate_bp
 from routes.speak import speak_bp
 from routes.languages import languages_bp
 from routes.contact import contact_bp
+from services.tensorflow import get_tensorflow_service
 
 # Charger les variables d'environnement depuis un fichier .env
 load_dotenv()
@@ -50,13 +51,25 @@ def create_app():
             'version': '1.0.0',
             'endpoints': {
                 'translate': '/kumajala-api/v1/translate',
+                'translate_multi': '/kumajala-api/v1/translate/multi',
+                'translate_metrics': '/kumajala-api/v1/translate/metrics',
                 'speak': '/kumajala-api/v1/speak',
                 'languages': '/kumajala-api/v1/languages',
                 'contact': '/kumajala-api/v1/contact',
-                'manage_translations': '/kumajala-api/v1/translations/manage' # Ajout de l'endpoint de gestion
+                'manage_translations': '/kumajala-api/v1/translations/manage', # Ajout de l'endpoint de gestion
+                'ready': '/ready'
             }
         })
     
+    # Route de readiness pour le load balancer (modèles préchargés et réchauffés)
+    @app.route('/ready')
+    def ready():
+        """
+        Retourne 200 quand les modèles préchargés sont prêts, 503 sinon.
+        """
+        readiness = get_tensorflow_service().get_readiness()
+        return jsonify(readiness), 200 if readiness['ready'] else 503
+    
     # Gestionnaire d'erreurs pour les requêtes non trouvées (404)
     @app.errorhandler(404)
     def not_found(error):
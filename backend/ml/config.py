@@ -18,6 +18,10 @@ for directory in [MODEL_DIR, LOGS_DIR, CHECKPOINTS_DIR]:
 SOURCE_LANGUAGE = "fr"
 SUPPORTED_LANGUAGES = ["bété", "baoulé", "mooré", "agni"]
 
+# Modèle multilingue: un encodeur partagé, la langue cible indiquée par un token en tête de source
+MULTILINGUAL_MODEL = "multi"
+LANGUAGE_TOKEN_TEMPLATE = "<2{language}>"
+
 # ==================== HYPERPARAMÈTRES ====================
 # Architecture
 EMBEDDING_DIM = 256
@@ -36,6 +40,10 @@ TEST_SPLIT = 0.15
 MAX_SEQUENCE_LENGTH = 50
 MIN_SEQUENCE_LENGTH = 1
 
+# Décodage: longueur max = min(MAX_SEQUENCE_LENGTH, ratio * longueur source + offset)
+DECODE_LENGTH_RATIO = 2.0
+DECODE_LENGTH_OFFSET = 5
+
 # ==================== TOKENS SPÉCIAUX ====================
 PAD_TOKEN = "<PAD>"
 START_TOKEN = "<START>"
@@ -52,8 +60,14 @@ UNK_ID = 3
 
 # ==================== SEUILS ====================
 CONFIDENCE_THRESHOLD = 0.7  # Seuil pour utiliser TF vs fallback Gemini
+CONFIDENCE_LOGPROB_WEIGHT = 0.0  # Poids de la probabilité moyenne des tokens dans la confiance (0 = attention seule)
 MIN_VOCAB_FREQUENCY = 1  # Fréquence minimale pour inclure un mot dans le vocab
 
+# ==================== TOKENISATION ====================
+TOKENIZER_TYPE = "word"  # word (un token par mot) ou bpe (sous-mots, vocabulaire borné)
+SUBWORD_VOCAB_SIZE = 4000  # Budget du vocabulaire BPE (tokens spéciaux inclus)
+SUBWORD_CACHE_MAX_WORDS = 50000  # Mots déjà découpés gardés en mémoire (LRU, entrées utilisateur arbitraires)
+
 # ==================== AUGMENTATION DE DONNÉES ====================
 AUGMENTATION_FACTOR = 5  # Multiplier le dataset par ce facteur
 NOISE_PROBABILITY = 0.1  # Probabilité d'ajouter du bruit
@@ -65,7 +79,10 @@ REDUCE_LR_FACTOR = 0.5
 
 # ==================== ÉVALUATION ====================
 BLEU_MAX_ORDER = 4  # BLEU-4
-BEAM_WIDTH = 3  # Pour le beam search lors de l'inférence
+BEAM_WIDTH = 3  # Largeur conseillée pour le beam search (sur demande, le défaut par requête reste glouton)
+MAX_BEAM_WIDTH = 8  # Largeur maximale acceptée par requête
+BEAM_MAX_CANDIDATES = 8  # Tokens candidats gardés par faisceau et par pas
+BEAM_LENGTH_PENALTY = 0.6  # Exposant de normalisation par la longueur
 
 # ==================== LOGGING ====================
 LOG_LEVEL = "INFO"
@@ -76,6 +93,11 @@ LANGUAGE_JSON_PATH = os.path.join(DATA_DIR, "language.json")
 VOCAB_FILE_TEMPLATE = os.path.join(MODEL_DIR, "vocab_{language}.json")
 MODEL_FILE_TEMPLATE = os.path.join(MODEL_DIR, "{language}_model")
 TOKENIZER_FILE_TEMPLATE = os.path.join(MODEL_DIR, "tokenizer_{language}.pkl")
+TFLITE_FILE_TEMPLATE = os.path.join(MODEL_DIR, "{language}_{component}.tflite")
+
+# ==================== TFLITE ====================
+TFLITE_QUANTIZATION = "dynamic"  # none, dynamic (poids int8) ou int8 (activations calibrées)
+TFLITE_PARITY_TOLERANCE = 0.05  # Écart de confiance maximal accepté par la vérification de parité
 
 # ==================== DEVICE ====================
 # TensorFlow détectera automatiquement GPU si disponible
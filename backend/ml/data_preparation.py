@@ -4,33 +4,51 @@ Préparation des données pour l'entraînement du modèle de traduction
 import json
 import numpy as np
 import tensorflow as tf
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import random
 
 from ml.config import (
     LANGUAGE_JSON_PATH, SOURCE_LANGUAGE, SUPPORTED_LANGUAGES,
     MAX_SEQUENCE_LENGTH, BATCH_SIZE, VALIDATION_SPLIT, TEST_SPLIT,
-    PAD_ID, AUGMENTATION_FACTOR
+    PAD_ID, AUGMENTATION_FACTOR, MULTILINGUAL_MODEL, TOKENIZER_TYPE, SUBWORD_VOCAB_SIZE
 )
-from ml.vocabulary import Vocabulary
+from ml.vocabulary import Vocabulary, SubwordVocabulary, language_token, source_vocab_language
 from ml.data_augmentation import DataAugmenter
 
 
 class DatasetBuilder:
     """Classe pour construire les datasets d'entraînement"""
     
-    def __init__(self, target_language: str):
-        if target_language not in SUPPORTED_LANGUAGES:
+    def __init__(self, target_language: str, tokenizer: str = TOKENIZER_TYPE,
+                 vocab_size: int = SUBWORD_VOCAB_SIZE):
+        if target_language not in SUPPORTED_LANGUAGES and target_language != MULTILINGUAL_MODEL:
             raise ValueError(f"Langue non supportée: {target_language}")
+        if tokenizer not in ('word', 'bpe'):
+            raise ValueError(f"Tokenizer non supporté: {tokenizer}")
         
         self.target_language = target_language
+        # Tokenisation par mots ou en sous-mots BPE (budget vocab_size par vocabulaire)
+        self.tokenizer = tokenizer
+        self.vocab_size = vocab_size
+        # Mode multilingue: toutes les paires, la langue cible en token de tête de la source
+        self.multilingual = target_language == MULTILINGUAL_MODEL
+        self.target_languages = SUPPORTED_LANGUAGES if self.multilingual else [target_language]
         self.source_vocab = None
         self.target_vocab = None
         self.augmenter = DataAugmenter()
         
         # Données brutes
         self.raw_pairs: List[Tuple[str, str]] = []
+        self.raw_pairs_by_language: Dict[str, List[Tuple[str, str]]] = {}
         self.augmented_pairs: List[Tuple[str, str]] = []
+        self.encoded_lengths: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    
+    def _tag_pairs(self, language: str, pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Préfixe les sources par le token de langue cible (mode multilingue uniquement)"""
+        if not self.multilingual:
+            return pairs
+        token = language_token(language)
+        return [(f"{token} {source}", target) for source, target in pairs]
     
     def load_data_from_json(self, json_path: str = LANGUAGE_JSON_PATH):
         """
@@ -47,11 +65,16 @@ class DatasetBuilder:
         # Extraire les paires source-target
         fr_data = data.get(SOURCE_LANGUAGE, {})
         
-        for fr_phrase, translations in fr_data.items():
-            target_translation = translations.get(self.target_language)
+        for language in self.target_languages:
+            language_pairs = []
+            for fr_phrase, translations in fr_data.items():
+                target_translation = translations.get(language)
+                
+                if target_translation:
+                    language_pairs.append((fr_phrase, target_translation))
             
-            if target_translation:
-                self.raw_pairs.append((fr_phrase, target_translation))
+            self.raw_pairs_by_language[language] = language_pairs
+            self.raw_pairs.extend(self._tag_pairs(language, language_pairs))
         
         print(f"✅ {len(self.raw_pairs)} paires chargées pour {SOURCE_LANGUAGE} → {self.target_language}")
         
@@ -66,13 +89,22 @@ class DatasetBuilder:
         """
         print(f"\n📈 Augmentation des données (facteur x{factor})...")
         
-        self.augmented_pairs = self.augmenter.augment_dataset(
-            self.raw_pairs, 
-            factor=factor
-        )
+        # Augmenter chaque langue avant d'ajouter le token de langue (le bruit ne doit pas l'altérer)
+        self.augmented_pairs = []
+        for language, language_pairs in self.raw_pairs_by_language.items():
+            self.augmented_pairs.extend(self._tag_pairs(language, self.augmenter.augment_dataset(
+                language_pairs, 
+                factor=factor
+            )))
         
         print(f"✅ Dataset augmenté: {len(self.raw_pairs)} → {len(self.augmented_pairs)} paires")
     
+    def _new_vocabulary(self, language: str) -> Vocabulary:
+        """Crée un vocabulaire vide selon le tokenizer choisi"""
+        if self.tokenizer == 'bpe':
+            return SubwordVocabulary(language, vocab_size=self.vocab_size)
+        return Vocabulary(language)
+    
     def build_vocabularies(self):
         """Construit les vocabulaires source et cible"""
         print(f"\n📚 Construction des vocabulaires...")
@@ -85,10 +117,10 @@ class DatasetBuilder:
         target_texts = [pair[1] for pair in pairs]
         
         # Construire les vocabulaires
-        self.source_vocab = Vocabulary(SOURCE_LANGUAGE)
+        self.source_vocab = self._new_vocabulary(source_vocab_language(self.target_language))
         self.source_vocab.build_from_texts(source_texts)
         
-        self.target_vocab = Vocabulary(self.target_language)
+        self.target_vocab = self._new_vocabulary(self.target_language)
         self.target_vocab.build_from_texts(target_texts)
         
         # Sauvegarder les vocabulaires
@@ -114,72 +146,64 @@ class DatasetBuilder:
         # Utiliser les données augmentées
         pairs = self.augmented_pairs if self.augmented_pairs else self.raw_pairs
         
-        # Encoder les paires
-        encoded_pairs = []
-        for source, target in pairs:
-            source_ids = self.source_vocab.encode(source, add_special_tokens=True)
-            target_ids = self.target_vocab.encode(target, add_special_tokens=True)
-            
-            # Filtrer les séquences trop longues
-            if len(source_ids) <= MAX_SEQUENCE_LENGTH and len(target_ids) <= MAX_SEQUENCE_LENGTH:
-                encoded_pairs.append((source_ids, target_ids))
+        # Encoder toutes les paires en une passe, paddées à MAX_SEQUENCE_LENGTH
+        source_ids, source_lengths = self.source_vocab.encode_batch(
+            [source for source, _ in pairs], max_len=MAX_SEQUENCE_LENGTH
+        )
+        target_ids, target_lengths = self.target_vocab.encode_batch(
+            [target for _, target in pairs], max_len=MAX_SEQUENCE_LENGTH
+        )
+        # Longueurs réutilisées par get_dataset_stats (pas de second encodage)
+        self.encoded_lengths = (source_lengths, target_lengths)
+        
+        # Filtrer les séquences trop longues
+        kept = np.flatnonzero((source_lengths <= MAX_SEQUENCE_LENGTH) & (target_lengths <= MAX_SEQUENCE_LENGTH))
         
-        print(f"✅ {len(encoded_pairs)} paires encodées (filtré pour longueur max)")
+        print(f"✅ {len(kept)} paires encodées (filtré pour longueur max)")
         
         # Mélanger les données
-        random.shuffle(encoded_pairs)
+        kept = kept.tolist()
+        random.shuffle(kept)
         
         # Split train/val/test
-        total = len(encoded_pairs)
+        total = len(kept)
         test_size = int(total * TEST_SPLIT)
         val_size = int(total * VALIDATION_SPLIT)
         train_size = total - test_size - val_size
         
-        train_pairs = encoded_pairs[:train_size]
-        val_pairs = encoded_pairs[train_size:train_size + val_size]
-        test_pairs = encoded_pairs[train_size + val_size:]
+        train_rows = kept[:train_size]
+        val_rows = kept[train_size:train_size + val_size]
+        test_rows = kept[train_size + val_size:]
         
-        print(f"📊 Split: Train={len(train_pairs)}, Val={len(val_pairs)}, Test={len(test_pairs)}")
+        print(f"📊 Split: Train={len(train_rows)}, Val={len(val_rows)}, Test={len(test_rows)}")
         
         # Créer les datasets TensorFlow
-        train_dataset = self._create_dataset_from_pairs(train_pairs, shuffle=True)
-        val_dataset = self._create_dataset_from_pairs(val_pairs, shuffle=False)
-        test_dataset = self._create_dataset_from_pairs(test_pairs, shuffle=False)
+        train_dataset = self._create_dataset(source_ids[train_rows], target_ids[train_rows], shuffle=True)
+        val_dataset = self._create_dataset(source_ids[val_rows], target_ids[val_rows], shuffle=False)
+        test_dataset = self._create_dataset(source_ids[test_rows], target_ids[test_rows], shuffle=False)
         
         return train_dataset, val_dataset, test_dataset
     
-    def _create_dataset_from_pairs(self, pairs: List[Tuple[List[int], List[int]]], 
-                                   shuffle: bool = True) -> tf.data.Dataset:
+    def _create_dataset(self, padded_sources: np.ndarray, padded_targets: np.ndarray,
+                        shuffle: bool = True) -> tf.data.Dataset:
         """
-        Crée un tf.data.Dataset depuis une liste de paires encodées
+        Crée un tf.data.Dataset depuis des séquences encodées et paddées
         
         Args:
-            pairs: Liste de paires (source_ids, target_ids)
+            padded_sources: IDs source [nb_paires, MAX_SEQUENCE_LENGTH]
+            padded_targets: IDs cible [nb_paires, MAX_SEQUENCE_LENGTH]
             shuffle: Mélanger les données
         
         Returns:
             tf.data.Dataset
         """
-        # Séparer sources et targets
-        sources = [pair[0] for pair in pairs]
-        targets = [pair[1] for pair in pairs]
-        
-        # S'assurer que les séquences sont de la même longueur pour from_tensor_slices
-        # On pad manuellement ici avant de créer le dataset
-        padded_sources = tf.keras.preprocessing.sequence.pad_sequences(
-            sources, maxlen=MAX_SEQUENCE_LENGTH, padding='post', value=PAD_ID
-        )
-        padded_targets = tf.keras.preprocessing.sequence.pad_sequences(
-            targets, maxlen=MAX_SEQUENCE_LENGTH, padding='post', value=PAD_ID
-        )
-        
-        # Créer le dataset (maintenant les données sont rectangulaires)
+        # Créer le dataset (les données sont rectangulaires)
         # On passe ((sources, targets), targets) pour que le modèle ait accès 
         # aux deux en entrée pendant Model.fit (Teacher Forcing)
         dataset = tf.data.Dataset.from_tensor_slices(((padded_sources, padded_targets), padded_targets))
         
         if shuffle:
-            dataset = dataset.shuffle(buffer_size=len(pairs))
+            dataset = dataset.shuffle(buffer_size=max(len(padded_sources), 1))
         
         # Batching (plus besoin de padded_batch car c'est déjà padé, mais on peut le garder)
         dataset = dataset.batch(BATCH_SIZE)
@@ -193,8 +217,11 @@ class DatasetBuilder:
         """Retourne des statistiques sur le dataset"""
         pairs = self.augmented_pairs if self.augmented_pairs else self.raw_pairs
         
-        source_lengths = [len(self.source_vocab.encode(p[0])) for p in pairs]
-        target_lengths = [len(self.target_vocab.encode(p[1])) for p in pairs]
+        if self.encoded_lengths is not None:
+            source_lengths, target_lengths = (lengths.tolist() for lengths in self.encoded_lengths)
+        else:
+            source_lengths = self.source_vocab.encode_batch([p[0] for p in pairs])[1].tolist()
+            target_lengths = self.target_vocab.encode_batch([p[1] for p in pairs])[1].tolist()
         
         return {
             'total_pairs': len(pairs),
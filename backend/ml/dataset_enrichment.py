@@ -13,12 +13,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Importer le service Gemini
-from services.gemini import GeminiService
+from services.gemini import GeminiService, IMPOSSIBLE_MARKER
 from ml.config import SUPPORTED_LANGUAGES, LANGUAGE_JSON_PATH, DATA_DIR
 
+# Une génération de plusieurs dizaines de paires est bien plus longue qu'une traduction
+GENERATION_TIMEOUT_SECONDS = 120
+
 class DatasetEnricher:
-    def __init__(self):
+    def __init__(self, refresh: bool = False):
         self.gemini = GeminiService()
+        # Par défaut, les générations déjà obtenues sont relues dans le cache de réponses Gemini
+        self.refresh = refresh
         if not self.gemini.is_service_available():
             print("❌ Erreur: Le service Gemini n'est pas disponible. Vérifiez votre GEMINI_API_KEY.")
             
@@ -56,35 +61,51 @@ class DatasetEnricher:
         Génère {count} paires maintenant :
         """
 
-        max_retries = 3
-        retry_delay = 5
-
-        for attempt in range(max_retries):
-            try:
-                # On utilise le modèle Gemini pour générer le contenu
-                response = self.gemini.model.generate_content(prompt)
-                
-                # Nettoyer la réponse pour extraire le JSON
-                content = response.text.strip()
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0].strip()
-                
-                new_pairs = json.loads(content)
-                print(f"✅ {len(new_pairs)} nouvelles paires générées avec succès.")
-                return new_pairs
-                
-            except Exception as e:
-                print(f"⚠️ Erreur lors de l'essai {attempt + 1}/{max_retries}: {e}")
-                if "429" in str(e):
-                    print(f"⏳ Quota atteint. Attente de {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2 # Backoff exponentiel
-                else:
-                    break
-        
-        return {}
+        # Les erreurs transitoires (429, 5xx) sont retentées par GeminiService (backoff et disjoncteur) ;
+        # la réponse brute est conservée dans le cache de réponses, même si elle n'est pas analysable
+        content = self.gemini.generate_text(prompt, timeout=GENERATION_TIMEOUT_SECONDS, refresh=self.refresh)
+        if content is None:
+            return {}
+
+        try:
+            # Nettoyer la réponse pour extraire le JSON
+            content = content.strip()
+            if "```json" in content:
+                content = content.split("```json")[1].split("```")[0].strip()
+            elif "```" in content:
+                content = content.split("```")[1].split("```")[0].strip()
+            
+            new_pairs = json.loads(content)
+            print(f"✅ {len(new_pairs)} nouvelles paires générées avec succès.")
+            return new_pairs
+            
+        except Exception as e:
+            print(f"⚠️ Réponse Gemini invalide pour le {target_language}: {e}")
+            return {}
+
+    def fill_missing_translations(self, full_data: Dict, target_language: str) -> Dict[str, str]:
+        """
+        Traduit les phrases françaises du dataset qui n'ont pas encore de
+        traduction dans la langue cible (prompts Gemini groupés).
+        """
+        if not self.gemini.is_service_available():
+            return {}
+
+        missing = [fr_text for fr_text, translations in full_data.get('fr', {}).items()
+                   if target_language not in translations]
+        if not missing:
+            return {}
+
+        print(f"🧩 Traduction de {len(missing)} phrases existantes sans {target_language}...")
+        translations = self.gemini.translate_many(missing, target_language)
+
+        filled = {
+            fr_text: translation for fr_text, translation in zip(missing, translations)
+            if translation and translation != IMPOSSIBLE_MARKER
+        }
+        print(f"✅ {len(filled)}/{len(missing)} traductions complétées.")
+        return filled
+
     def _load_existing_data(self, target_language: str) -> Dict[str, str]:
         """Charge les données existantes pour une langue donnée."""
         if not os.path.exists(LANGUAGE_JSON_PATH):
@@ -100,8 +121,11 @@ class DatasetEnricher:
                 result[fr_text] = translations[target_language]
         return result
 
-    def enrich_all(self, count_per_lang: int = 50):
-        """Enrichit le dataset pour toutes les langues supportées."""
+    def enrich_all(self, count_per_lang: int = 50, fill_missing: bool = False):
+        """
+        Enrichit le dataset pour toutes les langues supportées.
+        Avec fill_missing, complète aussi les phrases existantes sans traduction.
+        """
         if not os.path.exists(LANGUAGE_JSON_PATH):
             print(f"❌ Fichier source non trouvé: {LANGUAGE_JSON_PATH}")
             return
@@ -111,6 +135,8 @@ class DatasetEnricher:
 
         for lang in SUPPORTED_LANGUAGES:
             new_data = self.generate_translations(lang, count_per_lang)
+            if fill_missing:
+                new_data = {**self.fill_missing_translations(full_data, lang), **new_data}
             
             # Intégrer dans full_data['fr']
             for fr_text, translation in new_data.items():
@@ -132,7 +158,11 @@ class DatasetEnricher:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Enrichir le dataset Kumajala via Gemini')
     parser.add_argument('--count', type=int, default=50, help='Nombre de paires à générer par langue')
+    parser.add_argument('--fill-missing', action='store_true',
+                        help='Traduire aussi les phrases existantes sans traduction dans une langue')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Redemander les générations à Gemini au lieu de relire le cache de réponses')
     args = parser.parse_args()
     
-    enricher = DatasetEnricher()
-    enricher.enrich_all(args.count)
+    enricher = DatasetEnricher(refresh=args.refresh)
+    enricher.enrich_all(args.count, fill_missing=args.fill_missing)
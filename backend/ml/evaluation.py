@@ -8,10 +8,12 @@ import argparse
 import json
 from datetime import datetime
 
-from ml.config import MODEL_DIR, SUPPORTED_LANGUAGES
+from ml.config import MODEL_DIR, SUPPORTED_LANGUAGES, TFLITE_QUANTIZATION
 from ml.vocabulary import Vocabulary
 from ml.model_architecture import Seq2SeqModel
 from ml.data_preparation import DatasetBuilder
+from ml.model_utils import export_tflite_components, check_tflite_parity
+from ml.tflite_inference import TFLiteSeq2Seq
 
 
 def calculate_bleu_score(references: List[str], hypotheses: List[str], max_order: int = 4) -> Dict[str, float]:
@@ -129,7 +131,7 @@ class ModelEvaluator:
         
         # Traduire
         translation, attention_weights = self.model.translate(
-            source_ids, self.source_vocab, self.target_vocab
+            source_ids, self.source_vocab, self.target_vocab, return_attention=True
         )
         
         return translation, attention_weights
@@ -287,6 +289,18 @@ def main():
         action='store_true',
         help='Évaluer seulement sur des exemples prédéfinis'
     )
+    parser.add_argument(
+        '--tflite-parity',
+        action='store_true',
+        help='Exporter les composants TFLite et vérifier leur parité avec le modèle Keras'
+    )
+    parser.add_argument(
+        '--quantization',
+        type=str,
+        choices=['none', 'dynamic', 'int8'],
+        default=TFLITE_QUANTIZATION,
+        help=f'Quantization TFLite (défaut: {TFLITE_QUANTIZATION})'
+    )
     
     args = parser.parse_args()
     
@@ -303,6 +317,28 @@ def main():
         ]
         
         results = evaluator.evaluate_on_examples(examples)
+    elif args.tflite_parity:
+        # Jeu de test mis de côté, encodé avec les vocabulaires du modèle (sans les reconstruire)
+        builder = DatasetBuilder(args.target_language)
+        builder.load_data_from_json()
+        builder.source_vocab = evaluator.source_vocab
+        builder.target_vocab = evaluator.target_vocab
+        _, _, test_ds = builder.create_tf_datasets()
+        source_seqs = [
+            source.tolist()
+            for (source_batch, _), _ in test_ds
+            for source in source_batch.numpy()
+        ]
+        
+        export_tflite_components(
+            evaluator.model, args.target_language,
+            quantization=args.quantization, representative_seqs=source_seqs
+        )
+        tflite_model = TFLiteSeq2Seq.load(args.target_language)
+        
+        results = check_tflite_parity(evaluator.model, tflite_model, evaluator.target_vocab, source_seqs)
+        results['quantization'] = args.quantization
+        evaluator.generate_report(results)
     else:
         # Évaluer sur le dataset de test
         builder = DatasetBuilder(args.target_language)
@@ -8,10 +8,144 @@ import numpy as np
 
 from ml.config import (
     EMBEDDING_DIM, ENCODER_UNITS, DECODER_UNITS, DROPOUT_RATE,
-    PAD_ID, START_ID, END_ID, MAX_SEQUENCE_LENGTH
+    PAD_ID, START_ID, END_ID, MAX_SEQUENCE_LENGTH,
+    DECODE_LENGTH_RATIO, DECODE_LENGTH_OFFSET,
+    BEAM_MAX_CANDIDATES, BEAM_LENGTH_PENALTY, CONFIDENCE_LOGPROB_WEIGHT
 )
 
 
+# Signature fixe des fonctions de décodage: une seule trace par modèle,
+# batch et longueur source polymorphes
+DECODE_SIGNATURE = [
+    tf.TensorSpec(shape=[None, None], dtype=tf.int32, name='source_seqs'),
+    tf.TensorSpec(shape=[], dtype=tf.int32, name='max_length')
+]
+
+BEAM_DECODE_SIGNATURE = DECODE_SIGNATURE + [
+    tf.TensorSpec(shape=[], dtype=tf.int32, name='beam_width'),
+    tf.TensorSpec(shape=[], dtype=tf.int32, name='max_candidates')
+]
+
+# Signatures des composants exportés séparément (TFLite): l'encodeur et un pas de décodeur
+ENCODE_SIGNATURE = [
+    tf.TensorSpec(shape=[None, None], dtype=tf.int32, name='source_seqs')
+]
+
+DECODE_STEP_SIGNATURE = [
+    tf.TensorSpec(shape=[None, 1], dtype=tf.int32, name='token_ids'),
+    tf.TensorSpec(shape=[None, DECODER_UNITS], dtype=tf.float32, name='state_h'),
+    tf.TensorSpec(shape=[None, DECODER_UNITS], dtype=tf.float32, name='state_c'),
+    tf.TensorSpec(shape=[None, None, 2 * ENCODER_UNITS], dtype=tf.float32, name='encoder_output'),
+    tf.TensorSpec(shape=[None, None, DECODER_UNITS], dtype=tf.float32, name='encoder_keys'),
+    tf.TensorSpec(shape=[None, None], dtype=tf.float32, name='source_mask')
+]
+
+# Signature de service complète: un seul appel de graphe par batch (SavedModel, TF-Serving)
+SERVE_SIGNATURE = [
+    tf.TensorSpec(shape=[None, None], dtype=tf.int32, name='source_seqs'),
+    tf.TensorSpec(shape=[], dtype=tf.int32, name='max_length'),
+    tf.TensorSpec(shape=[], dtype=tf.int32, name='beam_width'),
+    tf.TensorSpec(shape=[], dtype=tf.bool, name='return_attention')
+]
+
+# Score des faisceaux inactifs (fini plutôt que -inf pour éviter les NaN)
+BEAM_NEG_INF = -1e9
+
+
+def decode_length_cap(source_length, max_length=MAX_SEQUENCE_LENGTH):
+    """
+    Borne la longueur du décodage relativement à la longueur source
+    
+    Args:
+        source_length: Longueur de la source (tokens spéciaux inclus)
+        max_length: Plafond absolu
+    
+    Returns:
+        Nombre maximal de pas de décodage
+    """
+    return int(min(max_length, np.ceil(source_length * DECODE_LENGTH_RATIO) + DECODE_LENGTH_OFFSET))
+
+
+def split_decoded_rows(token_ids, lengths, steps, attention, source_lengths, confidence):
+    """
+    Découpe les sorties d'un décodage par batch en résultats par ligne
+    
+    Args:
+        token_ids: IDs générés [batch_size, nb_pas]
+        lengths: Nombre de tokens générés par ligne [batch_size]
+        steps: Nombre de pas exécutés par ligne [batch_size]
+        attention: Poids d'attention [batch_size, nb_pas, seq_len] ou None
+        source_lengths: Longueurs source sans padding [batch_size]
+        confidence: Confiance calculée pendant le décodage [batch_size]
+    
+    Returns:
+        Liste de tuples (ids_cible, poids_attention [nb_pas, longueur_source], confiance)
+    """
+    results = []
+    for row in range(token_ids.shape[0]):
+        row_ids = token_ids[row, :lengths[row]].tolist()
+        if attention is not None:
+            row_attention = attention[row, :steps[row], :source_lengths[row]]
+        else:
+            row_attention = np.zeros((0, source_lengths[row]), dtype=np.float32)
+        results.append((row_ids, row_attention, float(confidence[row])))
+    
+    return results
+
+
+def _attention_entropy(attention_weights, source_mask):
+    """
+    Entropie de l'attention d'un pas, normalisée par log(longueur source)
+    (0 = attention concentrée sur un mot, 1 = uniforme)
+    
+    Args:
+        attention_weights: Poids d'attention [batch, seq_len]
+        source_mask: Positions source valides [batch, seq_len]
+    
+    Returns:
+        Entropie normalisée [batch]
+    """
+    weights = attention_weights / (tf.reduce_sum(attention_weights, axis=-1, keepdims=True) + 1e-10)
+    entropy = -tf.reduce_sum(weights * tf.math.log(weights + 1e-10), axis=-1)
+    source_lengths = tf.reduce_sum(tf.cast(source_mask, tf.float32), axis=-1)
+    return entropy / (tf.math.log(source_lengths) + 1e-10)
+
+
+def _decode_confidence(entropy_sum, log_prob_sum, steps):
+    """
+    Score de confiance par ligne, calculé dans le graphe de décodage
+    
+    Combine la concentration de l'attention (1 - entropie normalisée moyenne)
+    et, selon CONFIDENCE_LOGPROB_WEIGHT, la probabilité moyenne (géométrique)
+    des tokens générés.
+    
+    Args:
+        entropy_sum: Somme des entropies normalisées sur les pas [batch]
+        log_prob_sum: Somme des log-probabilités des tokens choisis [batch]
+        steps: Nombre de pas exécutés, END inclus [batch]
+    
+    Returns:
+        Confiance entre 0 et 1 [batch] (0.5 si aucun pas)
+    """
+    num_steps = tf.maximum(tf.cast(steps, tf.float32), 1.0)
+    attention_score = 1.0 - entropy_sum / num_steps
+    token_score = tf.exp(log_prob_sum / num_steps)
+    
+    confidence = (1.0 - CONFIDENCE_LOGPROB_WEIGHT) * attention_score + CONFIDENCE_LOGPROB_WEIGHT * token_score
+    return tf.where(steps > 0, tf.clip_by_value(confidence, 0.0, 1.0), 0.5)
+
+
+def _length_penalty(lengths, alpha=BEAM_LENGTH_PENALTY):
+    """Normalisation par la longueur du beam search (GNMT): ((5 + L) / 6) ** alpha"""
+    return tf.pow((5.0 + tf.cast(lengths, tf.float32)) / 6.0, alpha)
+
+
+def _gather_candidates(values, indices):
+    """Sélectionne les candidats [batch, K, C] retenus par leurs indices aplatis [batch, K]"""
+    flat_values = tf.reshape(values, [tf.shape(values)[0], -1])
+    return tf.gather(flat_values, indices, batch_dims=1)
+
+
 class Encoder(keras.Model):
     """Encodeur bidirectionnel LSTM"""
     
@@ -91,13 +225,27 @@ class BahdanauAttention(layers.Layer):
         self.W2 = layers.Dense(units, name='attention_W2')
         self.V = layers.Dense(1, name='attention_V')
     
-    def call(self, query, values):
+    def precompute_keys(self, values):
+        """
+        Projette les sorties de l'encodeur (W2) une seule fois par phrase
+        
+        Args:
+            values: Sorties de l'encodeur [batch_size, seq_len, hidden_dim]
+        
+        Returns:
+            keys: Clés d'attention [batch_size, seq_len, units]
+        """
+        return self.W2(values)
+    
+    def call(self, query, values, mask=None, keys=None):
         """
         Calcule les poids d'attention et le vecteur de contexte
         
         Args:
             query: État caché du décodeur [batch_size, hidden_dim]
             values: Sorties de l'encodeur [batch_size, seq_len, hidden_dim]
+            mask: Masque des positions source valides [batch_size, seq_len] (optionnel)
+            keys: Clés précalculées par precompute_keys (optionnel, sinon recalculées)
         
         Returns:
             context_vector: Vecteur de contexte [batch_size, hidden_dim]
@@ -109,11 +257,20 @@ class BahdanauAttention(layers.Layer):
         # Ajouter une dimension temporelle à query
         query_with_time_axis = tf.expand_dims(query, 1)
         
+        # W2(values) ne dépend pas du pas de décodage: réutiliser les clés si fournies
+        if keys is None:
+            keys = self.precompute_keys(values)
+        
         # Calculer le score d'attention
         score = self.V(tf.nn.tanh(
-            self.W1(query_with_time_axis) + self.W2(values)
+            self.W1(query_with_time_axis) + keys
         ))
         
+        # Ignorer le padding (inférence par batch avec des sources de longueurs différentes)
+        if mask is not None:
+            mask = tf.cast(tf.expand_dims(mask, -1), score.dtype)
+            score += (1.0 - mask) * -1e9
+        
         # attention_weights shape: [batch_size, seq_len, 1]
         attention_weights = tf.nn.softmax(score, axis=1)
         
@@ -164,7 +321,19 @@ class Decoder(keras.Model):
         
         self.dropout = layers.Dropout(DROPOUT_RATE)
     
-    def call(self, x, hidden, cell, encoder_output, training=False):
+    def precompute_attention_keys(self, encoder_output):
+        """
+        Précalcule les clés d'attention pour toute la phrase (décodage incrémental)
+        
+        Args:
+            encoder_output: Sorties de l'encodeur [batch_size, seq_len, enc_units]
+        
+        Returns:
+            Clés d'attention à passer à chaque pas via `encoder_keys`
+        """
+        return self.attention.precompute_keys(encoder_output)
+    
+    def call(self, x, hidden, cell, encoder_output, training=False, encoder_mask=None, encoder_keys=None):
         """
         Forward pass du décodeur
         
@@ -174,6 +343,8 @@ class Decoder(keras.Model):
             cell: État cellule précédent [batch_size, dec_units]
             encoder_output: Sorties de l'encodeur [batch_size, seq_len, enc_units]
             training: Mode entraînement
+            encoder_mask: Masque du padding source [batch_size, seq_len] (optionnel)
+            encoder_keys: Clés d'attention précalculées (optionnel)
         
         Returns:
             output: Prédictions [batch_size, 1, vocab_size]
@@ -182,7 +353,9 @@ class Decoder(keras.Model):
             attention_weights: Poids d'attention
         """
         # Calculer l'attention
-        context_vector, attention_weights = self.attention(hidden, encoder_output)
+        context_vector, attention_weights = self.attention(
+            hidden, encoder_output, mask=encoder_mask, keys=encoder_keys
+        )
         
         # x shape: [batch_size, 1]
         x = self.embedding(x)
@@ -247,6 +420,9 @@ class Seq2SeqModel(keras.Model):
         state_h = self.project_h(state_h)
         state_c = self.project_c(state_c)
         
+        # Clés d'attention calculées une fois pour toute la séquence
+        encoder_keys = self.decoder.precompute_attention_keys(encoder_output)
+        
         # Teacher forcing: exclure le dernier token
         dec_input_seq = target_seq[:, :-1]
         target_len = tf.shape(dec_input_seq)[1]
@@ -262,7 +438,8 @@ class Seq2SeqModel(keras.Model):
             
             # Un pas de décodage
             predictions, state_h, state_c, _ = self.decoder(
-                token_input, state_h, state_c, encoder_output, training=training
+                token_input, state_h, state_c, encoder_output,
+                training=training, encoder_keys=encoder_keys
             )
             
             # Stocker
@@ -274,7 +451,8 @@ class Seq2SeqModel(keras.Model):
         
         return all_outputs
     
-    def translate(self, source_text_ids, source_vocab, target_vocab, max_length=MAX_SEQUENCE_LENGTH):
+    def translate(self, source_text_ids, source_vocab, target_vocab, max_length=MAX_SEQUENCE_LENGTH,
+                  return_attention=False, beam_width=1):
         """
         Traduit une séquence source en séquence cible
         
@@ -283,10 +461,445 @@ class Seq2SeqModel(keras.Model):
             source_vocab: Vocabulaire source
             target_vocab: Vocabulaire cible
             max_length: Longueur maximale de la traduction
+            return_attention: Collecter les poids d'attention (confiance, visualisation)
+            beam_width: Largeur du beam search (1 = décodage glouton)
         
         Returns:
             translation: Texte traduit
-            attention_weights: Poids d'attention pour visualisation
+            attention_weights: Poids d'attention [nb_pas, seq_len] (vide si non demandés)
+        """
+        # Ajouter une dimension batch
+        source_seq = tf.constant([list(source_text_ids)], dtype=tf.int32)
+        
+        (result, attention_weights, _), = self.translate_batch(
+            source_seq, max_length=max_length, return_attention=return_attention, beam_width=beam_width
+        )
+        
+        # Décoder les IDs en texte
+        translation = target_vocab.decode(result, skip_special_tokens=True)
+        
+        return translation, attention_weights
+    
+    def translate_batch(self, source_seqs, max_length=MAX_SEQUENCE_LENGTH, return_attention=True,
+                        beam_width=1, max_candidates=BEAM_MAX_CANDIDATES):
+        """
+        Traduit un batch de séquences source avec le décodage compilé
+        (glouton, ou beam search si beam_width > 1)
+        
+        Args:
+            source_seqs: IDs source paddés avec PAD_ID [batch_size, seq_len]
+            max_length: Longueur maximale des traductions
+            return_attention: Rapatrier les poids d'attention (visualisation)
+            beam_width: Largeur du beam search (1 = décodage glouton)
+            max_candidates: Candidats gardés par faisceau et par pas (beam search)
+        
+        Returns:
+            Liste (une entrée par ligne) de tuples (ids_cible, poids_attention, confiance)
+            où poids_attention a la forme [nb_pas, longueur_source] et confiance
+            est calculée dans le graphe de décodage
+        """
+        source_seqs = tf.convert_to_tensor(source_seqs, dtype=tf.int32)
+        source_lengths = tf.reduce_sum(
+            tf.cast(tf.not_equal(source_seqs, PAD_ID), tf.int32), axis=1
+        ).numpy()
+        
+        # Borner le décodage selon la plus longue source du batch
+        max_length = decode_length_cap(int(source_lengths.max()) if len(source_lengths) else 0, max_length)
+        
+        if beam_width > 1:
+            beam_decode = self.beam_search_decode_with_attention if return_attention else self.beam_search_decode
+            token_ids, lengths, steps, attention, _, confidence = beam_decode(
+                source_seqs, tf.constant(max_length, dtype=tf.int32),
+                tf.constant(beam_width, dtype=tf.int32), tf.constant(max_candidates, dtype=tf.int32)
+            )
+            attention = attention.numpy() if return_attention else None
+        elif return_attention:
+            token_ids, lengths, steps, attention, confidence = self.greedy_decode_with_attention(
+                source_seqs, tf.constant(max_length, dtype=tf.int32)
+            )
+            attention = attention.numpy()
+        else:
+            token_ids, lengths, steps, confidence = self.greedy_decode(
+                source_seqs, tf.constant(max_length, dtype=tf.int32)
+            )
+            attention = None
+        
+        return split_decoded_rows(
+            token_ids.numpy(), lengths.numpy(), steps.numpy(), attention, source_lengths, confidence.numpy()
+        )
+    
+    @tf.function(input_signature=DECODE_SIGNATURE)
+    def greedy_decode(self, source_seqs, max_length):
+        """Décodage glouton compilé (sans collecte de l'attention, confiance incluse)"""
+        token_ids, lengths, steps, _, confidence = self._greedy_decode_loop(
+            source_seqs, max_length, collect_attention=False
+        )
+        return token_ids, lengths, steps, confidence
+    
+    @tf.function(input_signature=DECODE_SIGNATURE)
+    def greedy_decode_with_attention(self, source_seqs, max_length):
+        """Décodage glouton compilé avec collecte de l'attention"""
+        return self._greedy_decode_loop(source_seqs, max_length, collect_attention=True)
+    
+    def _greedy_decode_loop(self, source_seqs, max_length, collect_attention):
+        """
+        Boucle de décodage glouton entièrement dans le graphe
+        
+        Args:
+            source_seqs: IDs source paddés [batch_size, seq_len]
+            max_length: Nombre maximal de pas de décodage (scalaire int32)
+            collect_attention: Accumuler les poids d'attention (constante Python)
+        
+        Returns:
+            token_ids: IDs générés, END exclu, paddés avec PAD_ID [batch_size, nb_pas]
+            lengths: Nombre de tokens générés par ligne [batch_size]
+            steps: Nombre de pas exécutés par ligne, END inclus [batch_size]
+            attention: Poids d'attention [batch_size, nb_pas, seq_len] (vide si non collectés)
+            confidence: Confiance par ligne, voir _decode_confidence [batch_size]
+        """
+        batch_size = tf.shape(source_seqs)[0]
+        source_len = tf.shape(source_seqs)[1]
+        encoder_mask = tf.not_equal(source_seqs, PAD_ID)
+        
+        # Encoder tout le batch en une passe
+        encoder_output, state_h, state_c = self.encoder(source_seqs, training=False)
+        state_h = self.project_h(state_h)
+        state_c = self.project_c(state_c)
+        encoder_keys = self.decoder.precompute_attention_keys(encoder_output)
+        
+        decoder_input = tf.fill([batch_size, 1], START_ID)
+        finished = tf.zeros([batch_size], dtype=tf.bool)
+        lengths = tf.zeros([batch_size], dtype=tf.int32)
+        steps = tf.zeros([batch_size], dtype=tf.int32)
+        entropy_sum = tf.zeros([batch_size])
+        log_prob_sum = tf.zeros([batch_size])
+        
+        all_tokens = tf.TensorArray(tf.int32, size=0, dynamic_size=True)
+        all_attention = tf.TensorArray(tf.float32, size=0, dynamic_size=True)
+        
+        t = tf.constant(0)
+        while t < max_length and not tf.reduce_all(finished):
+            predictions, state_h, state_c, attention_weights = self.decoder(
+                decoder_input, state_h, state_c, encoder_output,
+                training=False, encoder_mask=encoder_mask, encoder_keys=encoder_keys
+            )
+            
+            predicted_ids = tf.argmax(predictions, axis=-1, output_type=tf.int32)
+            step_attention = tf.squeeze(attention_weights, axis=-1)
+            
+            # Une ligne terminée (END émis) ne produit plus de tokens
+            active = tf.logical_not(finished)
+            ended = tf.logical_and(active, tf.equal(predicted_ids, END_ID))
+            emitted = tf.logical_and(active, tf.logical_not(ended))
+            
+            # Statistiques de confiance accumulées sur les pas actifs
+            active_weight = tf.cast(active, tf.float32)
+            entropy_sum += active_weight * _attention_entropy(step_attention, encoder_mask)
+            log_prob_sum += active_weight * tf.gather(
+                tf.nn.log_softmax(predictions, axis=-1), predicted_ids, batch_dims=1
+            )
+            
+            steps += tf.cast(active, tf.int32)
+            lengths += tf.cast(emitted, tf.int32)
+            all_tokens = all_tokens.write(t, tf.where(emitted, predicted_ids, PAD_ID))
+            if collect_attention:
+                all_attention = all_attention.write(t, step_attention)
+            
+            finished = tf.logical_or(finished, ended)
+            
+            # Les lignes terminées reçoivent du padding (masqué par l'embedding)
+            decoder_input = tf.expand_dims(tf.where(finished, PAD_ID, predicted_ids), 1)
+            t += 1
+        
+        # [nb_pas, batch] -> [batch, nb_pas]
+        token_ids = tf.reshape(tf.transpose(all_tokens.stack()), [batch_size, t])
+        
+        if collect_attention:
+            attention = tf.reshape(
+                tf.transpose(all_attention.stack(), [1, 0, 2]), [batch_size, t, source_len]
+            )
+        else:
+            attention = tf.zeros([batch_size, 0, source_len])
+        
+        confidence = _decode_confidence(entropy_sum, log_prob_sum, steps)
+        
+        return token_ids, lengths, steps, attention, confidence
+    
+    @tf.function(input_signature=BEAM_DECODE_SIGNATURE)
+    def beam_search_decode(self, source_seqs, max_length, beam_width, max_candidates):
+        """Beam search compilé (sans collecte de l'attention, confiance incluse)"""
+        return self._beam_search_loop(source_seqs, max_length, beam_width, max_candidates, collect_attention=False)
+    
+    @tf.function(input_signature=BEAM_DECODE_SIGNATURE)
+    def beam_search_decode_with_attention(self, source_seqs, max_length, beam_width, max_candidates):
+        """Beam search compilé avec collecte de l'attention du meilleur faisceau"""
+        return self._beam_search_loop(source_seqs, max_length, beam_width, max_candidates, collect_attention=True)
+    
+    def _beam_search_loop(self, source_seqs, max_length, beam_width, max_candidates, collect_attention):
+        """
+        Beam search vectorisé: les faisceaux sont repliés dans la dimension batch
+        
+        Args:
+            source_seqs: IDs source paddés [batch_size, seq_len]
+            max_length: Nombre maximal de pas de décodage
+            beam_width: Nombre de faisceaux K par phrase
+            max_candidates: Nombre de tokens candidats gardés par faisceau et par pas
+            collect_attention: Accumuler l'historique d'attention des faisceaux (constante Python)
+        
+        Returns:
+            token_ids: IDs du meilleur faisceau, END exclu [batch_size, nb_pas]
+            lengths: Nombre de tokens générés [batch_size]
+            steps: Nombre de pas exécutés, END inclus [batch_size]
+            attention: Poids d'attention du meilleur faisceau [batch_size, nb_pas, seq_len]
+                (vide si non collectés)
+            scores: Log-probabilité normalisée par la longueur [batch_size]
+            confidence: Confiance du meilleur faisceau, voir _decode_confidence [batch_size]
+        """
+        batch_size = tf.shape(source_seqs)[0]
+        source_len = tf.shape(source_seqs)[1]
+        
+        # Encoder une fois puis répliquer chaque phrase K fois: [batch * K, ...]
+        encoder_output, state_h, state_c = self.encoder(source_seqs, training=False)
+        state_h = tf.repeat(self.project_h(state_h), beam_width, axis=0)
+        state_c = tf.repeat(self.project_c(state_c), beam_width, axis=0)
+        encoder_keys = tf.repeat(self.decoder.precompute_attention_keys(encoder_output), beam_width, axis=0)
+        encoder_output = tf.repeat(encoder_output, beam_width, axis=0)
+        encoder_mask = tf.repeat(tf.not_equal(source_seqs, PAD_ID), beam_width, axis=0)
+        
+        # Au moins K candidats par faisceau pour toujours remplir les K faisceaux
+        num_candidates = tf.minimum(tf.maximum(max_candidates, beam_width), self.target_vocab_size)
+        
+        # Seul le premier faisceau est actif au départ (les autres seraient des doublons)
+        log_probs = tf.tile(
+            tf.concat([[0.0], tf.fill([beam_width - 1], BEAM_NEG_INF)], axis=0)[tf.newaxis, :],
+            [batch_size, 1]
+        )
+        finished = tf.zeros([batch_size, beam_width], dtype=tf.bool)
+        lengths = tf.zeros([batch_size, beam_width], dtype=tf.int32)
+        steps = tf.zeros([batch_size, beam_width], dtype=tf.int32)
+        entropy_sum = tf.zeros([batch_size, beam_width])
+        sequences = tf.zeros([batch_size, beam_width, max_length], dtype=tf.int32)
+        # Historique d'attention vide si non collecté (l'autographe exige une définition avant la boucle)
+        history_length = max_length if collect_attention else 0
+        attention_history = tf.zeros([batch_size, beam_width, history_length, source_len])
+        
+        decoder_input = tf.fill([batch_size * beam_width, 1], START_ID)
+        
+        t = tf.constant(0)
+        while t < max_length and not tf.reduce_all(finished):
+            predictions, state_h, state_c, attention_weights = self.decoder(
+                decoder_input, state_h, state_c, encoder_output,
+                training=False, encoder_mask=encoder_mask, encoder_keys=encoder_keys
+            )
+            
+            # Plafond de candidats par faisceau avant la sélection globale
+            step_log_probs = tf.nn.log_softmax(predictions, axis=-1)
+            candidate_scores, candidate_ids = tf.math.top_k(step_log_probs, k=num_candidates)
+            candidate_scores = tf.reshape(candidate_scores, [batch_size, beam_width, num_candidates])
+            candidate_ids = tf.reshape(candidate_ids, [batch_size, beam_width, num_candidates])
+            
+            # Un faisceau terminé ne garde qu'une continuation (PAD) à score inchangé
+            finished_mask = finished[:, :, tf.newaxis]
+            keep_first = tf.concat([[0.0], tf.fill([num_candidates - 1], BEAM_NEG_INF)], axis=0)
+            candidate_scores = tf.where(finished_mask, keep_first, candidate_scores)
+            candidate_ids = tf.where(finished_mask, PAD_ID, candidate_ids)
+            
+            total_scores = log_probs[:, :, tf.newaxis] + candidate_scores
+            emitted = tf.logical_and(tf.logical_not(finished_mask), tf.not_equal(candidate_ids, END_ID))
+            candidate_lengths = lengths[:, :, tf.newaxis] + tf.cast(emitted, tf.int32)
+            
+            # Classement sur le score normalisé par la longueur
+            normalized = total_scores / _length_penalty(candidate_lengths)
+            flat_normalized = tf.reshape(normalized, [batch_size, -1])
+            _, top_indices = tf.math.top_k(flat_normalized, k=beam_width)
+            parents = top_indices // num_candidates
+            
+            new_ids = _gather_candidates(candidate_ids, top_indices)
+            log_probs = _gather_candidates(total_scores, top_indices)
+            lengths = _gather_candidates(candidate_lengths, top_indices)
+            
+            # Réordonner l'historique et les états selon les faisceaux parents
+            parent_finished = tf.gather(finished, parents, batch_dims=1)
+            steps = tf.gather(steps, parents, batch_dims=1) + tf.cast(tf.logical_not(parent_finished), tf.int32)
+            finished = tf.logical_or(parent_finished, tf.equal(new_ids, END_ID))
+            
+            step_one_hot = tf.one_hot(t, max_length, dtype=tf.int32)
+            sequences = tf.gather(sequences, parents, batch_dims=1) + \
+                step_one_hot[tf.newaxis, tf.newaxis, :] * tf.where(finished, PAD_ID, new_ids)[:, :, tf.newaxis]
+            
+            beam_entropy = tf.reshape(
+                _attention_entropy(tf.squeeze(attention_weights, axis=-1), encoder_mask), [batch_size, beam_width]
+            )
+            entropy_sum = tf.gather(entropy_sum, parents, batch_dims=1) + \
+                tf.where(parent_finished, 0.0, tf.gather(beam_entropy, parents, batch_dims=1))
+            if collect_attention:
+                beam_attention = tf.reshape(
+                    tf.squeeze(attention_weights, axis=-1), [batch_size, beam_width, source_len]
+                )
+                beam_attention = tf.gather(beam_attention, parents, batch_dims=1)
+                attention_history = tf.gather(attention_history, parents, batch_dims=1) + \
+                    tf.cast(step_one_hot, tf.float32)[tf.newaxis, tf.newaxis, :, tf.newaxis] * \
+                    tf.where(parent_finished[:, :, tf.newaxis], 0.0, beam_attention)[:, :, tf.newaxis, :]
+            
+            flat_parents = tf.reshape(parents + tf.range(batch_size)[:, tf.newaxis] * beam_width, [-1])
+            state_h = tf.gather(state_h, flat_parents)
+            state_c = tf.gather(state_c, flat_parents)
+            
+            decoder_input = tf.reshape(tf.where(finished, PAD_ID, new_ids), [-1, 1])
+            t += 1
+        
+        # Meilleur faisceau par phrase selon le score normalisé
+        final_scores = log_probs / _length_penalty(lengths)
+        best = tf.argmax(final_scores, axis=1, output_type=tf.int32)
+        
+        token_ids = tf.gather(sequences, best, batch_dims=1)[:, :t]
+        if collect_attention:
+            attention = tf.gather(attention_history, best, batch_dims=1)[:, :t]
+        else:
+            attention = tf.zeros([batch_size, 0, source_len])
+        
+        # log_probs cumule déjà les log-probabilités des tokens choisis (END inclus)
+        best_steps = tf.gather(steps, best, batch_dims=1)
+        confidence = _decode_confidence(
+            tf.gather(entropy_sum, best, batch_dims=1), tf.gather(log_probs, best, batch_dims=1), best_steps
+        )
+        
+        return (
+            token_ids,
+            tf.gather(lengths, best, batch_dims=1),
+            best_steps,
+            attention,
+            tf.gather(final_scores, best, batch_dims=1),
+            confidence
+        )
+    
+    @tf.function(input_signature=SERVE_SIGNATURE)
+    def serve_translate_batch(self, source_seqs, max_length, beam_width, return_attention):
+        """
+        Traduction complète d'un batch en un seul appel de graphe (signature de service)
+        
+        La longueur du décodage est bornée dans le graphe selon la plus longue
+        source, comme decode_length_cap. Le décodage suit translate_batch:
+        glouton si beam_width <= 1, beam search sinon, et l'attention n'est
+        collectée que si elle est demandée.
+        
+        Args:
+            source_seqs: IDs source paddés [batch_size, seq_len]
+            max_length: Plafond absolu du nombre de pas
+            beam_width: Largeur du beam search (1 = décodage glouton)
+            return_attention: Collecter les poids d'attention (vides sinon)
+        
+        Returns:
+            Dictionnaire token_ids, lengths, steps, attention, scores, confidence
+            (scores vaut 0 en décodage glouton)
+        """
+        source_lengths = tf.reduce_sum(tf.cast(tf.not_equal(source_seqs, PAD_ID), tf.int32), axis=1)
+        longest = tf.cast(tf.reduce_max(tf.concat([source_lengths, [0]], axis=0)), tf.float32)
+        decode_length = tf.minimum(
+            max_length,
+            tf.cast(tf.math.ceil(longest * DECODE_LENGTH_RATIO), tf.int32) + DECODE_LENGTH_OFFSET
+        )
+        
+        max_candidates = tf.constant(BEAM_MAX_CANDIDATES)
+        
+        def greedy():
+            token_ids, lengths, steps, attention, confidence = tf.cond(
+                return_attention,
+                lambda: self.greedy_decode_with_attention(source_seqs, decode_length),
+                lambda: self._without_attention(source_seqs, self.greedy_decode(source_seqs, decode_length))
+            )
+            return token_ids, lengths, steps, attention, tf.zeros_like(confidence), confidence
+        
+        def beam_search():
+            return tf.cond(
+                return_attention,
+                lambda: self.beam_search_decode_with_attention(source_seqs, decode_length, beam_width, max_candidates),
+                lambda: self.beam_search_decode(source_seqs, decode_length, beam_width, max_candidates)
+            )
+        
+        token_ids, lengths, steps, attention, scores, confidence = tf.cond(beam_width > 1, beam_search, greedy)
+        
+        return {
+            'token_ids': token_ids,
+            'lengths': lengths,
+            'steps': steps,
+            'attention': attention,
+            'scores': scores,
+            'confidence': confidence
+        }
+    
+    @staticmethod
+    def _without_attention(source_seqs, greedy_outputs):
+        """Complète les sorties de greedy_decode avec une attention vide [batch_size, 0, seq_len]"""
+        token_ids, lengths, steps, confidence = greedy_outputs
+        attention = tf.zeros([tf.shape(source_seqs)[0], 0, tf.shape(source_seqs)[1]])
+        return token_ids, lengths, steps, attention, confidence
+    
+    def serving_signatures(self):
+        """
+        Retourne les signatures de service exportées avec le SavedModel
+        (translate_batch en un appel, encode et decode_step pour le pas à pas)
+        """
+        translate_batch = self.serve_translate_batch.get_concrete_function()
+        return {
+            'serving_default': translate_batch,
+            'translate_batch': translate_batch,
+            'encode': self.encode.get_concrete_function(),
+            'decode_step': self.decode_step.get_concrete_function()
+        }
+    
+    @tf.function(input_signature=ENCODE_SIGNATURE)
+    def encode(self, source_seqs):
+        """
+        Encode un batch source et prépare l'état initial du décodeur
+        (composant exporté pour le décodage pas à pas hors graphe, ex: TFLite)
+        
+        Args:
+            source_seqs: IDs source paddés [batch_size, seq_len]
+        
+        Returns:
+            Dictionnaire encoder_output, encoder_keys, state_h, state_c
+        """
+        encoder_output, state_h, state_c = self.encoder(source_seqs, training=False)
+        
+        return {
+            'encoder_output': encoder_output,
+            'encoder_keys': self.decoder.precompute_attention_keys(encoder_output),
+            'state_h': self.project_h(state_h),
+            'state_c': self.project_c(state_c)
+        }
+    
+    @tf.function(input_signature=DECODE_STEP_SIGNATURE)
+    def decode_step(self, token_ids, state_h, state_c, encoder_output, encoder_keys, source_mask):
+        """
+        Exécute un pas de décodeur à partir des sorties de `encode`
+        
+        Args:
+            token_ids: Token précédent [batch_size, 1]
+            state_h, state_c: États du décodeur [batch_size, dec_units]
+            encoder_output, encoder_keys: Sorties de `encode`
+            source_mask: 1.0 pour les positions source valides, 0.0 pour le padding [batch_size, seq_len]
+        
+        Returns:
+            Dictionnaire log_probs [batch_size, vocab_size], state_h, state_c,
+            attention [batch_size, seq_len]
+        """
+        predictions, state_h, state_c, attention_weights = self.decoder(
+            token_ids, state_h, state_c, encoder_output,
+            training=False, encoder_mask=source_mask, encoder_keys=encoder_keys
+        )
+        
+        return {
+            'log_probs': tf.nn.log_softmax(predictions, axis=-1),
+            'state_h': state_h,
+            'state_c': state_c,
+            'attention': tf.squeeze(attention_weights, axis=-1)
+        }
+    
+    def translate_eager(self, source_text_ids, source_vocab, target_vocab, max_length=MAX_SEQUENCE_LENGTH):
+        """
+        Ancienne boucle de décodage eager, pas à pas.
+        Conservée comme référence pour benchmark_decoding_speedup.
         """
         # Ajouter une dimension batch
         source_seq = tf.expand_dims(source_text_ids, 0)
@@ -6,9 +6,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-from typing import List
+from typing import List, Dict
 
-from ml.config import MODEL_DIR
+from ml.config import (
+    MODEL_DIR, PAD_ID, START_ID, TFLITE_QUANTIZATION, TFLITE_PARITY_TOLERANCE
+)
 
 
 def plot_attention_weights(attention_weights: np.ndarray, 
@@ -106,6 +108,142 @@ def convert_to_tflite(model_path: str, output_path: str = None, quantize: bool =
         print(f"   Réduction: {reduction:.1f}%")
 
 
+def export_tflite_components(model, language: str, quantization: str = TFLITE_QUANTIZATION,
+                             representative_seqs: List[List[int]] = None) -> Dict[str, str]:
+    """
+    Exporte l'encodeur et le pas de décodeur d'un Seq2SeqModel en deux modèles TFLite
+    
+    Args:
+        model: Modèle de traduction (Seq2SeqModel)
+        language: Langue cible (nommage des fichiers)
+        quantization: 'none', 'dynamic' (poids int8) ou 'int8' (activations calibrées,
+            opérations non quantifiables laissées en float)
+        representative_seqs: Séquences source encodées pour la calibration int8
+    
+    Returns:
+        Chemins des fichiers générés par composant
+    """
+    from ml.tflite_inference import tflite_component_paths
+    
+    if quantization not in ('none', 'dynamic', 'int8'):
+        raise ValueError(f"Quantization inconnue: {quantization}")
+    if quantization == 'int8' and not representative_seqs:
+        raise ValueError("La quantization int8 nécessite des séquences représentatives")
+    
+    print(f"🔄 Export TFLite {language} (quantization: {quantization})...")
+    
+    def representative_encoder():
+        for source_ids in representative_seqs:
+            yield [np.array([source_ids], dtype=np.int32)]
+    
+    def representative_decoder_step():
+        # Premier pas de décodage réel de chaque séquence (états issus de l'encodeur)
+        for source_ids in representative_seqs:
+            source_seqs = np.array([source_ids], dtype=np.int32)
+            encoded = model.encode(source_seqs)
+            yield [
+                np.array([[START_ID]], dtype=np.int32),
+                encoded['state_h'].numpy(),
+                encoded['state_c'].numpy(),
+                encoded['encoder_output'].numpy(),
+                encoded['encoder_keys'].numpy(),
+                np.not_equal(source_seqs, PAD_ID).astype(np.float32)
+            ]
+    
+    components = {
+        'encoder': (model.encode, representative_encoder),
+        'decoder_step': (model.decode_step, representative_decoder_step),
+    }
+    
+    paths = tflite_component_paths(language)
+    
+    for component, (function, representative_dataset) in components.items():
+        converter = tf.lite.TFLiteConverter.from_concrete_functions(
+            [function.get_concrete_function()], model
+        )
+        # Les LSTM masqués peuvent nécessiter des opérations TensorFlow
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS,
+            tf.lite.OpsSet.SELECT_TF_OPS
+        ]
+        
+        if quantization != 'none':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == 'int8':
+            converter.representative_dataset = representative_dataset
+        
+        tflite_model = converter.convert()
+        
+        with open(paths[component], 'wb') as f:
+            f.write(tflite_model)
+        
+        print(f"   ✅ {component}: {paths[component]} ({len(tflite_model) / 1024 / 1024:.2f} MB)")
+    
+    return paths
+
+
+def check_tflite_parity(model, tflite_model, target_vocab, source_seqs: List[List[int]],
+                        tolerance: float = TFLITE_PARITY_TOLERANCE) -> Dict:
+    """
+    Compare les traductions et la confiance du modèle TFLite au modèle Keras
+    (décodage glouton) sur un jeu de séquences source mis de côté
+    
+    Args:
+        model: Modèle de référence (Seq2SeqModel)
+        tflite_model: Modèle TFLite (TFLiteSeq2Seq)
+        target_vocab: Vocabulaire cible
+        source_seqs: Séquences source encodées (ex: jeu de test)
+        tolerance: Écart de confiance maximal accepté
+    
+    Returns:
+        Taux de traductions identiques, écarts de confiance et latences moyennes
+    """
+    import time
+    
+    print(f"⚖️  Parité Keras / TFLite ({len(source_seqs)} échantillons)...")
+    
+    matches = 0
+    confidence_diffs = []
+    times = {'keras': [], 'tflite': []}
+    
+    for source_ids in source_seqs:
+        # Retirer le padding du jeu de test
+        source_ids = [token for token in source_ids if token != PAD_ID]
+        outputs = {}
+        
+        for name, candidate in (('keras', model), ('tflite', tflite_model)):
+            start = time.time()
+            (token_ids, _, confidence), = candidate.translate_batch(
+                np.array([source_ids], dtype=np.int32), return_attention=False, beam_width=1
+            )
+            times[name].append(time.time() - start)
+            outputs[name] = (target_vocab.decode(token_ids, skip_special_tokens=True), confidence)
+        
+        matches += outputs['keras'][0] == outputs['tflite'][0]
+        confidence_diffs.append(abs(outputs['keras'][1] - outputs['tflite'][1]))
+    
+    num_samples = max(len(source_seqs), 1)
+    confidence_diffs = np.array(confidence_diffs) if confidence_diffs else np.zeros(1)
+    
+    stats = {
+        'num_samples': len(source_seqs),
+        'exact_match': matches / num_samples,
+        'mean_confidence_diff': float(np.mean(confidence_diffs)),
+        'max_confidence_diff': float(np.max(confidence_diffs)),
+        'within_tolerance': float(np.mean(confidence_diffs <= tolerance)),
+        'keras_mean_ms': float(np.mean(times['keras']) * 1000) if times['keras'] else 0.0,
+        'tflite_mean_ms': float(np.mean(times['tflite']) * 1000) if times['tflite'] else 0.0,
+    }
+    
+    print(f"✅ Résultats:")
+    print(f"   Traductions identiques: {stats['exact_match'] * 100:.1f}%")
+    print(f"   Écart de confiance: moyen {stats['mean_confidence_diff']:.3f}, max {stats['max_confidence_diff']:.3f}")
+    print(f"   Dans la tolérance ({tolerance}): {stats['within_tolerance'] * 100:.1f}%")
+    print(f"   Latence moyenne: Keras {stats['keras_mean_ms']:.2f}ms, TFLite {stats['tflite_mean_ms']:.2f}ms")
+    
+    return stats
+
+
 def export_vocab_to_json(vocab, output_path: str):
     """
     Exporte un vocabulaire au format JSON
@@ -119,7 +257,7 @@ def export_vocab_to_json(vocab, output_path: str):
     vocab_data = {
         'language': vocab.language,
         'word2idx': vocab.word2idx,
-        'idx2word': {int(k): v for k, v in vocab.idx2word.items()},
+        'idx2word': dict(enumerate(vocab.idx2word)),
         'size': len(vocab)
     }
     
@@ -245,3 +383,106 @@ def benchmark_inference_speed(model, source_vocab, target_vocab, num_samples: in
     print(f"   Max: {stats['max_ms']:.2f}ms")
     
     return stats
+
+
+def benchmark_decoding_speedup(model, source_vocab, target_vocab, num_samples: int = 50):
+    """
+    Compare la boucle de décodage eager (avant) au décodage compilé (après)
+    
+    Args:
+        model: Modèle de traduction (Seq2SeqModel)
+        source_vocab: Vocabulaire source
+        target_vocab: Vocabulaire cible
+        num_samples: Nombre d'échantillons à tester
+    
+    Returns:
+        Statistiques de performance des deux implémentations
+    """
+    import time
+    
+    print(f"⏱️  Benchmark eager vs graphe ({num_samples} échantillons)...")
+    
+    # Mêmes séquences pour les deux implémentations
+    samples = [
+        np.random.randint(4, len(source_vocab), size=np.random.randint(5, 20)).tolist()
+        for _ in range(num_samples)
+    ]
+    
+    # Première trace du graphe hors mesure (coût payé une fois par modèle)
+    model.translate(samples[0], source_vocab, target_vocab)
+    
+    def measure(translate_fn):
+        times = []
+        for source_ids in samples:
+            start = time.time()
+            translate_fn(source_ids, source_vocab, target_vocab)
+            times.append(time.time() - start)
+        times = np.array(times)
+        return {
+            'mean_ms': np.mean(times) * 1000,
+            'median_ms': np.median(times) * 1000,
+            'p95_ms': np.percentile(times, 95) * 1000,
+        }
+    
+    stats = {
+        'eager': measure(model.translate_eager),
+        'graph': measure(model.translate),
+        'graph_with_attention': measure(
+            lambda ids, src, tgt: model.translate(ids, src, tgt, return_attention=True)
+        ),
+    }
+    stats['speedup'] = stats['eager']['mean_ms'] / max(stats['graph']['mean_ms'], 1e-6)
+    
+    print(f"✅ Résultats:")
+    for name in ('eager', 'graph', 'graph_with_attention'):
+        print(f"   {name}: moyenne {stats[name]['mean_ms']:.2f}ms, "
+              f"médiane {stats[name]['median_ms']:.2f}ms, p95 {stats[name]['p95_ms']:.2f}ms")
+    print(f"   Accélération: x{stats['speedup']:.1f}")
+    
+    return stats
+
+
+def benchmark_tokenization(vocab, texts: List[str], repeat: int = 5) -> Dict[str, float]:
+    """
+    Compare l'encodage/décodage texte par texte (avant) aux API par batch (après)
+    
+    Args:
+        vocab: Vocabulaire (Vocabulary ou SubwordVocabulary)
+        texts: Textes de test (ex: corpus d'entraînement)
+        repeat: Nombre de passes mesurées
+    
+    Returns:
+        Débits en tokens/seconde des deux implémentations
+    """
+    import time
+    
+    print(f"⏱️  Benchmark tokenisation ({len(texts)} textes x {repeat})...")
+    
+    _, lengths = vocab.encode_batch(texts)
+    num_tokens = int(lengths.sum()) * repeat
+    
+    def measure(fn):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return num_tokens / max(time.perf_counter() - start, 1e-9)
+    
+    def encode_loop():
+        encoded = [vocab.encode(text, add_special_tokens=True) for text in texts]
+        return tf.keras.preprocessing.sequence.pad_sequences(encoded, padding='post', value=PAD_ID)
+    
+    ids, _ = vocab.encode_batch(texts)
+    rows = ids.tolist()
+    
+    stats = {
+        'encode_loop_tokens_per_sec': measure(encode_loop),
+        'encode_batch_tokens_per_sec': measure(lambda: vocab.encode_batch(texts)),
+        'decode_loop_tokens_per_sec': measure(lambda: [vocab.decode(row) for row in rows]),
+        'decode_batch_tokens_per_sec': measure(lambda: vocab.decode_batch(ids)),
+    }
+    
+    print(f"✅ Résultats:")
+    print(f"   Encodage: {stats['encode_loop_tokens_per_sec']:,.0f} → {stats['encode_batch_tokens_per_sec']:,.0f} tokens/s")
+    print(f"   Décodage: {stats['decode_loop_tokens_per_sec']:,.0f} → {stats['decode_batch_tokens_per_sec']:,.0f} tokens/s")
+    
+    return stats
@@ -0,0 +1,128 @@
+"""
+Inférence via les signatures de service exportées avec le SavedModel
+"""
+import os
+from typing import List, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.core.protobuf import saved_model_pb2
+
+from ml.config import MAX_SEQUENCE_LENGTH, PAD_ID
+from ml.model_architecture import split_decoded_rows
+
+
+# Signatures exportées par Seq2SeqModel.serving_signatures
+SERVING_SIGNATURES = ('translate_batch', 'encode', 'decode_step')
+
+
+def has_serving_signatures(loaded) -> bool:
+    """Vérifie qu'un SavedModel chargé expose toutes les signatures de service"""
+    return all(name in loaded.signatures for name in SERVING_SIGNATURES)
+
+
+def saved_model_has_serving_signatures(model_path: str) -> bool:
+    """
+    Vérifie qu'un SavedModel exporté expose toutes les signatures de service,
+    en lisant seulement saved_model.pb (sans charger les variables ni les graphes)
+    """
+    proto_path = os.path.join(model_path, 'saved_model.pb')
+    if not tf.io.gfile.exists(proto_path):
+        return False
+
+    saved_model = saved_model_pb2.SavedModel()
+    with tf.io.gfile.GFile(proto_path, 'rb') as f:
+        saved_model.ParseFromString(f.read())
+
+    signatures = set()
+    for meta_graph in saved_model.meta_graphs:
+        signatures.update(meta_graph.signature_def.keys())
+    return all(name in signatures for name in SERVING_SIGNATURES)
+
+
+class SignatureSeq2Seq:
+    """
+    Modèle Seq2Seq servi par ses signatures SavedModel (tf.saved_model.load).
+
+    Le décodage complet d'un batch est un seul appel de graphe déjà tracé:
+    pas de reconstruction des couches Keras ni de retraçage au chargement.
+    Expose la même interface que Seq2SeqModel (translate, translate_batch).
+    """
+
+    def __init__(self, loaded):
+        self.loaded = loaded
+        self._translate_batch = loaded.signatures['translate_batch']
+        self.encode = loaded.signatures['encode']
+        self.decode_step = loaded.signatures['decode_step']
+
+        # Les exports antérieurs n'ont pas l'entrée return_attention (beam search et attention toujours calculés)
+        _, signature_inputs = self._translate_batch.structured_input_signature
+        self._accepts_return_attention = 'return_attention' in signature_inputs
+
+        try:
+            self.size_bytes = int(sum(np.prod(variable.shape) for variable in loaded.variables) * 4)
+        except Exception:
+            self.size_bytes = 0
+
+    @classmethod
+    def load(cls, model_path: str) -> 'SignatureSeq2Seq':
+        """Charge un SavedModel exporté avec ses signatures de service"""
+        loaded = tf.saved_model.load(model_path)
+        if not has_serving_signatures(loaded):
+            raise ValueError(f"Signatures de service absentes: {model_path}")
+        return cls(loaded)
+
+    def translate(self, source_text_ids, source_vocab, target_vocab, max_length=MAX_SEQUENCE_LENGTH,
+                  return_attention=False, beam_width=1):
+        """
+        Traduit une séquence source en séquence cible (même interface que Seq2SeqModel.translate)
+
+        Returns:
+            translation: Texte traduit
+            attention_weights: Poids d'attention [nb_pas, seq_len] (vide si non demandés)
+        """
+        (result, attention_weights, _), = self.translate_batch(
+            np.array([list(source_text_ids)], dtype=np.int32),
+            max_length=max_length, return_attention=return_attention, beam_width=beam_width
+        )
+
+        translation = target_vocab.decode(result, skip_special_tokens=True)
+
+        return translation, attention_weights
+
+    def translate_batch(self, source_seqs, max_length=MAX_SEQUENCE_LENGTH, return_attention=True,
+                        beam_width=1, **kwargs) -> List[Tuple[List[int], np.ndarray, float]]:
+        """
+        Traduit un batch de séquences source par la signature translate_batch
+
+        Args:
+            source_seqs: IDs source paddés avec PAD_ID [batch_size, seq_len]
+            max_length: Longueur maximale des traductions
+            return_attention: Collecter les poids d'attention
+            beam_width: Largeur du beam search (1 = décodage glouton)
+
+        Returns:
+            Liste (une entrée par ligne) de tuples (ids_cible, poids_attention, confiance)
+            où poids_attention a la forme [nb_pas, longueur_source]
+        """
+        source_seqs = np.asarray(source_seqs, dtype=np.int32)
+        source_lengths = np.not_equal(source_seqs, PAD_ID).sum(axis=1)
+
+        inputs = {
+            'source_seqs': tf.constant(source_seqs),
+            'max_length': tf.constant(max_length, dtype=tf.int32),
+            'beam_width': tf.constant(beam_width, dtype=tf.int32)
+        }
+        if self._accepts_return_attention:
+            inputs['return_attention'] = tf.constant(bool(return_attention))
+
+        outputs = self._translate_batch(**inputs)
+
+        return split_decoded_rows(
+            outputs['token_ids'].numpy(),
+            outputs['lengths'].numpy(),
+            outputs['steps'].numpy(),
+            outputs['attention'].numpy() if return_attention else None,
+            source_lengths,
+            outputs['confidence'].numpy()
+        )
@@ -0,0 +1,177 @@
+"""
+Inférence TensorFlow Lite: encodeur et pas de décodeur exportés séparément
+"""
+import os
+import threading
+from typing import List, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from ml.config import (
+    TFLITE_FILE_TEMPLATE, MAX_SEQUENCE_LENGTH, PAD_ID, START_ID, END_ID, CONFIDENCE_LOGPROB_WEIGHT
+)
+from ml.model_architecture import decode_length_cap, split_decoded_rows
+
+
+# Composants exportés par export_tflite_components
+TFLITE_COMPONENTS = ('encoder', 'decoder_step')
+
+
+def tflite_component_paths(language: str) -> dict:
+    """Retourne les chemins des fichiers TFLite (encodeur, pas de décodeur) d'une langue"""
+    return {
+        component: TFLITE_FILE_TEMPLATE.format(language=language, component=component)
+        for component in TFLITE_COMPONENTS
+    }
+
+
+class TFLiteSeq2Seq:
+    """
+    Modèle Seq2Seq servi par deux interpréteurs TFLite.
+
+    L'encodeur est exécuté une fois par batch, puis le pas de décodeur est
+    appelé en boucle côté Python. Expose la même interface que Seq2SeqModel
+    (translate, translate_batch) pour le service TensorFlow.
+    """
+
+    def __init__(self, encoder_path: str, decoder_step_path: str, num_threads: int = None):
+        self.encoder_path = encoder_path
+        self.decoder_step_path = decoder_step_path
+
+        self.encoder = tf.lite.Interpreter(model_path=encoder_path, num_threads=num_threads)
+        self.decoder_step = tf.lite.Interpreter(model_path=decoder_step_path, num_threads=num_threads)
+
+        # Les signature runners redimensionnent les entrées à chaque appel (batch et longueur variables)
+        self._encode = self.encoder.get_signature_runner()
+        self._step = self.decoder_step.get_signature_runner()
+
+        # Un interpréteur n'est pas thread-safe
+        self._lock = threading.Lock()
+
+        self.size_bytes = os.path.getsize(encoder_path) + os.path.getsize(decoder_step_path)
+
+    @classmethod
+    def load(cls, language: str, num_threads: int = None) -> 'TFLiteSeq2Seq':
+        """Charge les composants TFLite d'une langue"""
+        paths = tflite_component_paths(language)
+        return cls(paths['encoder'], paths['decoder_step'], num_threads=num_threads)
+
+    @staticmethod
+    def exists(language: str) -> bool:
+        """Vérifie que tous les composants TFLite d'une langue sont présents"""
+        return all(os.path.exists(path) for path in tflite_component_paths(language).values())
+
+    @staticmethod
+    def resolve_beam_width(beam_width=1) -> int:
+        """
+        Largeur de faisceau effective du backend TFLite
+
+        Le beam search n'est pas exporté: toute largeur demandée se ramène au
+        décodage glouton (1), y compris dans les clés de cache des appelants.
+        """
+        return 1
+
+    def translate(self, source_text_ids, source_vocab, target_vocab, max_length=MAX_SEQUENCE_LENGTH,
+                  return_attention=False, beam_width=1):
+        """
+        Traduit une séquence source en séquence cible (même interface que Seq2SeqModel.translate)
+
+        Returns:
+            translation: Texte traduit
+            attention_weights: Poids d'attention [nb_pas, seq_len] (vide si non demandés)
+        """
+        (result, attention_weights, _), = self.translate_batch(
+            np.array([list(source_text_ids)], dtype=np.int32),
+            max_length=max_length, return_attention=return_attention, beam_width=beam_width
+        )
+
+        translation = target_vocab.decode(result, skip_special_tokens=True)
+
+        return translation, attention_weights
+
+    def translate_batch(self, source_seqs, max_length=MAX_SEQUENCE_LENGTH, return_attention=True,
+                        beam_width=1, **kwargs) -> List[Tuple[List[int], np.ndarray, float]]:
+        """
+        Traduit un batch de séquences source par décodage glouton
+
+        Le beam search n'est pas exporté: beam_width est accepté pour la
+        compatibilité avec Seq2SeqModel mais ramené à 1 (resolve_beam_width).
+
+        Args:
+            source_seqs: IDs source paddés avec PAD_ID [batch_size, seq_len]
+            max_length: Longueur maximale des traductions
+            return_attention: Collecter les poids d'attention
+
+        Returns:
+            Liste (une entrée par ligne) de tuples (ids_cible, poids_attention, confiance)
+            où poids_attention a la forme [nb_pas, longueur_source] et confiance
+            suit le calcul de _decode_confidence
+        """
+        beam_width = self.resolve_beam_width(beam_width)
+        source_seqs = np.asarray(source_seqs, dtype=np.int32)
+        batch_size = source_seqs.shape[0]
+        source_mask = np.not_equal(source_seqs, PAD_ID)
+        source_lengths = source_mask.sum(axis=1)
+
+        max_length = decode_length_cap(int(source_lengths.max()) if batch_size else 0, max_length)
+
+        finished = np.zeros(batch_size, dtype=bool)
+        lengths = np.zeros(batch_size, dtype=np.int32)
+        steps = np.zeros(batch_size, dtype=np.int32)
+        entropy_sum = np.zeros(batch_size, dtype=np.float32)
+        log_prob_sum = np.zeros(batch_size, dtype=np.float32)
+        log_source_lengths = np.log(source_lengths) + 1e-10
+        all_tokens = []
+        all_attention = []
+
+        with self._lock:
+            encoded = self._encode(source_seqs=source_seqs)
+            state_h, state_c = encoded['state_h'], encoded['state_c']
+            decoder_input = np.full((batch_size, 1), START_ID, dtype=np.int32)
+
+            for _ in range(max_length):
+                if finished.all():
+                    break
+
+                outputs = self._step(
+                    token_ids=decoder_input,
+                    state_h=state_h,
+                    state_c=state_c,
+                    encoder_output=encoded['encoder_output'],
+                    encoder_keys=encoded['encoder_keys'],
+                    source_mask=source_mask.astype(np.float32)
+                )
+                state_h, state_c = outputs['state_h'], outputs['state_c']
+                predicted_ids = outputs['log_probs'].argmax(axis=-1).astype(np.int32)
+
+                # Une ligne terminée (END émis) ne produit plus de tokens
+                active = ~finished
+                ended = active & (predicted_ids == END_ID)
+                emitted = active & ~ended
+
+                # Statistiques de confiance accumulées sur les pas actifs
+                weights = outputs['attention'] / (outputs['attention'].sum(axis=-1, keepdims=True) + 1e-10)
+                entropy = -(weights * np.log(weights + 1e-10)).sum(axis=-1) / log_source_lengths
+                entropy_sum += np.where(active, entropy, 0.0)
+                log_prob_sum += np.where(active, outputs['log_probs'][np.arange(batch_size), predicted_ids], 0.0)
+
+                steps += active
+                lengths += emitted
+                all_tokens.append(np.where(emitted, predicted_ids, PAD_ID))
+                if return_attention:
+                    all_attention.append(outputs['attention'])
+
+                finished |= ended
+                decoder_input = np.where(finished, PAD_ID, predicted_ids).astype(np.int32)[:, None]
+
+        # [nb_pas, batch] -> [batch, nb_pas]
+        token_ids = np.stack(all_tokens, axis=1) if all_tokens else np.zeros((batch_size, 0), dtype=np.int32)
+        attention = np.stack(all_attention, axis=1) if all_attention else None
+
+        num_steps = np.maximum(steps, 1)
+        confidence = (1.0 - CONFIDENCE_LOGPROB_WEIGHT) * (1.0 - entropy_sum / num_steps) + \
+            CONFIDENCE_LOGPROB_WEIGHT * np.exp(log_prob_sum / num_steps)
+        confidence = np.where(steps > 0, np.clip(confidence, 0.0, 1.0), 0.5)
+
+        return split_decoded_rows(token_ids, lengths, steps, attention, source_lengths, confidence)
@@ -10,11 +10,12 @@ from datetime import datetime
 from ml.config import (
     EPOCHS, LEARNING_RATE, BATCH_SIZE, MODEL_DIR, LOGS_DIR, CHECKPOINTS_DIR,
     EARLY_STOPPING_PATIENCE, REDUCE_LR_PATIENCE, REDUCE_LR_FACTOR,
-    SUPPORTED_LANGUAGES, TENSORBOARD_UPDATE_FREQ
+    SUPPORTED_LANGUAGES, TENSORBOARD_UPDATE_FREQ, MULTILINGUAL_MODEL,
+    TOKENIZER_TYPE, SUBWORD_VOCAB_SIZE
 )
 from ml.data_preparation import DatasetBuilder
 from ml.model_architecture import create_model
-from ml.vocabulary import Vocabulary
+from ml.vocabulary import Vocabulary, source_vocab_language
 
 
 class MaskedSparseCategoricalCrossentropy(keras.losses.Loss):
@@ -43,8 +44,11 @@ class MaskedSparseCategoricalCrossentropy(keras.losses.Loss):
 class TranslationTrainer:
     """Classe pour gérer l'entraînement du modèle"""
     
-    def __init__(self, target_language: str):
+    def __init__(self, target_language: str, tokenizer: str = TOKENIZER_TYPE,
+                 vocab_size: int = SUBWORD_VOCAB_SIZE):
         self.target_language = target_language
+        self.tokenizer = tokenizer
+        self.vocab_size = vocab_size
         self.model = None
         self.source_vocab = None
         self.target_vocab = None
@@ -65,7 +69,7 @@ class TranslationTrainer:
         print(f"📊 PRÉPARATION DES DONNÉES")
         print(f"{'='*60}\n")
         
-        builder = DatasetBuilder(self.target_language)
+        builder = DatasetBuilder(self.target_language, tokenizer=self.tokenizer, vocab_size=self.vocab_size)
         train_ds, val_ds, test_ds = builder.prepare_all(augment=augment)
         
         # Sauvegarder les vocabulaires
@@ -82,7 +86,7 @@ class TranslationTrainer:
         
         if self.source_vocab is None or self.target_vocab is None:
             # Charger les vocabulaires si pas déjà chargés
-            self.source_vocab = Vocabulary.load(language='fr')
+            self.source_vocab = Vocabulary.load(language=source_vocab_language(self.target_language))
             self.target_vocab = Vocabulary.load(language=self.target_language)
         
         self.model = create_model(
@@ -197,8 +201,9 @@ class TranslationTrainer:
         """Sauvegarde le modèle final"""
         print(f"\n💾 Sauvegarde du modèle...")
         
-        # Sauvegarder le modèle complet
-        self.model.save(self.model_path)
+        # Sauvegarder le modèle complet avec ses signatures de service
+        # (chargées directement par le service, sans retraçage)
+        self.model.save(self.model_path, signatures=self.model.serving_signatures())
         print(f"✅ Modèle sauvegardé: {self.model_path}")
         
         # Sauvegarder aussi les poids séparément
@@ -262,9 +267,9 @@ def main():
     parser.add_argument(
         '--target-language',
         type=str,
-        choices=SUPPORTED_LANGUAGES,
+        choices=SUPPORTED_LANGUAGES + [MULTILINGUAL_MODEL],
         required=True,
-        help='Langue cible pour la traduction'
+        help=f'Langue cible pour la traduction ({MULTILINGUAL_MODEL}: un modèle pour toutes les langues)'
     )
     parser.add_argument(
         '--epochs',
@@ -284,10 +289,24 @@ def main():
         help=f'Learning rate (défaut: {LEARNING_RATE})'
     )
     
+    parser.add_argument(
+        '--tokenizer',
+        type=str,
+        choices=['word', 'bpe'],
+        default=TOKENIZER_TYPE,
+        help=f'Tokenisation par mots ou en sous-mots BPE (défaut: {TOKENIZER_TYPE})'
+    )
+    parser.add_argument(
+        '--vocab-size',
+        type=int,
+        default=SUBWORD_VOCAB_SIZE,
+        help=f'Budget du vocabulaire BPE (défaut: {SUBWORD_VOCAB_SIZE})'
+    )
+    
     args = parser.parse_args()
     
     # Créer le trainer
-    trainer = TranslationTrainer(args.target_language)
+    trainer = TranslationTrainer(args.target_language, tokenizer=args.tokenizer, vocab_size=args.vocab_size)
     
     # Lancer l'entraînement complet
     trainer.run_full_training(
@@ -1,19 +1,79 @@
 """
 Gestion des vocabulaires pour les langues sources et cibles
 """
+import hashlib
 import json
 import os
-from typing import Dict, List, Set
-from collections import Counter
+import re
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from collections import Counter, OrderedDict
 import pickle
 
+import numpy as np
+
 from ml.config import (
     PAD_TOKEN, START_TOKEN, END_TOKEN, UNK_TOKEN,
     PAD_ID, START_ID, END_ID, UNK_ID,
     SPECIAL_TOKENS, MIN_VOCAB_FREQUENCY,
-    VOCAB_FILE_TEMPLATE
+    VOCAB_FILE_TEMPLATE, SOURCE_LANGUAGE, MULTILINGUAL_MODEL, LANGUAGE_TOKEN_TEMPLATE,
+    SUBWORD_VOCAB_SIZE, SUBWORD_CACHE_MAX_WORDS
 )
 
+# Marqueur de fin de mot des sous-mots BPE
+END_OF_WORD = "</w>"
+
+# Tokens de langue cible, jamais découpés
+_LANGUAGE_TOKEN_PATTERN = re.compile(r'<2[^>\s]+>')
+
+# Expressions compilées une fois: mots, ponctuation et tokens de langue; espaces avant ponctuation
+_TOKEN_PATTERN = re.compile(r'<2[^>\s]+>|\w+|[^\w\s]')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([.,!?;:])')
+
+# Format binaire: en-tête, table d'offsets, fusions BPE (paires d'ids), table de chaînes UTF-8
+_BINARY_MAGIC = b'KVOC'
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('<4sHHIII')  # magic, version, drapeaux, nb_tokens, nb_fusions, budget BPE
+_BINARY_FLAG_BPE = 1
+
+# Tokens spéciaux, ignorés au décodage
+_SPECIAL_TOKEN_SET = frozenset(SPECIAL_TOKENS)
+_SPECIAL_IDS = frozenset((PAD_ID, START_ID, END_ID, UNK_ID))
+
+
+def language_token(language: str) -> str:
+    """Retourne le token de langue cible préfixé aux sources du modèle multilingue"""
+    return LANGUAGE_TOKEN_TEMPLATE.format(language=language)
+
+
+def _merges_path(vocab_path: str) -> str:
+    """Retourne le chemin du fichier de fusions BPE enregistré à côté du vocabulaire"""
+    return os.path.splitext(vocab_path)[0] + "_merges.json"
+
+
+def _binary_path(vocab_path: str) -> str:
+    """Retourne le chemin de l'artefact binaire enregistré à côté du vocabulaire JSON"""
+    return os.path.splitext(vocab_path)[0] + ".bin"
+
+
+def _idx2word_list(idx2word: Dict) -> List[str]:
+    """Convertit le dictionnaire id -> mot du format JSON en liste indexée par l'id"""
+    words = [UNK_TOKEN] * (max((int(idx) for idx in idx2word), default=-1) + 1)
+    for idx, word in idx2word.items():
+        words[int(idx)] = word
+    return words
+
+
+def source_vocab_language(target_language: str) -> str:
+    """
+    Retourne le nom du vocabulaire source d'un modèle
+    (le modèle multilingue a son propre vocabulaire source, avec les tokens de langue)
+    """
+    if target_language == MULTILINGUAL_MODEL:
+        return f"{SOURCE_LANGUAGE}_{MULTILINGUAL_MODEL}"
+    return SOURCE_LANGUAGE
+
 
 class Vocabulary:
     """Classe pour gérer le vocabulaire d'une langue"""
@@ -21,8 +81,11 @@ class Vocabulary:
     def __init__(self, language: str):
         self.language = language
         self.word2idx: Dict[str, int] = {}
-        self.idx2word: Dict[int, str] = {}
+        # Indexé par l'id (liste dense, ids contigus à partir de 0)
+        self.idx2word: List[str] = []
         self.word_counts: Counter = Counter()
+        # Empreinte de l'artefact binaire (renseignée à la sauvegarde / au chargement binaire)
+        self.content_hash: Optional[str] = None
         
         # Initialiser avec les tokens spéciaux
         self._init_special_tokens()
@@ -36,6 +99,7 @@ class Vocabulary:
             UNK_TOKEN: UNK_ID
         }
         
+        self.idx2word = [None] * len(special_mapping)
         for token, idx in special_mapping.items():
             self.word2idx[token] = idx
             self.idx2word[idx] = token
@@ -54,12 +118,10 @@ class Vocabulary:
             self.word_counts.update(words)
         
         # Ajouter les mots au vocabulaire (triés par fréquence)
-        next_idx = len(SPECIAL_TOKENS)
         for word, count in self.word_counts.most_common():
             if count >= min_frequency and word not in self.word2idx:
-                self.word2idx[word] = next_idx
-                self.idx2word[next_idx] = word
-                next_idx += 1
+                self.word2idx[word] = len(self.idx2word)
+                self.idx2word.append(word)
         
         print(f"✅ Vocabulaire {self.language}: {len(self.word2idx)} mots (min_freq={min_frequency})")
     
@@ -72,19 +134,17 @@ class Vocabulary:
         text = text.lower().strip()
         
         # Séparer par espaces et ponctuation
-        # On garde la ponctuation comme tokens séparés
-        import re
-        tokens = re.findall(r'\w+|[^\w\s]', text)
-        
-        return tokens
+        # On garde la ponctuation comme tokens séparés, et les tokens de langue (<2xx>) entiers
+        return _TOKEN_PATTERN.findall(text)
     
-    def encode(self, text: str, add_special_tokens: bool = True) -> List[int]:
+    def encode(self, text: str, add_special_tokens: bool = True, target_language: str = None) -> List[int]:
         """
         Encode un texte en séquence d'indices
         
         Args:
             text: Texte à encoder
             add_special_tokens: Ajouter START et END tokens
+            target_language: Préfixer le token de langue cible (modèle multilingue)
         
         Returns:
             Liste d'indices
@@ -92,6 +152,9 @@ class Vocabulary:
         tokens = self._tokenize(text)
         indices = [self.word2idx.get(token, UNK_ID) for token in tokens]
         
+        if target_language is not None:
+            indices = [self.word2idx.get(language_token(target_language), UNK_ID)] + indices
+        
         if add_special_tokens:
             indices = [START_ID] + indices + [END_ID]
         
@@ -108,23 +171,83 @@ class Vocabulary:
         Returns:
             Texte décodé
         """
-        words = []
-        for idx in indices:
-            word = self.idx2word.get(idx, UNK_TOKEN)
-            
-            if skip_special_tokens and word in SPECIAL_TOKENS:
-                continue
-            
-            words.append(word)
+        idx2word = self.idx2word
+        size = len(idx2word)
+        
+        if skip_special_tokens:
+            # Les ids spéciaux et hors vocabulaire (UNK) sont ignorés sans passer par les chaînes
+            words = [idx2word[idx] for idx in indices if idx not in _SPECIAL_IDS and 0 <= idx < size]
+        else:
+            words = [idx2word[idx] if 0 <= idx < size else UNK_TOKEN for idx in indices]
         
         # Reconstruire le texte
         text = " ".join(words)
         
         # Nettoyer les espaces autour de la ponctuation
-        import re
-        text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+        return _SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+    
+    def _id_to_token(self, idx: int) -> str:
+        """Retourne le token d'un id (UNK hors vocabulaire)"""
+        if 0 <= idx < len(self.idx2word):
+            return self.idx2word[idx]
+        return UNK_TOKEN
+    
+    def encode_batch(self, texts: Sequence[str], max_len: Optional[int] = None,
+                     add_special_tokens: bool = True,
+                     target_languages: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode plusieurs textes dans un seul tableau paddé avec PAD_ID
         
-        return text
+        Args:
+            texts: Textes à encoder
+            max_len: Longueur du tableau (tronque au-delà); défaut: plus longue séquence
+            add_special_tokens: Ajouter START et END tokens
+            target_languages: Langue cible par texte, pour préfixer le token de langue (modèle multilingue)
+        
+        Returns:
+            Tuple (ids int32 [nb_textes, longueur], longueurs int32 [nb_textes]) où les
+            longueurs sont celles avant troncature (filtrer avec longueurs <= max_len)
+        """
+        word2idx = self.word2idx
+        sequences = []
+        
+        for i, text in enumerate(texts):
+            indices = [word2idx.get(token, UNK_ID) for token in self._tokenize(text)]
+            
+            if target_languages is not None:
+                indices.insert(0, word2idx.get(language_token(target_languages[i]), UNK_ID))
+            
+            if add_special_tokens:
+                indices.insert(0, START_ID)
+                indices.append(END_ID)
+            
+            sequences.append(indices)
+        
+        lengths = np.fromiter((len(indices) for indices in sequences), dtype=np.int32, count=len(sequences))
+        width = max_len if max_len is not None else int(lengths.max(initial=0))
+        
+        ids = np.full((len(sequences), width), PAD_ID, dtype=np.int32)
+        for row, indices in enumerate(sequences):
+            indices = indices[:width]
+            ids[row, :len(indices)] = indices
+        
+        return ids, lengths
+    
+    def decode_batch(self, ids, skip_special_tokens: bool = True) -> List[str]:
+        """
+        Décode plusieurs séquences d'indices
+        
+        Args:
+            ids: Tableau paddé [nb_séquences, longueur] ou liste de séquences
+            skip_special_tokens: Ignorer les tokens spéciaux (dont le padding)
+        
+        Returns:
+            Liste de textes décodés
+        """
+        if isinstance(ids, np.ndarray):
+            ids = ids.tolist()
+        
+        return [self.decode(indices, skip_special_tokens=skip_special_tokens) for indices in ids]
     
     def __len__(self) -> int:
         """Retourne la taille du vocabulaire"""
@@ -138,30 +261,153 @@ class Vocabulary:
         vocab_data = {
             'language': self.language,
             'word2idx': self.word2idx,
-            'idx2word': {int(k): v for k, v in self.idx2word.items()},
+            'idx2word': dict(enumerate(self.idx2word)),
             'word_counts': dict(self.word_counts)
         }
         
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(vocab_data, f, ensure_ascii=False, indent=2)
         
+        self.save_binary(_binary_path(filepath))
+        
         print(f"💾 Vocabulaire sauvegardé: {filepath}")
     
+    def _binary_merges(self) -> List[Tuple[int, int]]:
+        """Fusions BPE en paires d'ids (aucune pour un vocabulaire par mots)"""
+        return []
+    
+    def save_binary(self, filepath: str = None) -> str:
+        """
+        Sauvegarde l'artefact binaire d'inférence (sans les fréquences)
+        
+        Args:
+            filepath: Chemin du fichier .bin (défaut: à côté du vocabulaire JSON)
+        
+        Returns:
+            Empreinte SHA-256 du contenu
+        """
+        if filepath is None:
+            filepath = _binary_path(VOCAB_FILE_TEMPLATE.format(language=self.language))
+        
+        strings = [token.encode('utf-8') for token in self.idx2word]
+        offsets = np.zeros(len(strings) + 1, dtype='<u4')
+        offsets[1:] = np.cumsum([len(token) for token in strings])
+        merges = np.array(self._binary_merges(), dtype='<i4').reshape(-1, 2)
+        language = self.language.encode('utf-8')
+        
+        is_bpe = isinstance(self, SubwordVocabulary)
+        body = b''.join([
+            _BINARY_HEADER.pack(
+                _BINARY_MAGIC, _BINARY_VERSION, _BINARY_FLAG_BPE if is_bpe else 0,
+                len(strings), len(merges), getattr(self, 'vocab_size', 0)
+            ),
+            struct.pack('<H', len(language)), language,
+            offsets.tobytes(), merges.tobytes(), b''.join(strings)
+        ])
+        content_hash = hashlib.sha256(body).digest()
+        
+        # L'empreinte en tête permet de vérifier le fichier et de versionner le vocabulaire
+        with open(filepath, 'wb') as f:
+            f.write(content_hash)
+            f.write(body)
+        
+        self.content_hash = content_hash.hex()
+        return self.content_hash
+    
+    @classmethod
+    def load_binary(cls, filepath: str, verify: bool = True) -> 'Vocabulary':
+        """
+        Chargement binaire rapide, sans parser de JSON (mode inférence: pas de fréquences)
+        
+        Le fichier est lu en une seule fois; la table d'offsets et les fusions
+        sont décodées en bloc par numpy, puis les tables de tokens construites
+        en mémoire.
+        
+        Args:
+            filepath: Chemin du fichier .bin
+            verify: Vérifier l'empreinte SHA-256 du contenu
+        
+        Returns:
+            Vocabulary ou SubwordVocabulary
+        """
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        
+        content_hash = data[:32]
+        if verify and hashlib.sha256(memoryview(data)[32:]).digest() != content_hash:
+            raise ValueError(f"Empreinte invalide: {filepath}")
+        
+        offset = 32
+        magic, version, flags, num_tokens, num_merges, vocab_size = _BINARY_HEADER.unpack_from(data, offset)
+        if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+            raise ValueError(f"Format de vocabulaire binaire inconnu: {filepath}")
+        offset += _BINARY_HEADER.size
+        
+        (language_length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        language = data[offset:offset + language_length].decode('utf-8')
+        offset += language_length
+        
+        offsets = np.frombuffer(data, dtype='<u4', count=num_tokens + 1, offset=offset).tolist()
+        offset += 4 * (num_tokens + 1)
+        merges = np.frombuffer(data, dtype='<i4', count=2 * num_merges, offset=offset).reshape(-1, 2).tolist()
+        offset += 8 * num_merges
+        
+        strings = data[offset:offset + offsets[-1]]
+        
+        if flags & _BINARY_FLAG_BPE:
+            vocab = SubwordVocabulary(language, vocab_size=vocab_size)
+        else:
+            vocab = Vocabulary(language)
+        
+        vocab.idx2word = [strings[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+        vocab.word2idx = {token: idx for idx, token in enumerate(vocab.idx2word)}
+        vocab.content_hash = content_hash.hex()
+        
+        if merges:
+            vocab.merges = [(vocab.idx2word[left], vocab.idx2word[right]) for left, right in merges]
+            vocab._merge_ranks = {pair: rank for rank, pair in enumerate(vocab.merges)}
+        
+        return vocab
+    
     @classmethod
-    def load(cls, filepath: str = None, language: str = None):
-        """Charge un vocabulaire depuis un fichier"""
+    def load(cls, filepath: str = None, language: str = None, inference_only: bool = False):
+        """
+        Charge un vocabulaire depuis un fichier
+        
+        Args:
+            filepath: Chemin du vocabulaire JSON
+            language: Langue (chemin par défaut)
+            inference_only: Préférer l'artefact binaire à jour (sans les fréquences), s'il existe
+        """
         if filepath is None and language is None:
             raise ValueError("Spécifier filepath ou language")
         
         if filepath is None:
             filepath = VOCAB_FILE_TEMPLATE.format(language=language)
         
+        binary_path = _binary_path(filepath)
+        if inference_only and os.path.exists(binary_path) and (
+            not os.path.exists(filepath) or os.path.getmtime(binary_path) >= os.path.getmtime(filepath)
+        ):
+            try:
+                vocab = cls.load_binary(binary_path)
+                print(f"📂 Vocabulaire chargé: {binary_path} ({len(vocab)} mots, {vocab.content_hash[:12]})")
+                return vocab
+            except ValueError as e:
+                print(f"⚠️  {e}, chargement du JSON")
+        
         with open(filepath, 'r', encoding='utf-8') as f:
             vocab_data = json.load(f)
         
+        if vocab_data.get('tokenizer') == 'bpe':
+            vocab = SubwordVocabulary._from_data(vocab_data, filepath)
+            print(f"📂 Vocabulaire BPE chargé: {filepath} ({len(vocab)} sous-mots)")
+            return vocab
+        
         vocab = cls(vocab_data['language'])
         vocab.word2idx = vocab_data['word2idx']
-        vocab.idx2word = {int(k): v for k, v in vocab_data['idx2word'].items()}
+        vocab.idx2word = _idx2word_list(vocab_data['idx2word'])
         vocab.word_counts = Counter(vocab_data['word_counts'])
         
         print(f"📂 Vocabulaire chargé: {filepath} ({len(vocab)} mots)")
@@ -177,3 +423,200 @@ class Vocabulary:
             'most_common': self.word_counts.most_common(10),
             'coverage': len(self.word_counts) / len(self) if len(self) > 0 else 0
         }
+
+
+class SubwordVocabulary(Vocabulary):
+    """
+    Vocabulaire en sous-mots (BPE) avec un budget de taille fixe.
+    
+    Les mots sont découpés en caractères (le dernier porte le marqueur de fin
+    de mot) puis fusionnés selon les règles apprises, par ordre de priorité.
+    Les tokens de langue (<2xx>) restent entiers. La taille du vocabulaire,
+    donc de l'embedding et de la softmax de sortie, ne croît plus avec le corpus.
+    """
+    
+    def __init__(self, language: str, vocab_size: int = SUBWORD_VOCAB_SIZE):
+        super(SubwordVocabulary, self).__init__(language)
+        self.vocab_size = vocab_size
+        self.merges: List[Tuple[str, str]] = []
+        self._merge_ranks: Dict[Tuple[str, str], int] = {}
+        # Découpages récents (LRU borné: le service reçoit des mots arbitraires)
+        self._word_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._word_cache_lock = threading.Lock()
+    
+    def _add_symbol(self, symbol: str):
+        """Ajoute un symbole au vocabulaire s'il est absent"""
+        if symbol not in self.word2idx:
+            self.word2idx[symbol] = len(self.idx2word)
+            self.idx2word.append(symbol)
+    
+    def build_from_texts(self, texts: List[str], min_frequency: int = MIN_VOCAB_FREQUENCY):
+        """
+        Apprend les fusions BPE jusqu'à atteindre le budget de vocabulaire
+        
+        Args:
+            texts: Liste de textes
+            min_frequency: Fréquence minimale d'une paire pour être fusionnée (au moins 2)
+        """
+        # Compter les mots (pré-tokenisation identique au vocabulaire par mots)
+        for text in texts:
+            self.word_counts.update(super(SubwordVocabulary, self)._tokenize(text))
+        
+        # Chaque mot devient une séquence de symboles, le dernier marqué fin de mot
+        words = {}
+        for word, count in self.word_counts.items():
+            if _LANGUAGE_TOKEN_PATTERN.fullmatch(word):
+                self._add_symbol(word)
+            else:
+                words[tuple(word[:-1]) + (word[-1] + END_OF_WORD,)] = count
+        
+        for symbols in words:
+            for symbol in symbols:
+                self._add_symbol(symbol)
+        
+        min_frequency = max(min_frequency, 2)
+        
+        while len(self.word2idx) < self.vocab_size:
+            # Paire de symboles adjacents la plus fréquente
+            pair_counts = Counter()
+            for symbols, count in words.items():
+                for pair in zip(symbols, symbols[1:]):
+                    pair_counts[pair] += count
+            
+            if not pair_counts:
+                break
+            best, count = pair_counts.most_common(1)[0]
+            if count < min_frequency:
+                break
+            
+            self.merges.append(best)
+            self._add_symbol(best[0] + best[1])
+            words = {self._merge_pair(symbols, best): count for symbols, count in words.items()}
+        
+        self._merge_ranks = {pair: rank for rank, pair in enumerate(self.merges)}
+        with self._word_cache_lock:
+            self._word_cache.clear()
+        
+        print(f"✅ Vocabulaire BPE {self.language}: {len(self.word2idx)} sous-mots "
+              f"({len(self.merges)} fusions, budget {self.vocab_size})")
+    
+    @staticmethod
+    def _merge_pair(symbols: Tuple[str, ...], pair: Tuple[str, str]) -> Tuple[str, ...]:
+        """Fusionne toutes les occurrences d'une paire dans une séquence de symboles"""
+        merged = []
+        i = 0
+        while i < len(symbols):
+            if i < len(symbols) - 1 and (symbols[i], symbols[i + 1]) == pair:
+                merged.append(symbols[i] + symbols[i + 1])
+                i += 2
+            else:
+                merged.append(symbols[i])
+                i += 1
+        return tuple(merged)
+    
+    def _segment_word(self, word: str) -> List[str]:
+        """Découpe un mot en sous-mots en appliquant les fusions par ordre de priorité"""
+        with self._word_cache_lock:
+            cached = self._word_cache.get(word)
+            if cached is not None:
+                self._word_cache.move_to_end(word)
+                return cached
+        
+        if _LANGUAGE_TOKEN_PATTERN.fullmatch(word):
+            pieces = [word]
+        else:
+            symbols = tuple(word[:-1]) + (word[-1] + END_OF_WORD,)
+            while len(symbols) > 1:
+                # Fusion de rang le plus faible parmi les paires présentes
+                pair = min(
+                    zip(symbols, symbols[1:]),
+                    key=lambda candidate: self._merge_ranks.get(candidate, float('inf'))
+                )
+                if pair not in self._merge_ranks:
+                    break
+                symbols = self._merge_pair(symbols, pair)
+            pieces = list(symbols)
+        
+        with self._word_cache_lock:
+            self._word_cache[word] = pieces
+            while len(self._word_cache) > SUBWORD_CACHE_MAX_WORDS:
+                self._word_cache.popitem(last=False)
+        return pieces
+    
+    def _tokenize(self, text: str) -> List[str]:
+        """Tokenise un texte en sous-mots"""
+        pieces = []
+        for word in super(SubwordVocabulary, self)._tokenize(text):
+            pieces.extend(self._segment_word(word))
+        return pieces
+    
+    def decode(self, indices: List[int], skip_special_tokens: bool = True) -> str:
+        """
+        Décode une séquence d'indices en texte (recolle les sous-mots)
+        
+        Args:
+            indices: Liste d'indices
+            skip_special_tokens: Ignorer les tokens spéciaux
+        
+        Returns:
+            Texte décodé
+        """
+        pieces = []
+        for idx in indices:
+            piece = self._id_to_token(idx)
+            
+            if skip_special_tokens and piece in _SPECIAL_TOKEN_SET:
+                continue
+            
+            # Les tokens entiers (spéciaux, langue) sont des mots à part
+            if piece in _SPECIAL_TOKEN_SET or _LANGUAGE_TOKEN_PATTERN.fullmatch(piece):
+                piece += END_OF_WORD
+            pieces.append(piece)
+        
+        text = "".join(pieces).replace(END_OF_WORD, " ").strip()
+        
+        # Nettoyer les espaces autour de la ponctuation
+        return _SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+    
+    def save(self, filepath: str = None):
+        """Sauvegarde le vocabulaire et, à côté, les fusions BPE"""
+        if filepath is None:
+            filepath = VOCAB_FILE_TEMPLATE.format(language=self.language)
+        
+        vocab_data = {
+            'language': self.language,
+            'tokenizer': 'bpe',
+            'vocab_size': self.vocab_size,
+            'word2idx': self.word2idx,
+            'idx2word': dict(enumerate(self.idx2word)),
+            'word_counts': dict(self.word_counts)
+        }
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(vocab_data, f, ensure_ascii=False, indent=2)
+        
+        merges_path = _merges_path(filepath)
+        with open(merges_path, 'w', encoding='utf-8') as f:
+            json.dump([list(pair) for pair in self.merges], f, ensure_ascii=False)
+        
+        self.save_binary(_binary_path(filepath))
+        
+        print(f"💾 Vocabulaire BPE sauvegardé: {filepath} (+ {merges_path})")
+    
+    def _binary_merges(self) -> List[Tuple[int, int]]:
+        """Fusions BPE en paires d'ids (les deux symboles sont dans le vocabulaire)"""
+        return [(self.word2idx[left], self.word2idx[right]) for left, right in self.merges]
+    
+    @classmethod
+    def _from_data(cls, vocab_data: Dict, filepath: str) -> 'SubwordVocabulary':
+        """Reconstruit un vocabulaire BPE depuis les données JSON et son fichier de fusions"""
+        vocab = cls(vocab_data['language'], vocab_size=vocab_data.get('vocab_size', SUBWORD_VOCAB_SIZE))
+        vocab.word2idx = vocab_data['word2idx']
+        vocab.idx2word = _idx2word_list(vocab_data['idx2word'])
+        vocab.word_counts = Counter(vocab_data['word_counts'])
+        
+        with open(_merges_path(filepath), 'r', encoding='utf-8') as f:
+            vocab.merges = [tuple(pair) for pair in json.load(f)]
+        vocab._merge_ranks = {pair: rank for rank, pair in enumerate(vocab.merges)}
+        
+        return vocab
@@ -2,6 +2,14 @@ from flask import Blueprint, request, jsonify
 from services.firestore import FirestoreService
 from services.gemini import GeminiService
 from services.tensorflow import get_tensorflow_service
+from services.cache import (
+    get_translation_cache, get_negative_cache, normalize_text, NEGATIVE_NOT_FOUND, NEGATIVE_IMPOSSIBLE
+)
+from services.singleflight import SingleFlight
+from services.router import get_translation_router, TIER_DATABASE, TIER_TENSORFLOW, TIER_GEMINI
+from services.deadline import Deadline
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
 import time
 
 translate_bp = Blueprint('translate', __name__)
@@ -10,6 +18,191 @@ translate_bp = Blueprint('translate', __name__)
 firestore_service = FirestoreService()
 gemini_service = GeminiService()
 tensorflow_service = get_tensorflow_service()  # Service TensorFlow
+translation_cache = get_translation_cache()  # Cache des traductions réussies
+negative_cache = get_negative_cache()  # Cache des échecs récents (404/422)
+translation_flight = SingleFlight()  # Coalescence des traductions identiques en cours
+translation_router = get_translation_router()  # Ordre des tiers selon les statistiques glissantes
+
+# Budget de temps d'une requête batch (les prompts Gemini groupés sont parallélisés par GeminiService)
+BATCH_DEADLINE_SECONDS = float(os.getenv('TRANSLATE_BATCH_DEADLINE_SECONDS', '20'))
+# Budget de temps d'une requête unitaire, partagé par tous les tiers
+TRANSLATE_DEADLINE_SECONDS = float(os.getenv('TRANSLATE_DEADLINE_SECONDS', '10'))
+
+# Pool partagé des décodages TensorFlow concurrents de /translate/multi (une tâche par langue)
+MULTI_POOL_SIZE = int(os.getenv('TRANSLATE_MULTI_POOL_SIZE', '8'))
+multi_executor = ThreadPoolExecutor(max_workers=MULTI_POOL_SIZE, thread_name_prefix='translate-multi')
+
+def _parse_beam_width(data):
+    """
+    Lit le champ optionnel 'beamWidth' de la requête.
+
+    Returns:
+        Largeur de faisceau bornée pour TensorFlow, ou None si le champ est invalide
+        (la largeur effective d'une langue est donnée par resolve_beam_width(largeur, langue))
+    """
+    beam_width = data.get('beamWidth')
+    if beam_width is not None and (isinstance(beam_width, bool) or not isinstance(beam_width, int) or beam_width < 1):
+        return None
+    return tensorflow_service.resolve_beam_width(beam_width)
+
+
+def _available_model_tiers():
+    """Retourne les tiers modèles (TensorFlow, Gemini) actuellement disponibles"""
+    tiers = []
+    if tensorflow_service.is_service_available():
+        tiers.append(TIER_TENSORFLOW)
+    if gemini_service.is_service_available():
+        tiers.append(TIER_GEMINI)
+    return tiers
+
+
+def _try_database(text: str, target_language: str, deadline: Deadline = None):
+    """
+    Tier base de données: correspondance exacte du texte.
+
+    Returns:
+        Tuple de (traduction ou None, confiance, accepté)
+    """
+    print(f"DEBUG: Recherche dans la base de données...")
+    translation = firestore_service.get_translation(text, target_language, deadline=deadline)
+
+    if translation:
+        print(f"DEBUG: Traduction trouvée dans la base de données: '{translation}'")
+        return translation, 0.0, True
+    return None, 0.0, False
+
+
+def _try_tensorflow(text: str, target_language: str, beam_width: int = None, deadline: Deadline = None):
+    """
+    Tier TensorFlow: la traduction n'est retenue qu'au-dessus du seuil de confiance.
+
+    Returns:
+        Tuple de (traduction ou None, confiance, accepté); une traduction sous
+        le seuil est retournée non acceptée (résultat partiel si l'échéance expire)
+    """
+    from ml.config import CONFIDENCE_THRESHOLD
+
+    print(f"DEBUG: Tentative de traduction avec TensorFlow...")
+    tf_result = tensorflow_service.translate_text(text, target_language, beam_width=beam_width, deadline=deadline)
+    if not tf_result:
+        return None, 0.0, False
+
+    translation, confidence = tf_result
+    if confidence >= CONFIDENCE_THRESHOLD:
+        print(f"DEBUG: Traduction TensorFlow acceptée (confiance: {confidence:.2f})")
+        return translation, confidence, True
+
+    print(f"DEBUG: Confiance TensorFlow trop faible ({confidence:.2f} < {CONFIDENCE_THRESHOLD}), tier suivant")
+    return translation, confidence, False
+
+
+def _try_gemini(text: str, target_language: str, deadline: Deadline = None):
+    """
+    Tier Gemini: la traduction réussie est sauvegardée en base pour usage futur.
+
+    Returns:
+        Tuple de (traduction ou None, confiance, accepté); la traduction peut valoir
+        TRADUCTION_IMPOSSIBLE, réponse définitive qui arrête la chaîne
+    """
+    print(f"DEBUG: Tentative de traduction avec Gemini...")
+    translation = gemini_service.translate_text(text, target_language, deadline=deadline)
+
+    accepted = bool(translation) and translation != "TRADUCTION_IMPOSSIBLE"
+    if accepted:
+        print(f"DEBUG: Traduction Gemini réussie: '{translation}'")
+        firestore_service.save_translation(text, target_language, translation)
+
+    return translation or None, 0.0, accepted
+
+
+def _run_translation_pipeline(text: str, target_language: str, beam_width: int = None,
+                              deadline: Deadline = None):
+    """
+    Exécute la chaîne de traduction: correspondance exacte en base, puis les
+    tiers modèles dans l'ordre choisi par le routeur adaptatif.
+
+    Chaque tier reçoit l'échéance de la requête ; quand elle est dépassée, la
+    chaîne s'arrête et la meilleure traduction disponible (TensorFlow sous le
+    seuil de confiance) est retournée comme résultat partiel.
+
+    Returns:
+        Tuple de (traduction, source, confiance, routage); traduction vaut None
+        si aucun tier n'a produit de résultat. Le routage décrit l'ordre choisi,
+        les tiers sautés, chaque tentative (champ debug de la réponse) et les
+        indicateurs deadlineExceeded / partial.
+    """
+    translation = None
+    source = None
+    confidence = 0.0
+    routing = {'order': [TIER_DATABASE], 'skipped': {}, 'attempts': []}
+    partial = None
+
+    def attempt(tier, run):
+        start = time.monotonic()
+        result, tier_confidence, accepted = run()
+        latency = time.monotonic() - start
+        translation_router.record(target_language, tier, latency, result is not None, accepted)
+        routing['attempts'].append({
+            'tier': tier,
+            'latencyMs': round(latency * 1000, 2),
+            'accepted': accepted,
+            # Gemini répond toujours (traduction ou TRADUCTION_IMPOSSIBLE): None signale une erreur
+            'error': tier == TIER_GEMINI and result is None
+        })
+        return result, tier_confidence, accepted
+
+    # Étape 1: correspondance exacte dans la base de données (toujours en premier, la moins chère)
+    translation, _, _ = attempt(TIER_DATABASE, lambda: _try_database(text, target_language, deadline))
+    if translation:
+        return translation, TIER_DATABASE, confidence, routing
+
+    # Étape 2: tiers modèles ordonnés (et éventuellement sautés) selon les statistiques de la langue
+    order, skipped, decision = translation_router.plan(target_language, _available_model_tiers())
+    routing['order'].extend(order)
+    routing['skipped'] = skipped
+    routing['decision'] = decision
+
+    runners = {
+        TIER_TENSORFLOW: lambda: _try_tensorflow(text, target_language, beam_width, deadline),
+        TIER_GEMINI: lambda: _try_gemini(text, target_language, deadline)
+    }
+    for tier in order:
+        if deadline is not None and deadline.expired():
+            break
+
+        result, tier_confidence, accepted = attempt(tier, runners[tier])
+        if tier == TIER_TENSORFLOW:
+            confidence = tier_confidence
+        if accepted:
+            translation, source = result, tier
+            break
+        if result == "TRADUCTION_IMPOSSIBLE":
+            translation, source = result, tier
+            break
+        if result and tier == TIER_TENSORFLOW:
+            # Traduction sous le seuil: gardée au cas où l'échéance empêche les tiers suivants
+            partial = result
+
+    if not translation and deadline is not None and deadline.expired():
+        routing['deadlineExceeded'] = True
+        if partial:
+            print(f"DEBUG: Échéance dépassée, traduction TensorFlow partielle retournée")
+            routing['partial'] = True
+            translation, source = partial, TIER_TENSORFLOW
+
+    return translation, source, confidence, routing
+
+
+def _is_definitive_miss(routing) -> bool:
+    """
+    Indique si l'absence de traduction est une réponse définitive (à mémoriser
+    dans le cache négatif) et non un échec transitoire: échéance dépassée,
+    erreur Gemini ou Gemini écarté par son disjoncteur ouvert.
+    """
+    if routing.get('deadlineExceeded') or gemini_service.breaker.is_open():
+        return False
+    return not any(attempt.get('error') for attempt in routing.get('attempts', []))
+
 
 @translate_bp.route('/translate', methods=['POST'])
 def translate():
@@ -17,6 +210,8 @@ def translate():
     Endpoint pour traduire du français vers une langue locale africaine.
     """
     start_time = time.time()
+    # Échéance de la requête, passée à chaque tier
+    deadline = Deadline(TRANSLATE_DEADLINE_SECONDS)
 
     try:
         # Validation des données d'entrée
@@ -51,59 +246,86 @@ def translate():
                 'error': f'Langue non supportée. Langues disponibles: {", ".join(supported_languages)}'
             }), 400
 
+        beam_width = _parse_beam_width(data)
+        if beam_width is None:
+            return jsonify({
+                'success': False,
+                'error': 'beamWidth doit être un entier positif'
+            }), 400
+
         # --- DEBUGGING PRINTS START HERE ---
         print(f"\nDEBUG: Requête de traduction reçue: '{text}' vers '{target_language}'")
         print(f"DEBUG: FirestoreService est en mode local: {firestore_service.use_local_data}")
 
-        translation = None
-        source = None
-        confidence = 0.0
-
-        # STRATÉGIE DE FALLBACK PROGRESSIVE:
-        # 1. TensorFlow (si disponible et confiance >= seuil)
-        # 2. Gemini (si TensorFlow échoue ou confiance faible)
-        # 3. Database (si tout échoue)
-
-        # Étape 1: Essayer TensorFlow d'abord
-        if tensorflow_service.is_service_available():
-            print(f"DEBUG: Tentative de traduction avec TensorFlow...")
-            tf_result = tensorflow_service.translate_text(text, target_language)
-            
-            if tf_result:
-                translation, confidence = tf_result
-                
-                # Vérifier si la confiance est suffisante
-                from ml.config import CONFIDENCE_THRESHOLD
-                if confidence >= CONFIDENCE_THRESHOLD:
-                    source = 'tensorflow'
-                    print(f"DEBUG: Traduction TensorFlow acceptée (confiance: {confidence:.2f})")
-                else:
-                    print(f"DEBUG: Confiance TensorFlow trop faible ({confidence:.2f} < {CONFIDENCE_THRESHOLD}), fallback vers Gemini")
-                    translation = None  # Réinitialiser pour essayer Gemini
-
-        # Étape 2: Fallback vers Gemini si TensorFlow échoue ou confiance faible
-        if not translation and gemini_service.is_service_available():
-            print(f"DEBUG: Tentative de traduction avec Gemini...")
-            translation = gemini_service.translate_text(text, target_language)
-            
-            if translation and translation != "TRADUCTION_IMPOSSIBLE":
-                source = 'gemini'
-                print(f"DEBUG: Traduction Gemini réussie: '{translation}'")
-                
-                # Sauvegarder la traduction Gemini pour usage futur
-                firestore_service.save_translation(text, target_language, translation)
-
-        # Étape 3: Fallback vers la base de données en dernier recours
-        if not translation:
-            print(f"DEBUG: Tentative de recherche dans la base de données...")
-            translation = firestore_service.get_translation(text, target_language)
-            
-            if translation:
-                source = 'database'
-                print(f"DEBUG: Traduction trouvée dans la base de données: '{translation}'")
-        
+        # Étape 0: Cache en mémoire (clé incluant la version du modèle TensorFlow et le beam)
+        beam_width = tensorflow_service.resolve_beam_width(beam_width, target_language)
+        model_version = f"{tensorflow_service.get_model_version(target_language)}:beam{beam_width}"
+        cached = translation_cache.get(text, target_language, model_version)
+        if cached:
+            translation, source, confidence = cached
+            processing_time = round((time.time() - start_time) * 1000, 2)
+            print(f"DEBUG: Traduction servie depuis le cache (source: {source})")
+
+            return jsonify({
+                'success': True,
+                'translation': translation,
+                'text': text,
+                'targetLanguage': target_language,
+                'source': source,
+                'cached': True,
+                'processingTime': f"{processing_time}ms"
+            })
+
+        # Étape 0 bis: échec récent pour ce texte (texte introuvable ou intraduisible),
+        # refusé sans repasser par les tiers jusqu'à expiration ou ajout d'une traduction
+        negative_reason = negative_cache.get(text, target_language)
+        if negative_reason:
+            print(f"DEBUG: Échec récent servi depuis le cache négatif ({negative_reason})")
+            if negative_reason == NEGATIVE_IMPOSSIBLE:
+                return jsonify({
+                    'success': False,
+                    'error': 'Ce texte ne peut pas être traduit dans cette langue',
+                    'text': text,
+                    'targetLanguage': target_language,
+                    'cached': True
+                }), 422
+            return jsonify({
+                'success': False,
+                'error': 'Traduction non disponible pour ce texte',
+                'text': text,
+                'targetLanguage': target_language,
+                'cached': True
+            }), 404
+
+        # Une seule exécution du pipeline par (texte, langue) à la fois:
+        # les requêtes identiques concurrentes attendent son résultat
+        def translate_and_cache():
+            result = _run_translation_pipeline(text, target_language, beam_width, deadline)
+            if result[0] and result[0] != "TRADUCTION_IMPOSSIBLE" and not result[3].get('partial'):
+                # Mémoriser la traduction réussie pour les requêtes suivantes
+                translation_cache.put(text, target_language, result[0], result[1], result[2], model_version)
+            elif result[0] == "TRADUCTION_IMPOSSIBLE":
+                negative_cache.put(text, target_language, NEGATIVE_IMPOSSIBLE)
+            elif not result[0] and _is_definitive_miss(result[3]):
+                negative_cache.put(text, target_language, NEGATIVE_NOT_FOUND)
+            return result
+
+        flight_key = translation_cache.make_key(text, target_language, model_version)
+        (translation, source, confidence, routing), coalesced = translation_flight.do(flight_key, translate_and_cache)
+        if coalesced:
+            print(f"DEBUG: Requête identique en cours, résultat partagé (source: {source})")
+
         # --- DEBUGGING PRINTS END HERE ---
 
+        # Échéance dépassée sans aucun résultat: échouer vite plutôt que bloquer le worker
+        if not translation and routing.get('deadlineExceeded'):
+            return jsonify({
+                'success': False,
+                'error': 'Délai de traduction dépassé',
+                'text': text,
+                'targetLanguage': target_language
+            }), 504
+
         # Si toujours pas de traduction
         if not translation:
             return jsonify({
@@ -126,14 +348,24 @@ def translate():
         processing_time = round((time.time() - start_time) * 1000, 2)
 
         # Réponse de succès
-        return jsonify({
+        response = {
             'success': True,
             'translation': translation,
             'text': text,
             'targetLanguage': target_language,
             'source': source,
+            'cached': False,
+            'coalesced': coalesced,
             'processingTime': f"{processing_time}ms"
-        })
+        }
+        if routing.get('partial'):
+            # Meilleur résultat disponible à l'échéance (confiance sous le seuil)
+            response['partial'] = True
+        if data.get('debug'):
+            # Décisions du routeur (ordre des tiers, tiers sautés, latence de chaque tentative)
+            response['debug'] = {'routing': routing}
+
+        return jsonify(response)
 
     except Exception as e:
         print(f"❌ Erreur lors de la traduction dans la route translate: {e}")
@@ -143,11 +375,49 @@ def translate():
             'details': str(e)
         }), 500
 
+
+def _translate_misses_with_gemini(misses, target_language, deadline: Deadline):
+    """
+    Traduit via Gemini les textes absents de la base avec des prompts groupés
+    (quelques appels pour tout le batch au lieu d'un appel par texte).
+
+    Les textes sans réponse à l'échéance de la requête sont signalés expirés.
+
+    Args:
+        misses: Dictionnaire {clé normalisée: texte}
+        target_language: Langue cible
+        deadline: Échéance de la requête batch
+
+    Returns:
+        Tuple de ({clé: (traduction, source)}, ensemble des clés expirées)
+    """
+    keys = list(misses.keys())
+    translations = gemini_service.translate_many([misses[key] for key in keys], target_language, deadline=deadline)
+
+    results = {}
+    for key, translation in zip(keys, translations):
+        if translation is None:
+            continue
+        results[key] = (translation, 'gemini')
+        # Sauvegarder la traduction
+        if translation != "TRADUCTION_IMPOSSIBLE":
+            firestore_service.save_translation(misses[key], target_language, translation)
+
+    timed_out = set(key for key in keys if key not in results) if deadline.expired() else set()
+    if timed_out:
+        print(f"WARN: {len(timed_out)} texte(s) non traduits avant l'échéance du batch")
+
+    return results, timed_out
+
+
 @translate_bp.route('/translate/batch', methods=['POST'])
 def translate_batch():
     """
     Endpoint pour traduire plusieurs textes en une seule requête.
     """
+    # Échéance de la requête, passée à chaque tier
+    deadline = Deadline(BATCH_DEADLINE_SECONDS)
+
     try:
         data = request.get_json()
 
@@ -180,8 +450,16 @@ def translate_batch():
                 'error': f'Langue non supportée. Langues disponibles: {", ".join(supported_languages)}'
             }), 400
 
-        # Traduction de chaque texte
-        translations = []
+        beam_width = _parse_beam_width(data)
+        if beam_width is None:
+            return jsonify({
+                'success': False,
+                'error': 'beamWidth doit être un entier positif'
+            }), 400
+
+        # Dédoublonner les textes (l'ordre d'origine est conservé pour la réponse)
+        items = []
+        unique_texts = {}
         for text_item in texts: # Renommé 'text' en 'text_item' pour éviter le conflit de nom
             if not text_item or not isinstance(text_item, str):
                 continue
@@ -190,32 +468,122 @@ def translate_batch():
             if not text_item:
                 continue
 
-            # Recherche dans la base de données
-            translation = firestore_service.get_translation(text_item, target_language)
-            source = 'database'
+            key = normalize_text(text_item)
+            unique_texts.setdefault(key, text_item)
+            items.append((text_item, key))
+
+        results = {}
+        confidences = {}
+        partials = {}
+
+        # Étape 1: Recherche groupée des correspondances exactes dans la base de données
+        db_start = time.monotonic()
+        db_hits = firestore_service.get_translations(list(unique_texts.values()), target_language, deadline=deadline)
+        db_latency = time.monotonic() - db_start
+        results.update({
+            key: (db_hits[text], 'database')
+            for key, text in unique_texts.items() if text in db_hits
+        })
+        for text in unique_texts.values():
+            translation_router.record(target_language, TIER_DATABASE, db_latency, text in db_hits, text in db_hits)
+
+        # Les tiers modèles suivent l'ordre et les sauts décidés par le routeur pour la langue
+        order, skipped, decision = translation_router.plan(target_language, _available_model_tiers())
+        timed_out = set()
+        use_gemini = TIER_GEMINI in order
 
-            # Fallback vers Gemini
-            if not translation and gemini_service.is_service_available():
-                translation = gemini_service.translate_text(text_item, target_language)
-                source = 'gemini'
+        for tier in order:
+            misses = {key: text for key, text in unique_texts.items() if key not in results}
+            if not misses:
+                break
 
-                # Sauvegarder la traduction
-                if translation and translation != "TRADUCTION_IMPOSSIBLE":
-                    firestore_service.save_translation(text_item, target_language, translation)
+            if deadline.expired():
+                timed_out.update(misses.keys())
+                break
 
-            translations.append({
+            if tier == TIER_TENSORFLOW:
+                # TensorFlow: une seule inférence batchée pour tous les textes manquants
+                from ml.config import CONFIDENCE_THRESHOLD
+                tf_start = time.monotonic()
+                tf_results = tensorflow_service.translate_batch(
+                    list(misses.values()), target_language, beam_width=beam_width, deadline=deadline
+                )
+                tf_latency = time.monotonic() - tf_start
+                for key, tf_result in zip(misses.keys(), tf_results):
+                    hit = bool(tf_result and tf_result[0])
+                    translation_router.record(
+                        target_language, TIER_TENSORFLOW, tf_latency, hit, hit and tf_result[1] >= CONFIDENCE_THRESHOLD
+                    )
+                    if tf_result and tf_result[0] and tf_result[1] >= CONFIDENCE_THRESHOLD:
+                        results[key] = (tf_result[0], 'tensorflow')
+                        confidences[key] = tf_result[1]
+                    elif tf_result and tf_result[0]:
+                        # Sous le seuil: résultat partiel si l'échéance empêche les tiers suivants
+                        partials[key] = tf_result
+            else:
+                # Gemini: prompts groupés pour les textes manquants
+                gemini_start = time.monotonic()
+                gemini_results, gemini_timed_out = _translate_misses_with_gemini(misses, target_language, deadline)
+                gemini_latency = time.monotonic() - gemini_start
+                for key in misses:
+                    translation = (gemini_results.get(key) or (None,))[0]
+                    translation_router.record(
+                        target_language, TIER_GEMINI, gemini_latency, translation is not None,
+                        translation is not None and translation != "TRADUCTION_IMPOSSIBLE"
+                    )
+                results.update(gemini_results)
+                # Garder les textes déjà expirés au tier TensorFlow
+                timed_out |= gemini_timed_out
+
+        # Échéance dépassée: la meilleure traduction disponible plutôt que rien
+        if deadline.expired():
+            timed_out.update(key for key in unique_texts if not (results.get(key) or (None,))[0])
+        for key in timed_out:
+            if key in partials and not (results.get(key) or (None,))[0]:
+                results[key] = (partials[key][0], 'tensorflow')
+                confidences[key] = partials[key][1]
+
+        translations = []
+        for text_item, key in items:
+            translation, source = results.get(key, (None, 'gemini' if use_gemini else 'database'))
+            entry = {
                 'text': text_item,
                 'translation': translation,
                 'source': source,
                 'success': translation is not None and translation != "TRADUCTION_IMPOSSIBLE"
-            })
+            }
+            if key in confidences:
+                entry['confidence'] = confidences[key]
+            if key in timed_out:
+                if key in partials and source == 'tensorflow':
+                    entry['partial'] = True
+                else:
+                    entry['error'] = 'Délai dépassé'
+            translations.append(entry)
 
-        return jsonify({
+        # Échéance dépassée sans aucune traduction: échouer vite
+        if timed_out and not any(entry['success'] for entry in translations):
+            return jsonify({
+                'success': False,
+                'error': 'Délai de traduction dépassé',
+                'targetLanguage': target_language,
+                'timedOut': len(timed_out)
+            }), 504
+
+        response = {
             'success': True,
             'translations': translations,
             'targetLanguage': target_language,
-            'totalProcessed': len(translations)
-        })
+            'totalProcessed': len(translations),
+            'uniqueTexts': len(unique_texts),
+            'timedOut': len(timed_out)
+        }
+        if data.get('debug'):
+            response['debug'] = {
+                'routing': {'order': [TIER_DATABASE] + order, 'skipped': skipped, 'decision': decision}
+            }
+
+        return jsonify(response)
 
     except Exception as e:
         print(f"❌ Erreur lors de la traduction batch: {e}")
@@ -226,6 +594,239 @@ def translate_batch():
         }), 500
 
 
+def _translate_languages_with_tensorflow(text, target_languages, beam_width, deadline: Deadline):
+    """
+    Lance les décodages TensorFlow des langues demandées en parallèle.
+
+    Returns:
+        Tuple de ({langue: (traduction, confiance)} acceptées, {langue: (traduction, confiance)}
+        sous le seuil de confiance, gardées comme résultats partiels)
+    """
+    from ml.config import CONFIDENCE_THRESHOLD
+
+    def translate_one(language):
+        start = time.monotonic()
+        tf_result = tensorflow_service.translate_text(text, language, beam_width=beam_width, deadline=deadline)
+        accepted = bool(tf_result) and tf_result[1] >= CONFIDENCE_THRESHOLD
+        translation_router.record(language, TIER_TENSORFLOW, time.monotonic() - start, bool(tf_result), accepted)
+        return tf_result
+
+    futures = {multi_executor.submit(translate_one, language): language for language in target_languages}
+    done, not_done = wait(list(futures), timeout=deadline.remaining())
+    for future in not_done:
+        future.cancel()
+
+    accepted, partials = {}, {}
+    for future in done:
+        language = futures[future]
+        try:
+            tf_result = future.result()
+        except Exception as e:
+            print(f"❌ Erreur TensorFlow multi-langues pour {language}: {e}")
+            continue
+        if tf_result and tf_result[0]:
+            if tf_result[1] >= CONFIDENCE_THRESHOLD:
+                accepted[language] = tf_result
+            else:
+                partials[language] = tf_result
+
+    return accepted, partials
+
+
+@translate_bp.route('/translate/multi', methods=['POST'])
+def translate_multi():
+    """
+    Endpoint pour traduire un texte français vers plusieurs langues en un seul appel.
+    Base de données d'abord (une lecture), décodages TensorFlow concurrents,
+    puis un seul prompt Gemini pour toutes les langues restantes.
+    """
+    start_time = time.time()
+    # Échéance de la requête, passée à chaque tier
+    deadline = Deadline(TRANSLATE_DEADLINE_SECONDS)
+
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'Aucune donnée fournie'
+            }), 400
+
+        text = data.get('text', '').strip()
+        target_languages = data.get('targetLanguages', [])
+
+        if not text:
+            return jsonify({
+                'success': False,
+                'error': 'Texte à traduire manquant'
+            }), 400
+
+        if not target_languages or not isinstance(target_languages, list):
+            return jsonify({
+                'success': False,
+                'error': 'Liste de langues cibles manquante ou invalide'
+            }), 400
+
+        # Normaliser et dédoublonner (l'ordre demandé est conservé pour la réponse)
+        languages = []
+        for language in target_languages:
+            if isinstance(language, str) and language.strip().lower() not in languages:
+                languages.append(language.strip().lower())
+
+        # Validation des langues cibles
+        supported_languages = [lang['code'] for lang in firestore_service.get_supported_languages()]
+        unsupported = [language for language in languages if language not in supported_languages]
+        if not languages or unsupported:
+            return jsonify({
+                'success': False,
+                'error': f'Langue non supportée. Langues disponibles: {", ".join(supported_languages)}'
+            }), 400
+
+        beam_width = _parse_beam_width(data)
+        if beam_width is None:
+            return jsonify({
+                'success': False,
+                'error': 'beamWidth doit être un entier positif'
+            }), 400
+
+        results = {}  # {langue: (traduction, source, confiance)}
+        cached = set()
+        partial = set()
+        negatives = {}  # {langue: raison} des échecs récents servis par le cache négatif
+        gemini_errors = set()  # Langues sans réponse de Gemini (échec transitoire)
+        model_versions = {
+            language: f"{tensorflow_service.get_model_version(language)}:beam{tensorflow_service.resolve_beam_width(beam_width, language)}"
+            for language in languages
+        }
+
+        # Étape 0: Cache en mémoire, par langue
+        for language in languages:
+            hit = translation_cache.get(text, language, model_versions[language])
+            if hit:
+                results[language] = hit
+                cached.add(language)
+                continue
+
+            # Échec récent (texte introuvable ou intraduisible): pas de nouvel essai des tiers
+            negative_reason = negative_cache.get(text, language)
+            if negative_reason:
+                negatives[language] = negative_reason
+                cached.add(language)
+
+        # Étape 1: correspondances exactes en base, une seule lecture pour toutes les langues
+        remaining = [language for language in languages if language not in results and language not in negatives]
+        if remaining:
+            db_start = time.monotonic()
+            db_hits = firestore_service.get_translation_languages(text, remaining, deadline=deadline)
+            db_latency = time.monotonic() - db_start
+            for language in remaining:
+                translation_router.record(language, TIER_DATABASE, db_latency, language in db_hits, language in db_hits)
+                if language in db_hits:
+                    results[language] = (db_hits[language], TIER_DATABASE, 0.0)
+
+        # Étape 2: TensorFlow en parallèle pour les langues où le routeur le garde
+        plans = {
+            language: translation_router.plan(language, _available_model_tiers())
+            for language in remaining if language not in results
+        }
+        tf_languages = [language for language, (order, _, _) in plans.items() if TIER_TENSORFLOW in order]
+        partials = {}
+        if tf_languages and not deadline.expired():
+            accepted, partials = _translate_languages_with_tensorflow(text, tf_languages, beam_width, deadline)
+            for language, (translation, confidence) in accepted.items():
+                results[language] = (translation, TIER_TENSORFLOW, confidence)
+
+        # Étape 3: un seul prompt Gemini pour toutes les langues restantes
+        gemini_languages = [
+            language for language, (order, _, _) in plans.items()
+            if TIER_GEMINI in order and language not in results
+        ]
+        if gemini_languages and not deadline.expired():
+            gemini_start = time.monotonic()
+            gemini_results = gemini_service.translate_languages(text, gemini_languages, deadline=deadline)
+            gemini_latency = time.monotonic() - gemini_start
+            for language, translation in gemini_results.items():
+                accepted = translation is not None and translation != "TRADUCTION_IMPOSSIBLE"
+                translation_router.record(language, TIER_GEMINI, gemini_latency, translation is not None, accepted)
+                if translation is None:
+                    gemini_errors.add(language)
+                    continue
+                results[language] = (translation, TIER_GEMINI, 0.0)
+                if accepted:
+                    firestore_service.save_translation(text, language, translation)
+
+        # Échéance dépassée: traductions TensorFlow sous le seuil plutôt que rien
+        if deadline.expired():
+            for language, (translation, confidence) in partials.items():
+                if language not in results:
+                    results[language] = (translation, TIER_TENSORFLOW, confidence)
+                    partial.add(language)
+
+        translations = []
+        for language in languages:
+            translation, source, confidence = results.get(language, (None, None, 0.0))
+            if negatives.get(language) == NEGATIVE_IMPOSSIBLE:
+                translation = "TRADUCTION_IMPOSSIBLE"
+            success = translation is not None and translation != "TRADUCTION_IMPOSSIBLE"
+            entry = {
+                'targetLanguage': language,
+                'translation': translation if success else None,
+                'source': source,
+                'confidence': confidence,
+                'success': success,
+                'cached': language in cached
+            }
+            if language in partial:
+                entry['partial'] = True
+            elif translation == "TRADUCTION_IMPOSSIBLE":
+                entry['error'] = 'Ce texte ne peut pas être traduit dans cette langue'
+            elif not success:
+                entry['error'] = 'Délai dépassé' if deadline.expired() else 'Traduction non disponible'
+            translations.append(entry)
+
+            # Mémoriser les traductions réussies pour les requêtes suivantes (unitaires ou multi)
+            if success and language not in cached and language not in partial:
+                translation_cache.put(text, language, translation, source, confidence, model_versions[language])
+            elif language not in cached:
+                # Mémoriser les échecs définitifs, comme /translate
+                if translation == "TRADUCTION_IMPOSSIBLE":
+                    negative_cache.put(text, language, NEGATIVE_IMPOSSIBLE)
+                elif not success and language not in gemini_errors and not deadline.expired() \
+                        and not gemini_service.breaker.is_open():
+                    negative_cache.put(text, language, NEGATIVE_NOT_FOUND)
+
+        processing_time = round((time.time() - start_time) * 1000, 2)
+
+        response = {
+            'success': any(entry['success'] for entry in translations),
+            'text': text,
+            'translations': translations,
+            'processingTime': f"{processing_time}ms"
+        }
+        if data.get('debug'):
+            response['debug'] = {
+                'routing': {
+                    language: {'order': [TIER_DATABASE] + order, 'skipped': skipped, 'decision': decision}
+                    for language, (order, skipped, decision) in plans.items()
+                }
+            }
+
+        # Échéance dépassée sans aucune traduction: échouer vite
+        if not response['success'] and deadline.expired():
+            return jsonify(response), 504
+
+        return jsonify(response)
+
+    except Exception as e:
+        print(f"❌ Erreur lors de la traduction multi-langues: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Erreur interne du serveur',
+            'details': str(e)
+        }), 500
+
+
 # NOUVEL ENDPOINT POUR L'AJOUT/MODIFICATION MANUELLE DE TRADUCTIONS
 @translate_bp.route('/translations/manage', methods=['POST'])
 def manage_translation():
@@ -260,6 +861,9 @@ def manage_translation():
         # Appel du service Firestore pour la mise à jour
         success = firestore_service.update_translation_manual(french_text, target_language, new_translation)
 
+        # Ne plus servir l'ancienne traduction depuis le cache
+        translation_cache.invalidate(french_text, target_language)
+
         if success:
             return jsonify({
                 'success': True,
@@ -281,3 +885,21 @@ def manage_translation():
             'error': 'Erreur interne du serveur lors de la gestion manuelle de la traduction',
             'details': str(e)
         }), 500
+
+
+@translate_bp.route('/translate/metrics', methods=['GET'])
+def translation_metrics():
+    """
+    Endpoint exposant les compteurs internes du pipeline de traduction.
+    """
+    return jsonify({
+        'success': True,
+        'cache': translation_cache.get_stats(),
+        'negative_cache': negative_cache.get_stats(),
+        'singleflight': translation_flight.get_stats(),
+        'tensorflow': tensorflow_service.get_batching_stats(),
+        'oov_gate': tensorflow_service.get_oov_gate_stats(),
+        'router': translation_router.get_stats(),
+        'gemini': gemini_service.get_stats(),
+        'models': tensorflow_service.get_residency_stats()
+    })
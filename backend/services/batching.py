@@ -0,0 +1,119 @@
+"""
+Ordonnanceur de micro-batchs pour l'inférence TensorFlow
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from services.deadline import Deadline
+from services.metrics import Histogram
+
+
+class MicroBatchScheduler:
+    """
+    Regroupe les requêtes concurrentes en batchs d'inférence.
+
+    Un thread de fond attend la première requête, puis collecte les
+    suivantes pendant au plus `max_wait_ms` ou jusqu'à `max_batch_size`
+    éléments, exécute `run_batch` une seule fois et rend à chaque appelant
+    son résultat via un Future. Un élément dont l'échéance est dépassée
+    avant l'assemblage du batch est écarté (résultat None) sans être décodé.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0, name: str = 'micro-batch'):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+        # Métriques
+        self.queue_depths = Histogram([0, 1, 2, 4, 8, 16, 32, 64, 128])
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.batches = 0
+        self.errors = 0
+        self.expired = 0
+
+    def submit(self, item: Any, deadline: Optional[Deadline] = None) -> Future:
+        """
+        Ajoute un élément à la file et retourne le Future de son résultat
+
+        Args:
+            item: Élément à passer à `run_batch`
+            deadline: Échéance de la requête (None = pas d'échéance)
+        """
+        future = Future()
+        self.queue_depths.observe(self._queue.qsize())
+        self._queue.put((item, future, deadline))
+        return future
+
+    def _keep(self, entry: tuple) -> bool:
+        """Écarte un élément dont l'échéance est dépassée (son Future reçoit None)"""
+        _, future, deadline = entry
+        if deadline is not None and deadline.expired():
+            self.expired += 1
+            future.set_result(None)
+            return False
+        return True
+
+    def _collect_batch(self) -> List[tuple]:
+        """Bloque jusqu'à la première requête encore dans les temps puis complète le batch"""
+        entry = self._queue.get()
+        while not self._keep(entry):
+            entry = self._queue.get()
+        batch = [entry]
+        window_end = time.monotonic() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = window_end - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # Fenêtre écoulée: ne prendre que ce qui est déjà en file
+                    entry = self._queue.get_nowait()
+                else:
+                    entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if self._keep(entry):
+                batch.append(entry)
+
+        return batch
+
+    def _worker(self):
+        """Boucle du thread de fond"""
+        while True:
+            batch = self._collect_batch()
+            items = [item for item, _, _ in batch]
+            self.batch_sizes.observe(len(batch))
+            self.batches += 1
+
+            try:
+                results = self.run_batch(items)
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Erreur du micro-batch {self.name}: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        """Retourne les métriques de l'ordonnanceur"""
+        return {
+            'pending': self._queue.qsize(),
+            'batches': self.batches,
+            'errors': self.errors,
+            'expired': self.expired,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_seconds * 1000.0,
+            'queue_depth': self.queue_depths.get_stats(),
+            'batch_size': self.batch_sizes.get_stats()
+        }
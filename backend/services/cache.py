@@ -0,0 +1,292 @@
+"""
+Caches en mémoire des résultats de traduction (LRU + TTL, bornés en taille)
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+
+# Surcharge d'une entrée (tuple, clés, horodatage...) en plus du texte lui-même
+_ENTRY_OVERHEAD_BYTES = 200
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Raisons d'une entrée du cache négatif (réponse 404 ou 422 de /translate)
+NEGATIVE_NOT_FOUND = 'not_found'
+NEGATIVE_IMPOSSIBLE = 'impossible'
+
+
+def normalize_text(text: str) -> str:
+    """Normalise un texte pour servir de clé de cache (casse et espaces)"""
+    return _WHITESPACE_RE.sub(' ', text.strip().lower())
+
+
+class TranslationCache:
+    """
+    Cache LRU avec expiration (TTL) et budget mémoire approximatif.
+
+    Les clés sont (texte normalisé, langue cible, version du modèle) et
+    chaque entrée mémorise le tier qui a produit la traduction
+    (tensorflow, gemini, database).
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 16 * 1024 * 1024,
+                 ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[str, str, float, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.hits_by_source: Dict[str, int] = {}
+
+    @staticmethod
+    def make_key(text: str, target_language: str, model_version: str = '') -> Tuple[str, str, str]:
+        """Construit la clé de cache"""
+        return normalize_text(text), target_language, model_version or ''
+
+    @staticmethod
+    def _estimate_size(key: Tuple[str, str, str], translation: str, source: str) -> int:
+        """Estime la taille mémoire d'une entrée en octets"""
+        size = _ENTRY_OVERHEAD_BYTES
+        for part in key:
+            size += len(part.encode('utf-8'))
+        size += len(translation.encode('utf-8')) + len(source)
+        return size
+
+    def get(self, text: str, target_language: str, model_version: str = '') -> Optional[Tuple[str, str, float]]:
+        """
+        Récupère une traduction du cache
+
+        Returns:
+            Tuple de (traduction, source, confiance) ou None si absente/expirée
+        """
+        key = self.make_key(text, target_language, model_version)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            translation, source, confidence, expires_at, size = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._current_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            # Marquer comme récemment utilisée
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.hits_by_source[source] = self.hits_by_source.get(source, 0) + 1
+
+            return translation, source, confidence
+
+    def put(self, text: str, target_language: str, translation: str, source: str,
+            confidence: float = 1.0, model_version: str = ''):
+        """Ajoute ou remplace une traduction dans le cache"""
+        key = self.make_key(text, target_language, model_version)
+        size = self._estimate_size(key, translation, source)
+
+        # Une entrée plus grosse que le budget total n'est jamais mise en cache
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[4]
+
+            self._entries[key] = (translation, source, confidence, expires_at, size)
+            self._current_bytes += size
+
+            # Éviction LRU jusqu'à respecter les deux limites
+            while len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._current_bytes -= evicted[4]
+                self.evictions += 1
+
+    def invalidate(self, text: str, target_language: str):
+        """Supprime toutes les versions d'une traduction (ex: correction manuelle)"""
+        normalized = normalize_text(text)
+
+        with self._lock:
+            stale_keys = [
+                key for key in self._entries
+                if key[0] == normalized and key[1] == target_language
+            ]
+            for key in stale_keys:
+                self._current_bytes -= self._entries.pop(key)[4]
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def get_stats(self) -> Dict:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hits_by_source': dict(self.hits_by_source)
+            }
+
+
+class NegativeCache:
+    """
+    Cache LRU des échecs de traduction, à courte expiration (TTL).
+
+    Les clés sont (texte normalisé, langue cible) et chaque entrée mémorise
+    la raison de l'échec (NEGATIVE_NOT_FOUND: aucun tier n'a traduit,
+    NEGATIVE_IMPOSSIBLE: texte intraduisible). Une requête répétée est
+    refusée sans repasser par les tiers ; l'entrée est invalidée dès qu'une
+    traduction est enregistrée pour cette clé.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.hits_by_reason: Dict[str, int] = {}
+
+    @staticmethod
+    def make_key(text: str, target_language: str) -> Tuple[str, str]:
+        """Construit la clé du cache négatif"""
+        return normalize_text(text), target_language
+
+    def get(self, text: str, target_language: str) -> Optional[str]:
+        """
+        Vérifie si un échec récent est enregistré pour ce texte et cette langue
+
+        Returns:
+            Raison de l'échec ou None si absente/expirée
+        """
+        key = self.make_key(text, target_language)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            reason, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.hits_by_reason[reason] = self.hits_by_reason.get(reason, 0) + 1
+
+            return reason
+
+    def put(self, text: str, target_language: str, reason: str):
+        """Enregistre un échec de traduction"""
+        key = self.make_key(text, target_language)
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (reason, expires_at)
+
+            # Éviction LRU
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, text: str, target_language: str):
+        """Supprime l'échec enregistré (une traduction vient d'être ajoutée)"""
+        with self._lock:
+            if self._entries.pop(self.make_key(text, target_language), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Retourne les compteurs du cache négatif"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hits_by_reason': dict(self.hits_by_reason)
+            }
+
+
+# Instances globales des caches
+_translation_cache = None
+_negative_cache = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """Retourne l'instance du cache de traduction (singleton)"""
+    global _translation_cache
+
+    if _translation_cache is None:
+        _translation_cache = TranslationCache(
+            max_entries=int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', '10000')),
+            max_bytes=int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', str(16 * 1024 * 1024))),
+            ttl_seconds=float(os.getenv('TRANSLATION_CACHE_TTL_SECONDS', '3600'))
+        )
+
+    return _translation_cache
+
+
+def get_negative_cache() -> NegativeCache:
+    """Retourne l'instance du cache négatif (singleton)"""
+    global _negative_cache
+
+    if _negative_cache is None:
+        _negative_cache = NegativeCache(
+            max_entries=int(os.getenv('TRANSLATION_NEGATIVE_CACHE_MAX_ENTRIES', '10000')),
+            ttl_seconds=float(os.getenv('TRANSLATION_NEGATIVE_CACHE_TTL_SECONDS', '300'))
+        )
+
+    return _negative_cache
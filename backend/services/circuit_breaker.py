@@ -0,0 +1,144 @@
+"""
+Disjoncteur (circuit breaker) et backoff exponentiel pour les appels à un service amont
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+# États du disjoncteur
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """Délai avant la nouvelle tentative `attempt` (0, 1, ...): backoff exponentiel à gigue complète"""
+    return random.uniform(0.0, min(max_seconds, base_seconds * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états, thread-safe.
+
+    - fermé: les appels passent ; le résultat des `window_size` derniers
+      appels est gardé, et le disjoncteur s'ouvre quand le taux d'échec
+      atteint `failure_rate_threshold` (au moins `min_calls` appels).
+    - ouvert: les appels sont refusés immédiatement pendant `open_seconds`.
+    - semi-ouvert: un seul appel d'essai passe ; son succès referme le
+      disjoncteur, son échec le rouvre.
+    """
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, min_calls: int = 5,
+                 window_size: int = 20, open_seconds: float = 30.0):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.window_size = window_size
+        self.open_seconds = open_seconds
+
+        self.state = STATE_CLOSED
+        self._outcomes: "deque[bool]" = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.rejected = 0
+        self.opens = 0
+
+    def _transition(self, state: str):
+        """Change d'état (verrou tenu)"""
+        if state == self.state:
+            return
+        print(f"⚡ Disjoncteur {self.name}: {self.state} → {state}")
+        self.state = state
+        if state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+            self.opens += 1
+        elif state == STATE_CLOSED:
+            self._outcomes.clear()
+
+    def is_open(self) -> bool:
+        """Vérifie sans effet de bord si les appels sont refusés (ouvert, délai non écoulé)"""
+        with self._lock:
+            return self.state == STATE_OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    def allow_request(self) -> bool:
+        """
+        Indique si un appel peut être tenté maintenant
+
+        En semi-ouvert, réserve l'unique appel d'essai: l'appelant doit
+        ensuite appeler record_success ou record_failure.
+        """
+        with self._lock:
+            if self.state == STATE_OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self._transition(STATE_HALF_OPEN)
+
+            if self.state == STATE_HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    return False
+                self._trial_in_flight = True
+
+            return True
+
+    def record_success(self):
+        """Enregistre un appel réussi"""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._trial_in_flight = False
+                self._transition(STATE_CLOSED)
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        """Enregistre un appel en échec (erreur amont ou délai dépassé)"""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._trial_in_flight = False
+                self._transition(STATE_OPEN)
+                return
+
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+                self._transition(STATE_OPEN)
+
+    def release(self):
+        """
+        Libère l'appel d'essai sans enregistrer de résultat
+
+        Pour un appel interrompu sans que le service amont soit en cause
+        (erreur locale, délai raccourci par l'échéance de la requête).
+        """
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._trial_in_flight = False
+
+    def _failure_rate(self) -> float:
+        """Taux d'échec de la fenêtre (verrou tenu)"""
+        if not self._outcomes:
+            return 0.0
+        return sum(not success for success in self._outcomes) / len(self._outcomes)
+
+    def get_stats(self) -> Dict:
+        """Retourne l'état du disjoncteur et ses compteurs"""
+        with self._lock:
+            retry_in = 0.0
+            if self.state == STATE_OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+            return {
+                'state': self.state,
+                'failure_rate': self._failure_rate(),
+                'window_calls': len(self._outcomes),
+                'failure_rate_threshold': self.failure_rate_threshold,
+                'min_calls': self.min_calls,
+                'open_seconds': self.open_seconds,
+                'retry_in_seconds': retry_in,
+                'opens': self.opens,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,42 @@
+"""
+Échéance d'une requête, partagée par tous les tiers de traduction
+"""
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Budget de temps d'une requête, créé par la route et passé à chaque tier.
+
+    Chaque tier consulte le temps restant avant un appel bloquant (décodage
+    TensorFlow, appel Gemini, lecture Firestore) et s'arrête quand le budget
+    est épuisé, pour que la latence d'une requête reste bornée.
+    """
+
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+
+    def remaining(self) -> float:
+        """Temps restant en secondes (0 si l'échéance est dépassée)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Vérifie si l'échéance est dépassée"""
+        return time.monotonic() >= self.expires_at
+
+    def elapsed(self) -> float:
+        """Temps écoulé depuis la création en secondes"""
+        return time.monotonic() - self.started_at
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Délai à passer à un appel bloquant: le temps restant, borné par `cap`"""
+        remaining = self.remaining()
+        return min(remaining, cap) if cap is not None else remaining
+
+
+def remaining_timeout(deadline: Optional[Deadline], cap: Optional[float] = None) -> Optional[float]:
+    """Délai d'un appel bloquant, ou `cap` (None = sans limite) en l'absence d'échéance"""
+    return deadline.timeout(cap) if deadline is not None else cap
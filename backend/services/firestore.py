@@ -1,11 +1,18 @@
 import os
 import tempfile
+import threading
 from google.cloud import firestore
 import json
 
+from services.deadline import remaining_timeout
+from services.cache import get_negative_cache
+
 class FirestoreService:
 
     def __init__(self):
+        # Verrou protégeant les données locales (écritures concurrentes des threads gunicorn/batch)
+        self._local_lock = threading.RLock()
+
         # Initialisation du client Firestore
         creds_json = os.getenv('GOOGLE_APPLICATION_CREDENTIALS_JSON')
         self.load_local_translations()
@@ -149,25 +156,106 @@ class FirestoreService:
             script_dir = os.path.dirname(__file__)
             json_path = os.path.join(script_dir, '..', 'data', 'language.json') # Chemin vers language.json
             os.makedirs(os.path.dirname(json_path), exist_ok=True) # Crée le dossier 'data' si inexistant
-            with open(json_path, 'w', encoding='utf-8') as f:
+            with self._local_lock, open(json_path, 'w', encoding='utf-8') as f:
                 json.dump(self.local_translations, f, ensure_ascii=False, indent=2)
             print(f"INFO: Traductions locales sauvegardées dans {json_path}.")
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde des traductions locales dans le fichier: {e}")
 
-    def get_translation(self, text, target_language):
-        """Récupère une traduction depuis Firestore ou les données locales"""
+    def get_translation(self, text, target_language, deadline=None):
+        """
+        Récupère une traduction depuis Firestore ou les données locales.
+        La lecture Firestore est bornée par l'échéance de la requête (deadline).
+        """
         text_lower = text.lower()
-        if self.use_local_data:
+        if self.use_local_data or (deadline is not None and deadline.expired()):
             return self._get_local_translation(text_lower, target_language)
         else:
-            result = self._get_firestore_translation(text_lower, target_language)
+            result = self._get_firestore_translation(text_lower, target_language, deadline)
             if result is None :
                 print(f"DEBUG: Pas trouvé dans Firestore, fallback vers données locales pour '{text_lower}'")
                 return self._get_local_translation(text_lower, target_language)
             return result
                 
 
+    def get_translation_languages(self, text, target_languages, deadline=None):
+        """
+        Récupère en une lecture les traductions d'un texte dans plusieurs langues
+        (un document Firestore contient toutes les langues d'un texte).
+        Retourne un dictionnaire {langue: traduction} limité aux langues trouvées.
+        """
+        text_lower = text.lower()
+        results = {}
+
+        if not self.use_local_data and not (deadline is not None and deadline.expired()):
+            try:
+                doc = self.db.collection('translations').document(text_lower).get(timeout=remaining_timeout(deadline))
+                if doc.exists:
+                    data = doc.to_dict()
+                    results = {language: data[language] for language in target_languages if data.get(language)}
+            except Exception as e:
+                print(f"❌ Erreur lors de la récupération Firestore multi-langues: {e}")
+
+        # Données locales (mode local, ou fallback pour les langues absentes de Firestore)
+        for language in target_languages:
+            if language not in results:
+                translation = self._get_local_translation(text_lower, language)
+                if translation:
+                    results[language] = translation
+
+        return results
+
+    def get_translations(self, texts, target_language, deadline=None):
+        """
+        Récupère en une passe les traductions de plusieurs textes.
+        Retourne un dictionnaire {texte: traduction} limité aux textes trouvés.
+        La lecture Firestore est bornée par l'échéance de la requête (deadline).
+        """
+        results = {}
+        if not texts:
+            return results
+
+        remaining = list(texts)
+        if not self.use_local_data and not (deadline is not None and deadline.expired()):
+            try:
+                # Un seul aller-retour Firestore pour tous les documents ; un texte qui
+                # n'est pas un identifiant de document valide est laissé au fallback local
+                # au lieu de faire échouer toute la lecture groupée
+                valid_ids = {text.lower() for text in remaining if self._is_valid_document_id(text.lower())}
+                refs = [self.db.collection('translations').document(doc_id) for doc_id in valid_ids]
+                docs_by_id = {}
+                if refs:
+                    docs_by_id = {doc.id: doc for doc in self.db.get_all(refs, timeout=remaining_timeout(deadline))}
+                for text in remaining:
+                    doc = docs_by_id.get(text.lower())
+                    if doc is not None and doc.exists:
+                        translation = doc.to_dict().get(target_language)
+                        if translation:
+                            results[text] = translation
+            except Exception as e:
+                print(f"❌ Erreur lors de la récupération Firestore groupée: {e}")
+
+            remaining = [text for text in remaining if text not in results]
+
+        # Données locales (mode local, ou fallback pour les textes absents de Firestore)
+        for text in remaining:
+            translation = self._get_local_translation(text.lower(), target_language)
+            if translation:
+                results[text] = translation
+
+        return results
+
+    @staticmethod
+    def _is_valid_document_id(doc_id):
+        """Indique si un texte peut servir d'identifiant de document Firestore"""
+        return (
+            bool(doc_id)
+            and '/' not in doc_id
+            and doc_id not in ('.', '..')
+            and not (doc_id.startswith('__') and doc_id.endswith('__'))
+            and len(doc_id.encode('utf-8')) <= 1500
+        )
+
     def _get_local_translation(self, text_lower, target_language):
         """Récupère une traduction depuis les données locales"""
         translations = self.local_translations.get("fr", {})
@@ -175,11 +263,11 @@ class FirestoreService:
             return translations[text_lower][target_language]
         return None
 
-    def _get_firestore_translation(self, text_lower, target_language):
+    def _get_firestore_translation(self, text_lower, target_language, deadline=None):
         """Récupère une traduction depuis Firestore"""
         try:
             doc_ref = self.db.collection('translations').document(text_lower)
-            doc = doc_ref.get()
+            doc = doc_ref.get(timeout=remaining_timeout(deadline))
 
             if doc.exists:
                 data = doc.to_dict()
@@ -193,22 +281,28 @@ class FirestoreService:
         """Sauvegarde une traduction dans Firestore ou localement"""
         text_lower = text.lower()
         if self.use_local_data:
-            return self._save_local_translation(text_lower, target_language, translation)
+            saved = self._save_local_translation(text_lower, target_language, translation)
         else:
-            return self._save_firestore_translation(text_lower, target_language, translation)
+            saved = self._save_firestore_translation(text_lower, target_language, translation)
+
+        if saved:
+            # Le texte a désormais une traduction: oublier l'échec enregistré
+            get_negative_cache().invalidate(text, target_language)
+        return saved
 
     def _save_local_translation(self, text_lower, target_language, translation):
         """Sauvegarde une traduction localement"""
         try:
-            if "fr" not in self.local_translations:
-                self.local_translations["fr"] = {}
+            with self._local_lock:
+                if "fr" not in self.local_translations:
+                    self.local_translations["fr"] = {}
 
-            if text_lower not in self.local_translations["fr"]:
-                self.local_translations["fr"][text_lower] = {}
+                if text_lower not in self.local_translations["fr"]:
+                    self.local_translations["fr"][text_lower] = {}
 
-            self.local_translations["fr"][text_lower][target_language] = translation
+                self.local_translations["fr"][text_lower][target_language] = translation
 
-            self._save_local_translations_to_file() # Sauvegarde après chaque modification
+                self._save_local_translations_to_file() # Sauvegarde après chaque modification
 
             return True
         except Exception as e:
@@ -237,14 +331,17 @@ class FirestoreService:
 
         if self.use_local_data:
             try:
-                if "fr" not in self.local_translations:
-                    self.local_translations["fr"] = {}
-                if french_text_lower not in self.local_translations["fr"]:
-                    self.local_translations["fr"][french_text_lower] = {}
-
-                self.local_translations["fr"][french_text_lower][target_language] = new_translation
-                self._save_local_translations_to_file() # Sauvegarde après chaque modification manuelle
+                # Même verrou que _save_local_translation: modification et sérialisation atomiques
+                with self._local_lock:
+                    if "fr" not in self.local_translations:
+                        self.local_translations["fr"] = {}
+                    if french_text_lower not in self.local_translations["fr"]:
+                        self.local_translations["fr"][french_text_lower] = {}
+
+                    self.local_translations["fr"][french_text_lower][target_language] = new_translation
+                    self._save_local_translations_to_file() # Sauvegarde après chaque modification manuelle
                 print(f"INFO: Traduction locale mise à jour/ajoutée pour '{french_text_lower}' en '{target_language}'.")
+                get_negative_cache().invalidate(french_text, target_language)
                 return True
             except Exception as e:
                 print(f"❌ Erreur lors de la mise à jour manuelle locale: {e}")
@@ -256,6 +353,7 @@ class FirestoreService:
                     target_language: new_translation
                 }, merge=True)
                 print(f"INFO: Traduction Firestore mise à jour/ajoutée pour '{french_text_lower}' en '{target_language}'.")
+                get_negative_cache().invalidate(french_text, target_language)
                 return True
             except Exception as e:
                 print(f"❌ Erreur lors de la mise à jour manuelle Firestore: {e}")
@@ -1,9 +1,93 @@
 import os
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
-from typing import Optional
+from google.api_core import exceptions as google_exceptions
+from typing import Optional, Dict, List
+
+from services.deadline import Deadline
+from services.circuit_breaker import CircuitBreaker, backoff_delay
+from services.response_store import get_response_store
+
+# Erreurs amont transitoires: nouvelle tentative avec backoff (les autres sont définitives)
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    TimeoutError,
+    ConnectionError,
+)
+
+# Erreurs de délai: ne sont pas imputées au service amont quand le délai vient de l'échéance de la requête
+TIMEOUT_ERRORS = (
+    google_exceptions.DeadlineExceeded,
+    TimeoutError,
+)
+
+# Marqueur renvoyé par Gemini quand un texte ne peut pas être traduit
+IMPOSSIBLE_MARKER = "TRADUCTION_IMPOSSIBLE"
+
+# Estimation grossière pour le découpage des prompts groupés (~4 caractères par token)
+_CHARS_PER_TOKEN = 4
+_ITEM_OVERHEAD_TOKENS = 12
+
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
 
 class GeminiService:
     def __init__(self):
+        # Délai maximal d'un appel (jamais d'appel sans limite, même hors requête)
+        self.timeout_seconds = float(os.getenv('GEMINI_TIMEOUT_SECONDS', '15'))
+
+        # Nouvelles tentatives des erreurs transitoires (backoff exponentiel à gigue complète)
+        self.max_retries = int(os.getenv('GEMINI_MAX_RETRIES', '2'))
+        self.backoff_base_seconds = float(os.getenv('GEMINI_BACKOFF_BASE_SECONDS', '0.5'))
+        self.backoff_max_seconds = float(os.getenv('GEMINI_BACKOFF_MAX_SECONDS', '8'))
+
+        # Disjoncteur: pendant une panne, les appels sont refusés sans attendre un délai
+        self.breaker = CircuitBreaker(
+            'gemini',
+            failure_rate_threshold=float(os.getenv('GEMINI_BREAKER_FAILURE_RATE', '0.5')),
+            min_calls=int(os.getenv('GEMINI_BREAKER_MIN_CALLS', '5')),
+            window_size=int(os.getenv('GEMINI_BREAKER_WINDOW', '20')),
+            open_seconds=float(os.getenv('GEMINI_BREAKER_OPEN_SECONDS', '30'))
+        )
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+        # Prompts groupés (translate_many): budget de tokens par prompt et passes de reprise
+        self.batch_token_budget = int(os.getenv('GEMINI_BATCH_TOKEN_BUDGET', '1500'))
+        self.batch_max_items = int(os.getenv('GEMINI_BATCH_MAX_ITEMS', '40'))
+        self.batch_retry_passes = int(os.getenv('GEMINI_BATCH_RETRY_PASSES', '2'))
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('GEMINI_BATCH_CONCURRENCY', '4')),
+            thread_name_prefix='gemini-batch'
+        )
+        self.batch_prompts = 0
+        self.batch_items = 0
+        self.batch_missing = 0
+
+        # Cache persistant des réponses (partagé avec les scripts d'enrichissement)
+        self.model_name = 'gemini-2.0-flash-exp'
+        self.response_store = None
+        self.store_hits = 0
+        # Durée de vie des réponses contenant TRADUCTION_IMPOSSIBLE (comme le cache négatif)
+        self.impossible_ttl_seconds = float(os.getenv(
+            'GEMINI_IMPOSSIBLE_TTL_SECONDS', os.getenv('TRANSLATION_NEGATIVE_CACHE_TTL_SECONDS', '300')))
+        if os.getenv('GEMINI_RESPONSE_CACHE', 'true').lower() == 'true':
+            try:
+                self.response_store = get_response_store()
+            except OSError as e:
+                print(f"⚠️ Cache de réponses Gemini indisponible: {e}")
+
         # Configuration de l'API Gemini
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
@@ -14,16 +98,23 @@ class GeminiService:
         try:
             genai.configure(api_key=api_key)
             # Utiliser gemini-2.0-flash-exp qui est disponible dans la liste
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            self.model = genai.GenerativeModel(self.model_name)
             self.is_available = True
             print("✅ Service Gemini initialisé avec succès")
         except Exception as e:
             print(f"❌ Erreur d'initialisation Gemini: {e}")
             self.is_available = False
 
-    def translate_text(self, text: str, target_language: str) -> Optional[str]:
+    def translate_text(self, text: str, target_language: str, deadline: Optional[Deadline] = None) -> Optional[str]:
         """
         Traduit un texte vers une langue africaine locale en utilisant Gemini
+
+        L'appel est borné par le temps restant de l'échéance de la requête
+        (GEMINI_TIMEOUT_SECONDS au plus)
+
+        Returns:
+            Traduction, TRADUCTION_IMPOSSIBLE (réponse définitive de Gemini), ou None
+            si aucune réponse n'a été obtenue (service indisponible, erreur, échéance)
         """
         if not self.is_available:
             print("DEBUG: GeminiService non disponible, skipping translation.")
@@ -33,18 +124,9 @@ class GeminiService:
             # Construction du prompt contextualisé
             prompt = self._build_translation_prompt(text, target_language)
 
-            # Génération de la réponse
-            # Utilisation de generate_content pour un appel non-streaming
-            response = self.model.generate_content(prompt)
-
-            # Vérification de la structure de la réponse avant d'accéder à .text
-            # Gemini peut parfois ne pas retourner de texte directement dans 'response.text'
-            # mais dans response.candidates[0].content.parts[0].text
-            translated_content = ""
-            if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                for part in response.candidates[0].content.parts:
-                    translated_content += part.text
-            else:
+            # Génération de la réponse (cache persistant, disjoncteur, délai et nouvelles tentatives)
+            translated_content = self.generate_text(prompt, deadline=deadline)
+            if not translated_content:
                 print(f"WARN: Réponse Gemini inattendue ou vide pour le texte '{text}'.")
                 return None # Retourne None si la structure de réponse n'est pas celle attendue
 
@@ -52,9 +134,10 @@ class GeminiService:
                 # Nettoyer la réponse pour extraire seulement la traduction
                 translation = self._clean_response(translated_content)
                 # Vérifier si la traduction nettoyée est un marqueur d'impossibilité
-                if translation.upper() == "TRADUCTION_IMPOSSIBLE":
+                if translation.upper() == IMPOSSIBLE_MARKER:
                     print(f"INFO: Gemini a indiqué 'TRADUCTION_IMPOSSIBLE' pour '{text}' en '{target_language}'.")
-                    return None # Retourne None pour que le fallback soit activé si c'est le cas
+                    # Distinct de None (erreur): la route répond 422 et peut mémoriser l'échec
+                    return IMPOSSIBLE_MARKER
                 return translation
 
             return None
@@ -63,10 +146,334 @@ class GeminiService:
             print(f"❌ Erreur lors de la traduction Gemini pour '{text}' en '{target_language}': {e}")
             return None
 
-    def _build_translation_prompt(self, text: str, target_language: str) -> str:
+    def translate_many(self, texts: List[str], target_language: str,
+                       deadline: Optional[Deadline] = None) -> List[Optional[str]]:
         """
-        Construit un prompt contextualisé pour la traduction de phrases, expressions ou textes.
+        Traduit plusieurs textes avec des prompts groupés à sortie JSON
+
+        Chaque texte reçoit un identifiant stable ; les textes sont répartis en
+        prompts selon GEMINI_BATCH_TOKEN_BUDGET (exécutés en parallèle), et
+        seuls les identifiants absents d'une réponse (échec ou JSON partiel)
+        sont redemandés, au plus GEMINI_BATCH_RETRY_PASSES fois.
+
+        Args:
+            texts: Textes français à traduire
+            target_language: Langue cible
+            deadline: Échéance de la requête
+
+        Returns:
+            Liste alignée sur `texts`: traduction, TRADUCTION_IMPOSSIBLE, ou None si
+            aucune réponse n'a été obtenue pour ce texte
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        if not texts or not self.is_available:
+            return results
+
+        missing = list(range(len(texts)))
+        for attempt in range(self.batch_retry_passes + 1):
+            if deadline is not None and deadline.expired():
+                break
+
+            chunks = self._split_by_token_budget(missing, texts)
+            futures = [
+                self._batch_executor.submit(
+                    self._translate_chunk, chunk, texts, target_language, deadline, attempt > 0
+                )
+                for chunk in chunks
+            ]
+            for future in futures:
+                for item_id, translation in future.result().items():
+                    results[item_id] = translation
+
+            missing = [item_id for item_id in missing if results[item_id] is None]
+            if not missing:
+                break
+            print(f"WARN: {len(missing)} texte(s) absents de la réponse Gemini groupée "
+                  f"(passe {attempt + 1}/{self.batch_retry_passes + 1})")
+
+        with self._stats_lock:
+            self.batch_items += len(texts)
+            self.batch_missing += len(missing)
+
+        return results
+
+    def translate_languages(self, text: str, target_languages: List[str],
+                            deadline: Optional[Deadline] = None) -> Dict[str, Optional[str]]:
+        """
+        Traduit un texte vers plusieurs langues avec un seul prompt à sortie JSON
+
+        Chaque langue reçoit un identifiant stable ; seules les langues absentes
+        de la réponse sont redemandées, au plus GEMINI_BATCH_RETRY_PASSES fois.
+
+        Args:
+            text: Texte français à traduire
+            target_languages: Langues cibles
+            deadline: Échéance de la requête
+
+        Returns:
+            Dictionnaire {langue: traduction, TRADUCTION_IMPOSSIBLE, ou None sans réponse}
+        """
+        results: Dict[str, Optional[str]] = {language: None for language in target_languages}
+        if not target_languages or not self.is_available:
+            return results
+
+        missing = list(range(len(target_languages)))
+        for attempt in range(self.batch_retry_passes + 1):
+            with self._stats_lock:
+                self.batch_prompts += 1
+
+            prompt = self._build_multi_language_prompt(
+                text, [(item_id, target_languages[item_id]) for item_id in missing]
+            )
+            # Une passe de reprise ignore le cache: la réponse enregistrée est celle qui était incomplète
+            content = self.generate_text(prompt, deadline=deadline, refresh=attempt > 0)
+            if content is None:
+                # Refus du disjoncteur, échéance ou erreur définitive: inutile de réessayer
+                break
+
+            translations = self._parse_batch_response(content)
+            for item_id in missing:
+                if item_id in translations:
+                    results[target_languages[item_id]] = translations[item_id]
+
+            missing = [item_id for item_id in missing if results[target_languages[item_id]] is None]
+            if not missing:
+                break
+            print(f"WARN: {len(missing)} langue(s) absentes de la réponse Gemini multi-langues "
+                  f"(passe {attempt + 1}/{self.batch_retry_passes + 1})")
+
+        with self._stats_lock:
+            self.batch_items += len(target_languages)
+            self.batch_missing += len(missing)
+
+        return results
+
+    def _split_by_token_budget(self, item_ids: List[int], texts: List[str]) -> List[List[int]]:
+        """Répartit les identifiants en prompts respectant le budget de tokens et le nombre maximal d'éléments"""
+        chunks = []
+        current, current_tokens = [], 0
+
+        for item_id in item_ids:
+            tokens = len(texts[item_id]) // _CHARS_PER_TOKEN + _ITEM_OVERHEAD_TOKENS
+            if current and (current_tokens + tokens > self.batch_token_budget or len(current) >= self.batch_max_items):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(item_id)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _translate_chunk(self, item_ids: List[int], texts: List[str], target_language: str,
+                         deadline: Optional[Deadline], refresh: bool = False) -> Dict[int, str]:
+        """
+        Envoie un prompt groupé et retourne les traductions trouvées {identifiant: traduction}
+
+        Avec refresh (passe de reprise), la réponse est redemandée à Gemini
+        même si le cache persistant en contient une.
+        """
+        with self._stats_lock:
+            self.batch_prompts += 1
+
+        prompt = self._build_batch_prompt([(item_id, texts[item_id]) for item_id in item_ids], target_language)
+        content = self.generate_text(prompt, deadline=deadline, refresh=refresh)
+        if not content:
+            print(f"WARN: Réponse Gemini groupée vide ({len(item_ids)} textes en {target_language}).")
+            return {}
+
+        translations = self._parse_batch_response(content)
+        expected = set(item_ids)
+        return {item_id: translation for item_id, translation in translations.items() if item_id in expected}
+
+    @staticmethod
+    def _parse_batch_response(content: str) -> Dict[int, str]:
+        """
+        Extrait {identifiant: traduction} d'une réponse JSON groupée
+
+        Tolère les blocs de code Markdown, le texte autour de l'objet JSON et
+        les variantes {"translations": [...]}, [...] ou {"id": "traduction"}.
+        Les éléments invalides sont ignorés (ils seront redemandés).
+        """
+        content = content.strip()
+        if "```" in content:
+            content = content.split("```json")[-1] if "```json" in content else content.split("```")[1]
+            content = content.split("```")[0].strip()
+
+        try:
+            data = json.loads(content)
+        except ValueError:
+            match = _JSON_OBJECT_RE.search(content)
+            if not match:
+                print("WARN: Réponse Gemini groupée sans JSON exploitable.")
+                return {}
+            try:
+                data = json.loads(match.group(0))
+            except ValueError as e:
+                print(f"WARN: JSON Gemini groupé invalide: {e}")
+                return {}
+
+        if isinstance(data, dict) and isinstance(data.get('translations'), list):
+            data = data['translations']
+
+        if isinstance(data, dict):
+            entries = [{'id': key, 'translation': value} for key, value in data.items()]
+        elif isinstance(data, list):
+            entries = data
+        else:
+            return {}
+
+        translations = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                item_id = int(entry.get('id'))
+            except (TypeError, ValueError):
+                continue
+
+            translation = entry.get('translation')
+            if not isinstance(translation, str) or not translation.strip():
+                continue
+
+            translation = translation.strip()
+            translations[item_id] = IMPOSSIBLE_MARKER if translation.upper() == IMPOSSIBLE_MARKER else translation
+
+        return translations
+
+    def generate_content(self, prompt: str, deadline: Optional[Deadline] = None,
+                         timeout: Optional[float] = None, generation_config: Optional[Dict] = None):
+        """
+        Appel non-streaming à Gemini protégé par le disjoncteur
+
+        Les erreurs transitoires (429, 5xx, délai) sont retentées au plus
+        GEMINI_MAX_RETRIES fois avec un backoff exponentiel à gigue, sans
+        dépasser l'échéance de la requête. Quand le disjoncteur est ouvert,
+        l'appel est refusé immédiatement.
+
+        Args:
+            prompt: Prompt à envoyer
+            deadline: Échéance de la requête (None = pas d'échéance)
+            timeout: Délai maximal d'un appel (défaut: GEMINI_TIMEOUT_SECONDS)
+            generation_config: Configuration de génération (ex: sortie JSON)
+
+        Returns:
+            Réponse Gemini, ou None si l'appel est refusé ou échoue
         """
+        if not self.is_available:
+            return None
+
+        for attempt in range(self.max_retries + 1):
+            if deadline is not None and deadline.expired():
+                print("WARN: Échéance dépassée, appel Gemini annulé")
+                return None
+
+            if not self.breaker.allow_request():
+                print("WARN: Disjoncteur Gemini ouvert, appel refusé")
+                return None
+
+            with self._stats_lock:
+                self.calls += 1
+                self.retries += attempt > 0
+
+            request_timeout = self._request_timeout(deadline, timeout)
+            configured_timeout = timeout if timeout is not None else self.timeout_seconds
+            try:
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    request_options={'timeout': request_timeout}
+                )
+                self.breaker.record_success()
+                return response
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, TIMEOUT_ERRORS) and request_timeout < configured_timeout:
+                    # Délai raccourci par l'échéance de la requête: Gemini n'est pas en cause
+                    self.breaker.release()
+                else:
+                    self.breaker.record_failure()
+                    with self._stats_lock:
+                        self.failures += 1
+                print(f"⚠️ Erreur Gemini transitoire (essai {attempt + 1}/{self.max_retries + 1}): {e}")
+
+                delay = backoff_delay(attempt, self.backoff_base_seconds, self.backoff_max_seconds)
+                if attempt == self.max_retries or (deadline is not None and delay >= deadline.remaining()):
+                    return None
+                time.sleep(delay)
+            except Exception as e:
+                # Erreur définitive (requête invalide, contenu bloqué, erreur locale...):
+                # ni succès ni panne, le disjoncteur n'est pas modifié
+                self.breaker.release()
+                print(f"❌ Erreur Gemini: {e}")
+                return None
+
+        return None
+
+    def generate_text(self, prompt: str, deadline: Optional[Deadline] = None, timeout: Optional[float] = None,
+                      generation_config: Optional[Dict] = None, refresh: bool = False) -> Optional[str]:
+        """
+        Texte de la réponse Gemini à un prompt, via le cache persistant des réponses
+
+        Une réponse déjà obtenue pour le même (modèle, prompt, configuration)
+        est relue sur disque, même après un redémarrage ; sinon Gemini est
+        appelé (generate_content) et toute réponse non vide est enregistrée,
+        y compris les réponses qui ne seront pas analysables. Une réponse
+        contenant TRADUCTION_IMPOSSIBLE expire après GEMINI_IMPOSSIBLE_TTL_SECONDS,
+        pour qu'un refus ponctuel ne soit pas rejoué indéfiniment.
+
+        Args:
+            prompt: Prompt à envoyer
+            deadline: Échéance de la requête (None = pas d'échéance)
+            timeout: Délai maximal d'un appel (défaut: GEMINI_TIMEOUT_SECONDS)
+            generation_config: Configuration de génération
+            refresh: Ignorer la réponse en cache et la remplacer par une nouvelle
+
+        Returns:
+            Texte de la réponse, ou None si l'appel est refusé, échoue ou ne renvoie pas de texte
+        """
+        if self.response_store is not None and not refresh:
+            cached = self.response_store.get(self.model_name, prompt, generation_config)
+            if cached is not None:
+                with self._stats_lock:
+                    self.store_hits += 1
+                return cached
+
+        response = self.generate_content(prompt, deadline=deadline, timeout=timeout,
+                                         generation_config=generation_config)
+        if response is None:
+            return None
+
+        content = self._response_text(response)
+        if not content:
+            return None
+
+        if self.response_store is not None:
+            ttl_seconds = self.impossible_ttl_seconds if IMPOSSIBLE_MARKER in content.upper() else None
+            self.response_store.put(self.model_name, prompt, content, generation_config,
+                                    ttl_seconds=ttl_seconds)
+        return content
+
+    @staticmethod
+    def _response_text(response) -> str:
+        """
+        Concatène le texte de la réponse Gemini ('' si la structure est inattendue)
+
+        Gemini peut parfois ne pas retourner de texte directement dans 'response.text'
+        mais dans response.candidates[0].content.parts[0].text
+        """
+        if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+            return "".join(part.text for part in response.candidates[0].content.parts)
+        return ""
+
+    def _request_timeout(self, deadline: Optional[Deadline], timeout: Optional[float] = None) -> float:
+        """Délai de l'appel Gemini: le temps restant de la requête, borné par GEMINI_TIMEOUT_SECONDS"""
+        timeout = timeout if timeout is not None else self.timeout_seconds
+        if deadline is None:
+            return timeout
+        return deadline.timeout(timeout)
+
+    def _language_context(self, target_language: str) -> Dict[str, str]:
+        """Retourne la description et les exemples de la langue cible utilisés dans les prompts"""
         language_contexts = {
             'bété': {
                 'description': 'langue parlée principalement en Côte d\'Ivoire, dans la région du centre-ouest',
@@ -90,11 +497,17 @@ class GeminiService:
             }
         }
 
-        context = language_contexts.get(target_language, {
+        return language_contexts.get(target_language, {
             'description': f'langue africaine locale: {target_language}',
             'examples': ''
         })
 
+    def _build_translation_prompt(self, text: str, target_language: str) -> str:
+        """
+        Construit un prompt contextualisé pour la traduction de phrases, expressions ou textes.
+        """
+        context = self._language_context(target_language)
+
         prompt = f"""
 Tu es un expert en traduction vers les langues africaines locales.
 Ton objectif est de traduire précisément le texte français suivant vers le {target_language}.
@@ -116,6 +529,73 @@ Instructions de traduction:
 5. Si tu ne peux absolument pas fournir une traduction fiable ou pertinente pour ce texte en {target_language}, réponds exactement "TRADUCTION_IMPOSSIBLE".
 
 Traduction en {target_language}:
+"""
+        return prompt
+
+    def _build_multi_language_prompt(self, text: str, languages: List[tuple]) -> str:
+        """
+        Construit un prompt unique pour traduire un texte vers plusieurs langues:
+        chaque langue a un identifiant, et la réponse attendue est un objet JSON strict.
+        """
+        lines = []
+        for item_id, language in languages:
+            context = self._language_context(language)
+            line = f"- id {item_id}: {language}, {context['description']}."
+            if context['examples']:
+                line += f" Exemples: {context['examples']}"
+            lines.append(line)
+        language_lines = "\n".join(lines)
+
+        prompt = f"""
+Tu es un expert en traduction vers les langues africaines locales.
+Ton objectif est de traduire précisément le texte français suivant vers chacune des langues listées.
+Le texte peut être une phrase, une expression ou un paragraphe.
+
+Langues cibles (chacune a un identifiant "id"):
+{language_lines}
+
+Texte français à traduire: {json.dumps(text, ensure_ascii=False)}
+
+Instructions de traduction:
+1. Traduis le texte français dans chaque langue listée, en respectant sa grammaire et sa structure.
+2. Adapte la traduction au contexte culturel local si pertinent.
+3. Si tu ne peux absolument pas fournir une traduction fiable dans une langue, mets exactement "{IMPOSSIBLE_MARKER}" comme traduction pour cette langue.
+4. Réponds UNIQUEMENT avec un objet JSON valide, sans Markdown ni explication, au format strict:
+{{"translations": [{{"id": 0, "translation": "..."}}, ...]}}
+5. Donne exactement une entrée par identifiant de langue reçu, en reprenant le même "id".
+"""
+        return prompt
+
+    def _build_batch_prompt(self, items: List[tuple], target_language: str) -> str:
+        """
+        Construit un prompt groupé: les textes sont fournis en JSON avec leur
+        identifiant, et la réponse attendue est un objet JSON strict.
+        """
+        context = self._language_context(target_language)
+        payload = json.dumps([{'id': item_id, 'text': text} for item_id, text in items], ensure_ascii=False)
+
+        prompt = f"""
+Tu es un expert en traduction vers les langues africaines locales.
+Ton objectif est de traduire précisément chacun des textes français suivants vers le {target_language}.
+Chaque texte peut être une phrase, une expression ou un paragraphe.
+
+Contexte de la langue cible:
+- Le {target_language} est une {context['description']}.
+
+Exemples de traductions en {target_language}:
+{context['examples']}
+
+Textes français à traduire (JSON, chaque texte a un identifiant "id"):
+{payload}
+
+Instructions de traduction:
+1. Traduis chaque texte français en {target_language}, indépendamment des autres.
+2. Respecte la grammaire et la structure de la langue {target_language}.
+3. Adapte la traduction au contexte culturel local si pertinent.
+4. Si tu ne peux absolument pas fournir une traduction fiable pour un texte, mets exactement "{IMPOSSIBLE_MARKER}" comme traduction de ce texte.
+5. Réponds UNIQUEMENT avec un objet JSON valide, sans Markdown ni explication, au format strict:
+{{"translations": [{{"id": 0, "translation": "..."}}, ...]}}
+6. Donne exactement une entrée par identifiant reçu, en reprenant le même "id".
 """
         return prompt
 
@@ -148,5 +628,27 @@ Traduction en {target_language}:
         return response
 
     def is_service_available(self) -> bool:
-        """Vérifie si le service Gemini est disponible"""
-        return self.is_available
+        """Vérifie si le service Gemini est disponible (configuré, disjoncteur non ouvert)"""
+        return self.is_available and not self.breaker.is_open()
+
+    def get_stats(self) -> Dict:
+        """Retourne l'état du disjoncteur et les compteurs d'appels"""
+        with self._stats_lock:
+            return {
+                'available': self.is_available,
+                'calls': self.calls,
+                'retries': self.retries,
+                'failures': self.failures,
+                'max_retries': self.max_retries,
+                'timeout_seconds': self.timeout_seconds,
+                'store_hits': self.store_hits,
+                'response_store': self.response_store.get_stats() if self.response_store is not None else None,
+                'batch': {
+                    'prompts': self.batch_prompts,
+                    'items': self.batch_items,
+                    'missing': self.batch_missing,
+                    'token_budget': self.batch_token_budget,
+                    'max_items': self.batch_max_items
+                },
+                'breaker': self.breaker.get_stats()
+            }
@@ -0,0 +1,49 @@
+"""
+Métriques internes légères (histogrammes) exposées par /translate/metrics
+"""
+import bisect
+import threading
+from typing import Dict, List
+
+
+class Histogram:
+    """
+    Histogramme à buckets cumulés, thread-safe.
+
+    Chaque bucket compte les observations <= à sa borne ; le bucket '+Inf'
+    compte toutes les observations.
+    """
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Enregistre une observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def get_stats(self) -> Dict:
+        """Retourne les buckets cumulés, le nombre, la moyenne et le maximum"""
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, count in zip(self.buckets, self._counts):
+                running += count
+                cumulative[str(bound)] = running
+            cumulative['+Inf'] = self.count
+
+            return {
+                'buckets': cumulative,
+                'count': self.count,
+                'mean': self.total / self.count if self.count > 0 else 0.0,
+                'max': self.max
+            }
@@ -0,0 +1,231 @@
+"""
+Cache persistant sur disque des réponses Gemini, adressé par le contenu du prompt
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Répertoire par défaut: backend/data/gemini_cache
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'gemini_cache')
+
+
+class ResponseStore:
+    """
+    Réponses Gemini conservées sur disque entre les redémarrages.
+
+    La clé est le hash SHA-256 de (nom du modèle, prompt, configuration de
+    génération) ; chaque réponse est un petit fichier JSON écrit de façon
+    atomique. Le volume total est borné par `max_bytes` (éviction des
+    entrées les moins récemment lues) et une expiration optionnelle
+    (`ttl_seconds`, 0 = jamais) s'applique à la lecture ; une entrée peut
+    porter sa propre durée de vie, plus courte (réponses TRADUCTION_IMPOSSIBLE).
+
+    Le verrou ne protège que l'index en mémoire (ordre LRU et tailles) :
+    les lectures et écritures de fichiers se font hors verrou.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: float = 0.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # Index en mémoire {clé: taille}, du moins au plus récemment utilisé
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        """Construit la clé (hash du modèle, du prompt et de la configuration de génération)"""
+        payload = json.dumps([model_name, prompt, generation_config or {}], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Chemin du fichier d'une entrée (sous-répertoire par préfixe du hash)"""
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self):
+        """Parcourt le répertoire pour retrouver les entrées des exécutions précédentes"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, name[:-len('.json')], stat.st_size))
+
+        # L'heure de modification (mise à jour à chaque lecture) donne l'ordre LRU
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._current_bytes += size
+
+    def get(self, model_name: str, prompt: str, generation_config: Optional[Dict] = None) -> Optional[str]:
+        """
+        Récupère la réponse enregistrée pour un prompt
+
+        Returns:
+            Texte de la réponse, ou None si absente ou expirée
+        """
+        key = self.make_key(model_name, prompt, generation_config)
+        path = self._path(key)
+
+        with self._lock:
+            known = key in self._index
+            if not known:
+                self.misses += 1
+        if not known:
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # Fichier supprimé ou corrompu hors du processus
+            self._discard(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Durée de vie: celle du cache, ou celle de l'entrée si elle est plus courte
+        ttl_seconds = min(
+            (ttl for ttl in (self.ttl_seconds, entry.get('ttl_seconds') or 0) if ttl > 0),
+            default=0
+        )
+        if ttl_seconds > 0 and time.time() - entry.get('created_at', 0) > ttl_seconds:
+            self._discard(key)
+            with self._lock:
+                self.expirations += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._index:
+                # Marquer comme récemment utilisée
+                self._index.move_to_end(key)
+            self.hits += 1
+
+        # L'heure de modification conserve l'ordre LRU d'un redémarrage à l'autre
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry.get('text')
+
+    def put(self, model_name: str, prompt: str, text: str, generation_config: Optional[Dict] = None,
+            ttl_seconds: Optional[float] = None):
+        """
+        Enregistre (ou remplace) la réponse d'un prompt
+
+        Args:
+            ttl_seconds: Durée de vie propre à cette entrée (None = celle du cache)
+        """
+        key = self.make_key(model_name, prompt, generation_config)
+        path = self._path(key)
+        data = json.dumps({
+            'model': model_name,
+            'created_at': time.time(),
+            'ttl_seconds': ttl_seconds,
+            'prompt': prompt,
+            'text': text
+        }, ensure_ascii=False).encode('utf-8')
+
+        # Une entrée plus grosse que le budget total n'est jamais enregistrée
+        if len(data) > self.max_bytes:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Écriture atomique: un lecteur ne voit jamais un fichier partiel
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"❌ Erreur d'écriture du cache de réponses Gemini: {e}")
+            return
+
+        evicted: List[str] = []
+        with self._lock:
+            self._current_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._current_bytes += len(data)
+            self.writes += 1
+
+            # Éviction des entrées les moins récemment lues jusqu'à respecter le budget
+            while self._current_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, size = self._index.popitem(last=False)
+                self._current_bytes -= size
+                self.evictions += 1
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            self._remove_file(old_key)
+
+    def _discard(self, key: str):
+        """Retire une entrée de l'index puis supprime son fichier"""
+        with self._lock:
+            self._current_bytes -= self._index.pop(key, 0)
+        self._remove_file(key)
+
+    def _remove_file(self, key: str):
+        """Supprime le fichier d'une entrée (déjà absente de l'index)"""
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict:
+        """Retourne les compteurs du cache de réponses"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'directory': self.directory,
+                'entries': len(self._index),
+                'bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.0,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+# Instance globale (partagée par GeminiService et les scripts d'enrichissement)
+_response_store = None
+
+
+def get_response_store() -> ResponseStore:
+    """Retourne l'instance du cache de réponses Gemini (singleton)"""
+    global _response_store
+
+    if _response_store is None:
+        _response_store = ResponseStore(
+            directory=os.getenv('GEMINI_RESPONSE_CACHE_DIR', DEFAULT_STORE_DIR),
+            max_bytes=int(os.getenv('GEMINI_RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+            ttl_seconds=float(os.getenv('GEMINI_RESPONSE_CACHE_TTL_SECONDS', '0'))
+        )
+
+    return _response_store
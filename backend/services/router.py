@@ -0,0 +1,195 @@
+"""
+Routage adaptatif des tiers de traduction à partir de statistiques glissantes
+"""
+import os
+import random
+import threading
+from collections import deque
+from itertools import permutations
+from typing import Dict, List, Tuple
+
+# Tiers de traduction
+TIER_DATABASE = 'database'
+TIER_TENSORFLOW = 'tensorflow'
+TIER_GEMINI = 'gemini'
+
+# Ordre par défaut des tiers modèles (la base de données est toujours consultée d'abord)
+DEFAULT_TIER_ORDER = (TIER_TENSORFLOW, TIER_GEMINI)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class TierStats:
+    """
+    Fenêtre glissante des dernières tentatives d'un tier pour une langue.
+
+    Chaque tentative mémorise sa latence, si le tier a produit un résultat
+    (hit) et si ce résultat a été retenu (acceptation, ex: confiance
+    TensorFlow au-dessus du seuil).
+    """
+
+    def __init__(self, window_size: int):
+        self._attempts: "deque[Tuple[float, bool, bool]]" = deque(maxlen=window_size)
+
+    def record(self, latency_seconds: float, hit: bool, accepted: bool):
+        """Enregistre une tentative"""
+        self._attempts.append((latency_seconds, hit, accepted))
+
+    def __len__(self) -> int:
+        return len(self._attempts)
+
+    def acceptance_rate(self) -> float:
+        """Part des tentatives dont le résultat a été retenu"""
+        if not self._attempts:
+            return 0.0
+        return sum(accepted for _, _, accepted in self._attempts) / len(self._attempts)
+
+    def latency(self, fraction: float = 0.5) -> float:
+        """Percentile de latence en secondes"""
+        return _percentile(sorted(latency for latency, _, _ in self._attempts), fraction)
+
+    def get_stats(self) -> Dict:
+        """Retourne le nombre de tentatives, les taux et les latences p50/p95"""
+        count = len(self._attempts)
+        latencies = sorted(latency for latency, _, _ in self._attempts)
+        return {
+            'count': count,
+            'hit_rate': sum(hit for _, hit, _ in self._attempts) / count if count > 0 else 0.0,
+            'acceptance_rate': self.acceptance_rate(),
+            'p50_ms': _percentile(latencies, 0.5) * 1000,
+            'p95_ms': _percentile(latencies, 0.95) * 1000
+        }
+
+
+class TranslationRouter:
+    """
+    Ordonne les tiers modèles (TensorFlow, Gemini) pour minimiser la latence attendue.
+
+    Pour chaque langue, le coût d'un ordre est la somme des latences p50
+    pondérées par la probabilité d'atteindre chaque tier (les tiers
+    précédents n'ayant pas été acceptés). Un tier dont le taux
+    d'acceptation reste sous `min_acceptance` est sauté (politique de
+    qualité) ; une petite part des requêtes suit l'ordre par défaut pour
+    continuer à mesurer tous les tiers. Tant qu'un tier n'a pas
+    `min_samples` tentatives, l'ordre par défaut est conservé.
+    """
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20,
+                 min_acceptance: float = 0.05, explore_rate: float = 0.05):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.min_acceptance = min_acceptance
+        self.explore_rate = explore_rate
+
+        self._stats: Dict[Tuple[str, str], TierStats] = {}
+        self._lock = threading.Lock()
+
+        # Compteurs des décisions
+        self.decisions: Dict[str, int] = {}
+        self.skips: Dict[str, int] = {}
+
+    def record(self, target_language: str, tier: str, latency_seconds: float, hit: bool, accepted: bool):
+        """Enregistre le résultat d'une tentative d'un tier"""
+        with self._lock:
+            stats = self._stats.get((target_language, tier))
+            if stats is None:
+                stats = self._stats[(target_language, tier)] = TierStats(self.window_size)
+            stats.record(latency_seconds, hit, accepted)
+
+    def plan(self, target_language: str, available_tiers: List[str]) -> Tuple[List[str], Dict[str, str], str]:
+        """
+        Choisit l'ordre des tiers modèles pour une requête
+
+        Args:
+            target_language: Langue cible
+            available_tiers: Tiers modèles disponibles
+
+        Returns:
+            Tuple de (tiers dans l'ordre d'essai, {tier sauté: raison}, type de décision
+            parmi 'default' (statistiques insuffisantes), 'explore' et 'adaptive')
+        """
+        candidates = [tier for tier in DEFAULT_TIER_ORDER if tier in available_tiers]
+
+        with self._lock:
+            stats = {tier: self._stats.get((target_language, tier)) for tier in candidates}
+            warm = all(stats[tier] is not None and len(stats[tier]) >= self.min_samples for tier in candidates)
+
+            if not warm or random.random() < self.explore_rate:
+                decision = 'default' if not warm else 'explore'
+                order, skipped = candidates, {}
+            else:
+                decision = 'adaptive'
+                acceptance = {tier: stats[tier].acceptance_rate() for tier in candidates}
+                latency = {tier: stats[tier].latency(0.5) for tier in candidates}
+
+                # Politique de qualité: ne pas essayer un tier qui n'est presque jamais retenu
+                skipped = {
+                    tier: 'low_acceptance' for tier in candidates
+                    if acceptance[tier] < self.min_acceptance
+                }
+                kept = [tier for tier in candidates if tier not in skipped]
+                if not kept and candidates:
+                    # Toujours garder au moins le tier le plus souvent retenu
+                    best = max(candidates, key=lambda tier: acceptance[tier])
+                    skipped.pop(best)
+                    kept = [best]
+
+                def expected_latency(tiers):
+                    cost, reach = 0.0, 1.0
+                    for tier in tiers:
+                        cost += reach * latency[tier]
+                        reach *= 1.0 - acceptance[tier]
+                    return cost
+
+                # min garde l'ordre par défaut en cas d'égalité (première permutation)
+                order = list(min(permutations(kept), key=expected_latency)) if kept else []
+
+            key = '>'.join([TIER_DATABASE] + order)
+            self.decisions[key] = self.decisions.get(key, 0) + 1
+            for tier in skipped:
+                skip_key = f"{target_language}:{tier}"
+                self.skips[skip_key] = self.skips.get(skip_key, 0) + 1
+
+        return order, skipped, decision
+
+    def get_stats(self) -> Dict:
+        """Retourne les statistiques par langue et par tier, et les décisions prises"""
+        with self._lock:
+            languages: Dict[str, Dict] = {}
+            for (language, tier), stats in self._stats.items():
+                languages.setdefault(language, {})[tier] = stats.get_stats()
+
+            return {
+                'window_size': self.window_size,
+                'min_samples': self.min_samples,
+                'min_acceptance': self.min_acceptance,
+                'explore_rate': self.explore_rate,
+                'languages': languages,
+                'orders': dict(self.decisions),
+                'skips': dict(self.skips)
+            }
+
+
+# Instance globale du routeur
+_translation_router = None
+
+
+def get_translation_router() -> TranslationRouter:
+    """Retourne l'instance du routeur de traduction (singleton)"""
+    global _translation_router
+
+    if _translation_router is None:
+        _translation_router = TranslationRouter(
+            window_size=int(os.getenv('TRANSLATION_ROUTER_WINDOW', '200')),
+            min_samples=int(os.getenv('TRANSLATION_ROUTER_MIN_SAMPLES', '20')),
+            min_acceptance=float(os.getenv('TRANSLATION_ROUTER_MIN_ACCEPTANCE', '0.05')),
+            explore_rate=float(os.getenv('TRANSLATION_ROUTER_EXPLORE_RATE', '0.05'))
+        )
+
+    return _translation_router
@@ -0,0 +1,93 @@
+"""
+Coalescence des requêtes identiques en cours d'exécution (single-flight)
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """Appel en cours partagé entre le leader et les requêtes en attente"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Garantit qu'une seule exécution de `fn` est en cours par clé.
+
+    Le premier appelant (leader) exécute le travail ; les appelants
+    concurrents avec la même clé attendent et reçoivent le même résultat
+    (ou la même exception).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.executions = 0
+        self.collapsed = 0
+        self.errors = 0
+        self.max_waiters = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Exécute `fn` ou attend l'exécution en cours pour la même clé
+
+        Args:
+            key: Clé identifiant le travail (ex: texte normalisé, langue)
+            fn: Fonction sans argument produisant le résultat
+
+        Returns:
+            Tuple de (résultat, partagé) où partagé indique que le résultat
+            provient de l'exécution d'un autre appelant
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                is_leader = True
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            # Retirer l'appel avant de réveiller les autres: les requêtes
+            # arrivant ensuite relancent un calcul (ou touchent le cache)
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, False
+
+    def get_stats(self) -> Dict:
+        """Retourne les compteurs de coalescence"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'collapsed': self.collapsed,
+                'errors': self.errors,
+                'max_waiters': self.max_waiters
+            }
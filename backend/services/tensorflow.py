@@ -4,73 +4,326 @@ Service de traduction utilisant TensorFlow
 import os
 import tensorflow as tf
 import numpy as np
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List, Set
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-from ml.config import MODEL_DIR, SUPPORTED_LANGUAGES, CONFIDENCE_THRESHOLD
-from ml.vocabulary import Vocabulary
+from ml.config import (
+    MODEL_DIR, SUPPORTED_LANGUAGES, CONFIDENCE_THRESHOLD, BATCH_SIZE, PAD_ID,
+    START_ID, END_ID, UNK_ID, SPECIAL_TOKENS, BEAM_WIDTH, MAX_BEAM_WIDTH, MULTILINGUAL_MODEL
+)
+from ml.vocabulary import Vocabulary, source_vocab_language
+from ml.tflite_inference import TFLiteSeq2Seq, tflite_component_paths
+from ml.serving import SignatureSeq2Seq, saved_model_has_serving_signatures
+from services.batching import MicroBatchScheduler
+from services.metrics import Histogram
+from services.deadline import Deadline, remaining_timeout
+
+# États de chargement exposés par l'endpoint de readiness
+STATE_UNLOADED = 'unloaded'
+STATE_LOADING = 'loading'
+STATE_WARMING = 'warming'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+# Backends de service d'un modèle
+BACKEND_KERAS = 'keras'
+BACKEND_TFLITE = 'tflite'
+
+# Longueurs source (mots) des décodages synthétiques de warm-up
+WARMUP_LENGTHS = [2, 6, 12]
 
 
 class TensorFlowTranslationService:
     """Service de traduction avec TensorFlow"""
     
     def __init__(self):
-        self.models: Dict[str, tf.keras.Model] = {}
+        # Modèles résidents, du moins au plus récemment utilisé
+        self.models: "OrderedDict[str, tf.keras.Model]" = OrderedDict()
         self.source_vocabs: Dict[str, Vocabulary] = {}
         self.target_vocabs: Dict[str, Vocabulary] = {}
+        self.model_paths: Dict[str, str] = {}
+        # Langue cible -> modèle résident (la langue elle-même, ou le modèle multilingue)
+        self.model_keys: Dict[str, str] = {}
+        self.model_versions: Dict[str, str] = {}
+        self.model_bytes: Dict[str, int] = {}
+        self.model_states: Dict[str, str] = {}
+        # Modèles préchargés au démarrage: seuls eux conditionnent la disponibilité (/ready)
+        self.preloaded_keys: Set[str] = set()
+        self.model_backends: Dict[str, str] = {}
         self.is_available = False
         
-        # Charger les modèles au démarrage
-        self._load_models()
+        # Langues servies par les composants TFLite quantifiés plutôt que par le SavedModel Keras
+        self.tflite_languages = {
+            language.strip() for language in os.getenv('TF_TFLITE_LANGUAGES', '').split(',')
+            if language.strip()
+        }
+        self.tflite_threads = int(os.getenv('TF_TFLITE_THREADS', '0')) or None
+        
+        # Un seul modèle (encodeur partagé + token de langue) pour toutes les langues cibles
+        self.multilingual = os.getenv('TF_MULTILINGUAL', 'false').lower() == 'true'
+        
+        # Chargement à la demande avec éviction LRU
+        self.max_resident_models = int(os.getenv('TF_MAX_RESIDENT_MODELS', str(len(SUPPORTED_LANGUAGES))))
+        self.memory_budget_bytes = int(float(os.getenv('TF_MODEL_MEMORY_BUDGET_MB', '0')) * 1024 * 1024)
+        self._resident_lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.load_count = 0
+        self.eviction_count = 0
+        
+        # Micro-batching des requêtes unitaires concurrentes (une file par langue et largeur de faisceau)
+        self.micro_batching = os.getenv('TF_MICRO_BATCHING', 'true').lower() == 'true'
+        self.max_batch_size = int(os.getenv('TF_MAX_BATCH_SIZE', '16'))
+        self.max_batch_wait_ms = float(os.getenv('TF_MAX_BATCH_WAIT_MS', '5'))
+        self._schedulers: Dict[Tuple[str, int], MicroBatchScheduler] = {}
+        self._schedulers_lock = threading.Lock()
+        
+        # Pré-contrôle OOV: les textes trop éloignés du vocabulaire source ne sont pas décodés
+        # (ils échoueraient au seuil de confiance) et passent directement au tier suivant
+        self.max_oov_ratio = float(os.getenv('TF_MAX_OOV_RATIO', '0.5'))
+        self._oov_lock = threading.Lock()
+        self.oov_ratios = Histogram([0.0, 0.1, 0.25, 0.5, 0.75, 1.0])
+        self.oov_checked = 0
+        self.oov_skipped: Dict[str, int] = {}
+        
+        # Repérer les modèles disponibles, puis précharger les langues demandées en arrière-plan
+        self._discover_models()
+        preload_languages = [
+            language.strip() for language in os.getenv('TF_PRELOAD_LANGUAGES', '').split(',')
+            if language.strip()
+        ]
+        self.preload(preload_languages, wait=os.getenv('TF_PRELOAD_BLOCKING', 'false').lower() == 'true')
     
-    def _load_models(self):
-        """Charge tous les modèles disponibles"""
+    def _discover_models(self):
+        """Repère les modèles présents sur disque sans les charger"""
         print("\n🤖 Initialisation du service TensorFlow...")
         
-        loaded_count = 0
+        # Mode multilingue: un seul modèle résident sert toutes les langues cibles
+        if self.multilingual and not os.path.exists(os.path.join(MODEL_DIR, f"{MULTILINGUAL_MODEL}_model")):
+            print(f"⚠️  Modèle multilingue non trouvé, repli sur les modèles par langue")
+            self.multilingual = False
         
         for language in SUPPORTED_LANGUAGES:
+            model_key = MULTILINGUAL_MODEL if self.multilingual else language
+            model_path = os.path.join(MODEL_DIR, f"{model_key}_model")
+            backend = BACKEND_KERAS
+            
+            if model_key in self.tflite_languages:
+                if TFLiteSeq2Seq.exists(model_key):
+                    model_path = tflite_component_paths(model_key)['encoder']
+                    backend = BACKEND_TFLITE
+                else:
+                    print(f"⚠️  Composants TFLite {model_key} absents, repli sur le SavedModel")
+            
+            # Vérifier si le modèle existe
+            if not os.path.exists(model_path):
+                print(f"⚠️  Modèle {language} non trouvé: {model_path}")
+                continue
+            
+            self.model_paths[language] = model_path
+            self.model_keys[language] = model_key
+            self.model_backends[language] = backend
+            # Le backend fait partie de la version: les traductions en cache ne se mélangent pas
+            version = str(int(os.path.getmtime(model_path)))
+            self.model_versions[language] = version if backend == BACKEND_KERAS else f"{backend}-{version}"
+            self.model_states.setdefault(model_key, STATE_UNLOADED)
+            self._load_locks.setdefault(model_key, threading.Lock())
+        
+        if self.model_paths:
+            self.is_available = True
+            mode = "modèle multilingue" if self.multilingual else "chargement à la demande"
+            print(f"\n✅ Service TensorFlow initialisé ({len(self.model_paths)}/{len(SUPPORTED_LANGUAGES)} langues, {mode})")
+        else:
+            print(f"\n⚠️  Aucun modèle TensorFlow disponible")
+            print(f"   Les modèles doivent être entraînés avec: python -m ml.training --target-language <langue>")
+    
+    def preload(self, languages: List[str], wait: bool = False):
+        """
+        Charge et réchauffe à l'avance les modèles des langues les plus demandées,
+        en parallèle sur un pool de threads
+        
+        Args:
+            languages: Langues à précharger
+            wait: Bloquer jusqu'à la fin des chargements (sinon arrière-plan)
+        """
+        # Une seule tâche par modèle résident (une seule pour toutes les langues en mode multilingue)
+        to_load = {}
+        for language in languages:
+            if language in self.model_paths:
+                to_load.setdefault(self.model_keys[language], language)
+        if not to_load:
+            return
+        
+        for model_key in to_load:
+            self.model_states[model_key] = STATE_LOADING
+            self.preloaded_keys.add(model_key)
+        
+        max_workers = int(os.getenv('TF_PRELOAD_WORKERS', str(len(to_load))))
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='tf-preload')
+        futures = [executor.submit(self._get_model, language, True) for language in to_load.values()]
+        # Libérer les threads du pool une fois les chargements terminés
+        executor.shutdown(wait=wait)
+        
+        if wait:
+            for future in futures:
+                future.result()
+    
+    def _get_source_vocab(self, model_key: str) -> Vocabulary:
+        """Charge une seule fois le vocabulaire source (partagé par les modèles par langue)"""
+        vocab_language = source_vocab_language(model_key)
+        if vocab_language not in self.source_vocabs:
+            with self._resident_lock:
+                if vocab_language not in self.source_vocabs:
+                    self.source_vocabs[vocab_language] = Vocabulary.load(language=vocab_language, inference_only=True)
+        return self.source_vocabs[vocab_language]
+    
+    def _get_model(self, language: str, warm_up: bool = False) -> Optional[Tuple[object, Vocabulary, Vocabulary]]:
+        """
+        Retourne (modèle, vocab_source, vocab_cible), en chargeant le modèle au premier usage
+        
+        Args:
+            language: Langue cible
+            warm_up: Exécuter des décodages synthétiques après le chargement
+        
+        Returns:
+            Tuple (modèle, vocab_source, vocab_cible) ou None si le chargement échoue
+        """
+        if language not in self.model_paths:
+            return None
+        
+        model_key = self.model_keys[language]
+        
+        with self._resident_lock:
+            if model_key in self.models:
+                # Marquer comme récemment utilisé
+                self.models.move_to_end(model_key)
+                return self.models[model_key], self._get_source_vocab(model_key), self.target_vocabs[model_key]
+        
+        # Un seul chargement à la fois par modèle
+        with self._load_locks[model_key]:
+            with self._resident_lock:
+                if model_key in self.models:
+                    self.models.move_to_end(model_key)
+                    return self.models[model_key], self._get_source_vocab(model_key), self.target_vocabs[model_key]
+            
             try:
-                model_path = os.path.join(MODEL_DIR, f"{language}_model")
-                
-                # Vérifier si le modèle existe
-                if not os.path.exists(model_path):
-                    print(f"⚠️  Modèle {language} non trouvé: {model_path}")
-                    continue
+                self.model_states[model_key] = STATE_LOADING
+                source_vocab = self._get_source_vocab(model_key)
                 
-                # Charger le modèle
-                print(f"   Chargement du modèle {language}...")
-                model = tf.keras.models.load_model(model_path, compile=False)
+                # Charger le modèle (SavedModel Keras ou composants TFLite)
+                backend = self.model_backends[language]
+                print(f"   Chargement du modèle {model_key} ({backend})...")
+                start_time = time.time()
+                if backend == BACKEND_TFLITE:
+                    model = TFLiteSeq2Seq.load(model_key, num_threads=self.tflite_threads)
+                else:
+                    model = self._load_saved_model(language)
+                target_vocab = Vocabulary.load(language=model_key, inference_only=True)
+                model_bytes = self._estimate_model_bytes(model)
                 
-                # Charger les vocabulaires
-                source_vocab = Vocabulary.load(language='fr')
-                target_vocab = Vocabulary.load(language=language)
-                
-                # Stocker
-                self.models[language] = model
-                self.source_vocabs[language] = source_vocab
-                self.target_vocabs[language] = target_vocab
-                
-                loaded_count += 1
-                print(f"   ✅ Modèle {language} chargé")
+                # Tracer les graphes de décodage avant la première vraie requête
+                if warm_up:
+                    self.model_states[model_key] = STATE_WARMING
+                    self._warm_up(language, model, source_vocab)
                 
             except Exception as e:
-                print(f"   ❌ Erreur lors du chargement du modèle {language}: {e}")
+                self.model_states[model_key] = STATE_FAILED
+                print(f"   ❌ Erreur lors du chargement du modèle {model_key}: {e}")
+                return None
+            
+            with self._resident_lock:
+                self.models[model_key] = model
+                self.target_vocabs[model_key] = target_vocab
+                self.model_bytes[model_key] = model_bytes
+                self.model_states[model_key] = STATE_READY
+                self.load_count += 1
+                self._evict_models()
+            
+            print(f"   ✅ Modèle {model_key} chargé en {time.time() - start_time:.1f}s "
+                  f"(~{model_bytes / 1024 / 1024:.0f} MB)")
+            
+            return model, source_vocab, target_vocab
+    
+    def _load_saved_model(self, language: str):
+        """
+        Charge un SavedModel par ses signatures de service (graphes déjà tracés),
+        ou reconstruit le modèle Keras pour les modèles exportés sans signatures
         
-        if loaded_count > 0:
-            self.is_available = True
-            print(f"\n✅ Service TensorFlow initialisé ({loaded_count}/{len(SUPPORTED_LANGUAGES)} modèles)")
-        else:
-            print(f"\n⚠️  Aucun modèle TensorFlow disponible")
-            print(f"   Les modèles doivent être entraînés avec: python -m ml.training --target-language <langue>")
+        Les signatures sont lues dans saved_model.pb avant le chargement: un
+        modèle sans signatures n'est pas chargé deux fois (temps et pic mémoire)
+        """
+        model_path = self.model_paths[language]
+        
+        if saved_model_has_serving_signatures(model_path):
+            return SignatureSeq2Seq.load(model_path)
+        
+        print(f"   ⚠️  Modèle {language} sans signatures de service, chargement Keras")
+        return tf.keras.models.load_model(model_path, compile=False)
     
-    def translate_text(self, text: str, target_language: str) -> Optional[Tuple[str, float]]:
+    def _evict_models(self):
+        """Décharge les modèles les moins récemment utilisés au-delà des limites (verrou tenu)"""
+        def over_budget():
+            if len(self.models) > self.max_resident_models:
+                return True
+            return self.memory_budget_bytes > 0 and sum(self.model_bytes.values()) > self.memory_budget_bytes
+        
+        # Toujours garder au moins le modèle qui vient d'être chargé
+        while len(self.models) > 1 and over_budget():
+            model_key, _ = self.models.popitem(last=False)
+            self.target_vocabs.pop(model_key, None)
+            self.model_bytes.pop(model_key, None)
+            self.model_states[model_key] = STATE_UNLOADED
+            self.eviction_count += 1
+            print(f"   ♻️  Modèle {model_key} déchargé (LRU)")
+    
+    def _warm_up(self, language: str, model, source_vocab: Vocabulary):
+        """Exécute quelques décodages synthétiques de longueurs typiques (glouton et beam search)"""
+        start_time = time.time()
+        
+        # Le token de langue fait partie de la source du modèle multilingue
+        prefix = self._encode_source(source_vocab, '', language)[1:-1]
+        samples = [
+            [START_ID] + prefix + np.random.randint(len(SPECIAL_TOKENS), max(len(source_vocab), len(SPECIAL_TOKENS) + 1), size=length).tolist() + [END_ID]
+            for length in WARMUP_LENGTHS
+        ]
+        source_seqs = tf.keras.preprocessing.sequence.pad_sequences(samples, padding='post', value=PAD_ID)
+        
+        # Glouton (défaut) et beam search à la largeur conseillée (BEAM_WIDTH, sur demande)
+        for beam_width in sorted({1, self.resolve_beam_width(BEAM_WIDTH, language)}):
+            # Une phrase seule (chemin unitaire) puis un batch paddé (micro-batching)
+            model.translate_batch(source_seqs[:1], return_attention=False, beam_width=beam_width)
+            model.translate_batch(source_seqs, return_attention=False, beam_width=beam_width)
+        
+        print(f"   🔥 Modèle {self.model_keys[language]} réchauffé en {time.time() - start_time:.1f}s")
+    
+    def _encode_source(self, source_vocab: Vocabulary, text: str, target_language: str) -> List[int]:
+        """Encode un texte source (avec le token de langue cible pour le modèle multilingue)"""
+        if self.model_keys.get(target_language) == MULTILINGUAL_MODEL:
+            return source_vocab.encode(text, add_special_tokens=True, target_language=target_language)
+        return source_vocab.encode(text, add_special_tokens=True)
+    
+    @staticmethod
+    def _estimate_model_bytes(model) -> int:
+        """Estime la mémoire des poids d'un modèle (float32 = 4 octets, taille des fichiers pour TFLite)"""
+        if isinstance(model, (TFLiteSeq2Seq, SignatureSeq2Seq)):
+            return model.size_bytes
+        try:
+            return int(sum(np.prod(weight.shape) for weight in model.weights) * 4)
+        except Exception:
+            return 0
+    
+    def translate_text(self, text: str, target_language: str, beam_width: Optional[int] = None,
+                       deadline: Optional[Deadline] = None) -> Optional[Tuple[str, float]]:
         """
         Traduit un texte vers une langue cible
         
         Args:
             text: Texte source (français)
             target_language: Langue cible
+            beam_width: Largeur du beam search (défaut: 1 = glouton, beam search sur demande)
+            deadline: Échéance de la requête (None si échec quand elle est dépassée)
         
         Returns:
             Tuple de (traduction, score_de_confiance) ou None si échec
@@ -78,82 +331,238 @@ class TensorFlowTranslationService:
         if not self.is_available:
             return None
         
-        if target_language not in self.models:
+        if target_language not in self.model_paths:
             print(f"⚠️  Modèle {target_language} non disponible")
             return None
         
+        if deadline is not None and deadline.expired():
+            print(f"⚠️  Échéance dépassée, décodage TensorFlow annulé pour '{text}'")
+            return None
+        
+        if self.micro_batching:
+            # Regrouper avec les requêtes concurrentes servies par le même modèle
+            scheduler = self._get_scheduler(target_language, self.resolve_beam_width(beam_width, target_language))
+            try:
+                # N'attendre le batch que le temps restant: le thread de la requête est libéré à l'échéance
+                result = scheduler.submit((text, target_language), deadline).result(timeout=remaining_timeout(deadline))
+            except FutureTimeoutError:
+                print(f"⚠️  Échéance dépassée en attente du micro-batch pour '{text}'")
+                return None
+            if result:
+                print(f"🔄 TensorFlow: '{text}' → '{result[0]}' (confiance: {result[1]:.2f})")
+            return result
+        
+        # Même chemin que les batchs: confiance calculée dans le graphe de décodage
+        result = self._translate_items([(text, target_language)], beam_width, deadline)[0]
+        if result:
+            print(f"🔄 TensorFlow: '{text}' → '{result[0]}' (confiance: {result[1]:.2f})")
+        return result
+    
+    def translate_batch(self, texts: List[str], target_language: str, beam_width: Optional[int] = None,
+                        deadline: Optional[Deadline] = None) -> List[Optional[Tuple[str, float]]]:
+        """
+        Traduit plusieurs textes avec une passe d'encodeur et un décodage par batch
+        
+        Args:
+            texts: Textes source (français)
+            target_language: Langue cible
+            beam_width: Largeur du beam search (défaut: 1 = glouton, beam search sur demande)
+            deadline: Échéance de la requête (les sous-batchs non commencés à l'échéance restent à None)
+        
+        Returns:
+            Liste alignée sur `texts` de (traduction, score_de_confiance) ou None si échec
+        """
+        if not texts:
+            return []
+        
+        if not self.is_available or target_language not in self.model_paths:
+            return [None] * len(texts)
+        
+        return self._translate_items([(text, target_language) for text in texts], beam_width, deadline)
+    
+    def _translate_items(self, items: List[Tuple[str, str]], beam_width: Optional[int] = None,
+                         deadline: Optional[Deadline] = None) -> List[Optional[Tuple[str, float]]]:
+        """
+        Traduit des paires (texte, langue cible) servies par un même modèle résident
+        (plusieurs langues peuvent partager un batch en mode multilingue)
+        
+        Args:
+            items: Paires (texte source, langue cible)
+            beam_width: Largeur du beam search (défaut: 1 = glouton, beam search sur demande)
+            deadline: Échéance de la requête, vérifiée avant chaque sous-batch
+        
+        Returns:
+            Liste alignée sur `items` de (traduction, score_de_confiance) ou None si échec
+        """
+        model_key = self.model_keys[items[0][1]]
+        
         try:
-            # Récupérer le modèle et les vocabulaires
-            model = self.models[target_language]
-            source_vocab = self.source_vocabs[target_language]
-            target_vocab = self.target_vocabs[target_language]
+            source_vocab = self._get_source_vocab(model_key)
+            bundle = None
             
-            # Encoder le texte source
-            source_ids = source_vocab.encode(text, add_special_tokens=True)
+            beam_width = self.resolve_beam_width(beam_width, items[0][1])
+            results = []
             
-            # Traduire
-            start_time = time.time()
-            translation, attention_weights = model.translate(
-                source_ids, source_vocab, target_vocab
-            )
-            inference_time = time.time() - start_time
-            
-            # Calculer un score de confiance basé sur l'attention
-            # Plus l'attention est concentrée, plus on est confiant
-            confidence = self._calculate_confidence(attention_weights, inference_time)
+            # Découper en sous-batchs pour borner la mémoire du décodage
+            for offset in range(0, len(items), BATCH_SIZE):
+                if deadline is not None and deadline.expired():
+                    # Un décodage commencé n'est pas interruptible: ne pas en lancer de nouveau
+                    print(f"⚠️  Échéance dépassée, {len(items) - offset} texte(s) non décodés ({model_key})")
+                    results.extend([None] * (len(items) - offset))
+                    break
+                
+                chunk = items[offset:offset + BATCH_SIZE]
+                chunk_results = [None] * len(chunk)
+                
+                # Encoder et padder tous les textes du sous-batch dans un seul tableau
+                source_seqs, _ = source_vocab.encode_batch(
+                    [text for text, _ in chunk],
+                    target_languages=[language for _, language in chunk] if model_key == MULTILINGUAL_MODEL else None
+                )
+                
+                # Seules les lignes qui passent le pré-contrôle OOV sont décodées
+                rows = np.flatnonzero(self._passes_oov_gate(source_seqs, [language for _, language in chunk]))
+                
+                if len(rows) > 0:
+                    # Le modèle n'est chargé que si au moins un texte est décodé
+                    if bundle is None:
+                        bundle = self._get_model(items[0][1])
+                        if bundle is None:
+                            return [None] * len(items)
+                    model, _, target_vocab = bundle
+                    
+                    start_time = time.time()
+                    # Les poids d'attention restent dans le graphe: seule la confiance est rapatriée
+                    outputs = model.translate_batch(source_seqs[rows], return_attention=False, beam_width=beam_width)
+                    # Temps amorti par phrase pour la pénalité de lenteur
+                    inference_time = (time.time() - start_time) / len(rows)
+                    
+                    translations = target_vocab.decode_batch([token_ids for token_ids, _, _ in outputs])
+                    for row, translation, (_, _, decode_confidence) in zip(rows, translations, outputs):
+                        confidence = self._calculate_confidence(decode_confidence, inference_time)
+                        chunk_results[row] = (translation, confidence)
+                
+                results.extend(chunk_results)
             
-            print(f"🔄 TensorFlow: '{text}' → '{translation}' (confiance: {confidence:.2f})")
+            print(f"🔄 TensorFlow batch: {len(items)} textes traduits ({model_key})")
             
-            return translation, confidence
+            return results
             
         except Exception as e:
-            print(f"❌ Erreur TensorFlow pour '{text}' en {target_language}: {e}")
-            return None
+            print(f"❌ Erreur TensorFlow batch ({model_key}): {e}")
+            return [None] * len(items)
     
-    def _calculate_confidence(self, attention_weights: np.ndarray, inference_time: float) -> float:
+    def _passes_oov_gate(self, source_seqs: np.ndarray, languages: List[str]) -> np.ndarray:
         """
-        Calcule un score de confiance basé sur les poids d'attention
+        Pré-contrôle bon marché avant décodage: proportion de mots hors vocabulaire
+        (UNK_ID) parmi les tokens de contenu de chaque source encodée
         
         Args:
-            attention_weights: Poids d'attention [target_len, source_len, 1]
-            inference_time: Temps d'inférence en secondes
+            source_seqs: IDs source paddés [batch_size, seq_len]
+            languages: Langue cible de chaque ligne (compteurs)
         
         Returns:
-            Score de confiance entre 0 et 1
+            Masque booléen des lignes à décoder [batch_size]
         """
-        if attention_weights.size == 0:
-            return 0.5
+        unknown = np.sum(source_seqs == UNK_ID, axis=1)
+        # Tokens de contenu: tout sauf PAD, START et END
+        content = np.sum(source_seqs >= UNK_ID, axis=1)
+        if self.model_keys.get(languages[0]) == MULTILINGUAL_MODEL:
+            # Le token de langue préfixé n'est pas un mot du texte
+            content = content - 1
         
-        # Calculer l'entropie de l'attention (plus c'est concentré, mieux c'est)
-        # Normaliser les poids
-        weights = attention_weights.squeeze()
+        ratios = unknown / np.maximum(content, 1)
+        decodable = (content > 0) & (ratios <= self.max_oov_ratio)
         
-        if weights.ndim == 1:
-            weights = weights.reshape(1, -1)
+        with self._oov_lock:
+            self.oov_checked += len(languages)
+            for language, ratio, passed in zip(languages, ratios, decodable):
+                self.oov_ratios.observe(float(ratio))
+                if not passed:
+                    self.oov_skipped[language] = self.oov_skipped.get(language, 0) + 1
+        
+        return decodable
+    
+    def _get_scheduler(self, target_language: str, beam_width: int) -> MicroBatchScheduler:
+        """
+        Retourne (en le créant au besoin) l'ordonnanceur de micro-batchs du modèle
+        servant une langue (commun à toutes les langues en mode multilingue)
+        """
+        model_key = self.model_keys[target_language]
+        key = (model_key, beam_width)
         
-        # Calculer l'entropie moyenne
-        entropies = []
-        for row in weights:
-            # Normaliser
-            row = row / (row.sum() + 1e-10)
-            # Entropie
-            entropy = -np.sum(row * np.log(row + 1e-10))
-            entropies.append(entropy)
+        with self._schedulers_lock:
+            scheduler = self._schedulers.get(key)
+            if scheduler is None:
+                scheduler = MicroBatchScheduler(
+                    lambda items: self._translate_items(items, beam_width=beam_width),
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_batch_wait_ms,
+                    name=f"tf-batch-{model_key}-beam{beam_width}"
+                )
+                self._schedulers[key] = scheduler
         
-        avg_entropy = np.mean(entropies)
+        return scheduler
+    
+    def get_batching_stats(self) -> Dict:
+        """Retourne les métriques de micro-batching par modèle et largeur de faisceau"""
+        with self._schedulers_lock:
+            schedulers = dict(self._schedulers)
         
-        # Normaliser l'entropie (0 = très confiant, log(len) = pas confiant)
-        max_entropy = np.log(weights.shape[1])
-        normalized_entropy = avg_entropy / (max_entropy + 1e-10)
+        return {
+            'enabled': self.micro_batching,
+            'queues': {
+                f"{model_key}:beam{beam_width}": scheduler.get_stats()
+                for (model_key, beam_width), scheduler in schedulers.items()
+            }
+        }
+    
+    def get_oov_gate_stats(self) -> Dict:
+        """Retourne les compteurs du pré-contrôle OOV (décodages évités par langue)"""
+        with self._oov_lock:
+            skipped = sum(self.oov_skipped.values())
+            return {
+                'max_oov_ratio': self.max_oov_ratio,
+                'checked': self.oov_checked,
+                'skipped': skipped,
+                'skip_rate': skipped / self.oov_checked if self.oov_checked > 0 else 0.0,
+                'skipped_by_language': dict(self.oov_skipped),
+                'oov_ratio': self.oov_ratios.get_stats()
+            }
+    
+    def resolve_beam_width(self, beam_width: Optional[int] = None, language: Optional[str] = None) -> int:
+        """
+        Retourne la largeur de faisceau effective, bornée à [1, MAX_BEAM_WIDTH]
+        
+        Sans largeur demandée, le décodage reste glouton (1): le beam search,
+        plusieurs fois plus coûteux, est activé explicitement par requête.
+        Pour une langue servie par TFLite (sans beam search), la largeur est
+        toujours 1, afin que les clés de cache et les files de micro-batch
+        ne se dédoublent pas selon une largeur ignorée.
+        """
+        if language is not None and self.model_backends.get(language) == BACKEND_TFLITE:
+            return TFLiteSeq2Seq.resolve_beam_width(beam_width)
+        if beam_width is None:
+            beam_width = 1
+        return max(1, min(int(beam_width), MAX_BEAM_WIDTH))
+    
+    def _calculate_confidence(self, attention_score: float, inference_time: float) -> float:
+        """
+        Calcule le score de confiance final d'une traduction
         
-        # Score de confiance (inverse de l'entropie normalisée)
-        attention_confidence = 1.0 - normalized_entropy
+        Args:
+            attention_score: Confiance calculée dans le graphe de décodage
+                (concentration de l'attention, probabilité des tokens)
+            inference_time: Temps d'inférence en secondes
         
+        Returns:
+            Score de confiance entre 0 et 1
+        """
         # Pénaliser si l'inférence est trop lente (> 1 seconde)
         time_penalty = 1.0 if inference_time < 1.0 else 0.8
         
         # Score final
-        confidence = attention_confidence * time_penalty
+        confidence = attention_score * time_penalty
         
         return float(np.clip(confidence, 0.0, 1.0))
     
@@ -161,25 +570,72 @@ class TensorFlowTranslationService:
         """Vérifie si le service est disponible"""
         return self.is_available
     
+    def get_model_version(self, language: str) -> str:
+        """Retourne la version du modèle chargé (date de modification), ou '' si absent"""
+        return self.model_versions.get(language, '')
+
     def get_available_languages(self) -> list:
-        """Retourne la liste des langues disponibles"""
-        return list(self.models.keys())
+        """Retourne la liste des langues disponibles (chargées ou non)"""
+        return list(self.model_paths.keys())
     
     def get_model_info(self, language: str) -> Optional[Dict]:
         """Retourne des informations sur un modèle"""
-        if language not in self.models:
+        if language not in self.model_paths:
             return None
         
-        model = self.models[language]
-        source_vocab = self.source_vocabs[language]
-        target_vocab = self.target_vocabs[language]
+        model_key = self.model_keys[language]
+        
+        with self._resident_lock:
+            source_vocab = self.source_vocabs.get(source_vocab_language(model_key))
+            target_vocab = self.target_vocabs.get(model_key)
+            
+            return {
+                'language': language,
+                'model': model_key,
+                'source_vocab_size': len(source_vocab) if source_vocab else None,
+                'target_vocab_size': len(target_vocab) if target_vocab else None,
+                'model_loaded': model_key in self.models,
+                'backend': self.model_backends.get(language),
+                'estimated_size_mb': self.model_bytes.get(model_key, 0) / 1024 / 1024
+            }
+    
+    def get_readiness(self) -> Dict:
+        """
+        Retourne l'état de chaque modèle; le service est prêt quand aucun
+        modèle préchargé n'est en cours de chargement ou de réchauffement
+        
+        Les modèles chargés à la demande ne conditionnent pas la disponibilité
+        (la base de données et Gemini servent sans eux), et un modèle en échec
+        est seulement signalé: le tier TensorFlow l'ignore et passe au suivant.
+        """
+        states = {
+            language: self.model_states.get(model_key, STATE_UNLOADED)
+            for language, model_key in self.model_keys.items()
+        }
+        warming = [
+            model_key for model_key in self.preloaded_keys
+            if self.model_states.get(model_key) in (STATE_LOADING, STATE_WARMING)
+        ]
         
         return {
-            'language': language,
-            'source_vocab_size': len(source_vocab),
-            'target_vocab_size': len(target_vocab),
-            'model_loaded': True
+            'ready': not warming,
+            'languages': states,
+            'failed': sorted(language for language, state in states.items() if state == STATE_FAILED)
         }
+    
+    def get_residency_stats(self) -> Dict:
+        """Retourne l'état de résidence des modèles (chargement à la demande)"""
+        with self._resident_lock:
+            return {
+                'resident': list(self.models.keys()),
+                'multilingual': self.multilingual,
+                'backends': dict(self.model_backends),
+                'max_resident_models': self.max_resident_models,
+                'memory_budget_mb': self.memory_budget_bytes / 1024 / 1024,
+                'resident_mb': sum(self.model_bytes.values()) / 1024 / 1024,
+                'loads': self.load_count,
+                'evictions': self.eviction_count
+            }
 
 
 # Instance globale du service